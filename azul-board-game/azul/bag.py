@@ -1,7 +1,6 @@
 from __future__ import annotations
-from typing import List, Dict
-from collections import Counter
-from azul.simple_types import Tile
+from typing import List
+from azul.simple_types import Tile, count_tile_types, counted_tiles_state
 from interfaces.used_tiles_interfaces import UsedTilesTakeAllInterface
 from interfaces.combined_interfaces import BagInterface
 from interfaces.permutation_generator_interface import PermutationGeneratorInterface
@@ -23,9 +22,13 @@ class Bag(BagInterface):
         """Returns count number of random tiles
         
         if bag does not have enough tiles, it takes_all() from used tiles
+        if even used tiles run out, returns all remaining tiles
         """
         while count > len(self._tiles):
+            tiles_before: int = len(self._tiles)
             self.take_all_from_used_tiles()
+            if len(self._tiles) == tiles_before:
+                count = tiles_before
         
         tiles_to_give: List[Tile] = self.get_random_tiles(count)
         
@@ -45,12 +48,11 @@ class Bag(BagInterface):
         self._tiles.extend(self._used_tiles.take_all())
     
     def state(self) -> str:
-        counted_tiles: Dict[Tile, int] = dict(Counter(self._tiles))
-        result: list[str] = []
-        tile_type: Tile
-        for tile_type in sorted(counted_tiles, key=str):
-            result.append(f'|{str(tile_type)}: {counted_tiles[tile_type]}|')
-        return ' '.join(result)
+        return counted_tiles_state(self._tiles)
+    
+    def numeric_state(self) -> List[int]:
+        """Returns number of tiles of each type"""
+        return count_tile_types(self._tiles)
 
     def get_tiles(self) -> List[Tile]:
         return self._tiles
@@ -4,10 +4,13 @@ from interfaces.used_tiles_interfaces import UsedTilesGiveInterface
 from interfaces.game_elements_interfaces import BoardInterface
 from interfaces.round_results_interfaces import (FinalPointsCalculationInterface,
                                                  GameFinishedInterface)
-from azul.simple_types import Tile, FinishRoundResult, Points, RED, BLUE, YELLOW, GREEN, BLACK
+from azul.simple_types import (Tile, FinishRoundResult, Points, RED, BLUE, YELLOW, GREEN, BLACK,
+                               STARTING_PLAYER, TILE_TYPES, count_tile_types)
 from azul.floor import Floor
 from azul.wall_line import WallLine
 from azul.pattern_line import PatternLine
+from azul.wall_mask import (WallMask, MaskPointCounter, MaskFinalPointsCalculation,
+                            MaskGameFinished, wall_to_mask)
 
 
 class Board(BoardInterface):
@@ -16,11 +19,14 @@ class Board(BoardInterface):
     _floor: Floor
     _pattern_lines: List[PatternLine]
     _wall_lines: List[WallLine]
+    _wall_mask: Optional[WallMask]
     points: Points
 
     def __init__(self, game_finished: GameFinishedInterface, 
                  final_points: FinalPointsCalculationInterface,
-                 used_tiles: UsedTilesGiveInterface) -> None:
+                 used_tiles: UsedTilesGiveInterface,
+                 wall_mask: Optional[WallMask] = None) -> None:
+        """If wall_mask is given, points after put to wall are counted from the mask"""
         # reference to game_finished and final_points
         self._game_finished = game_finished
         self._final_points = final_points
@@ -39,7 +45,12 @@ class Board(BoardInterface):
             [RED, BLACK, GREEN, BLUE, YELLOW],
             [YELLOW, RED, BLACK, GREEN, BLUE]
         ]
-        self._wall_lines = [WallLine(w_pattern) for w_pattern in wall_lines_pattern]
+        self._wall_mask = wall_mask
+        if wall_mask is None:
+            self._wall_lines = [WallLine(w_pattern) for w_pattern in wall_lines_pattern]
+        else:
+            self._wall_lines = [WallLine(w_pattern, MaskPointCounter(wall_mask, row))
+                                for row, w_pattern in enumerate(wall_lines_pattern)]
         # set line up, line down
         for index, wall_line in enumerate(self._wall_lines):
             try:
@@ -83,15 +94,23 @@ class Board(BoardInterface):
         # summing all the points
         self.points = Points.sum(points_to_sum)
 
-        # return FinishRoundResult
+        # return FinishRoundResult, from the maintained mask if the check works with masks
+        if self._wall_mask is not None and isinstance(self._game_finished, MaskGameFinished):
+            return self._game_finished.game_finished_of_mask(self._wall_mask.mask)
         wall_state: List[List[Optional[Tile]]] = [w_line.get_tiles() for w_line in self._wall_lines]
         return self._game_finished.game_finished(wall_state)
 
     def end_game(self) -> None:
         """Sums all bonus points from WallLines + current points"""
-        # get all points
-        wall_state: List[List[Optional[Tile]]] = [w_line.get_tiles() for w_line in self._wall_lines]
-        final_points: Points = self._final_points.get_points(wall_state)
+        # get all points, from the maintained mask if the calculation works with masks
+        final_points: Points
+        if (self._wall_mask is not None
+                and isinstance(self._final_points, MaskFinalPointsCalculation)):
+            final_points = self._final_points.get_points_of_mask(self._wall_mask.mask)
+        else:
+            wall_state: List[List[Optional[Tile]]] = [w_line.get_tiles()
+                                                      for w_line in self._wall_lines]
+            final_points = self._final_points.get_points(wall_state)
         # sum them with current points
         self.points = Points.sum([self.points, final_points])
 
@@ -107,6 +126,34 @@ class Board(BoardInterface):
         result.append(f'Floor: {self._floor.state()}')
         return '\n'.join(result)
 
+    def numeric_state(self) -> List[int]:
+        """Returns state of the board as list of ints
+        
+        points, type (index in TILE_TYPES, -1 for none) and count of tiles of each pattern line,
+        wall as a bitmask (bit 5 * row + column is set for occupied slot),
+        number of tiles on the floor and 1 if STARTING_PLAYER is on the floor, 0 if not
+        """
+        result: List[int] = [self.points.value]
+        pattern_line: PatternLine
+        for pattern_line in self._pattern_lines:
+            current_type: Optional[Tile] = pattern_line.get_current_type()
+            result.append(-1 if current_type is None else TILE_TYPES.index(current_type))
+            result.append(len(pattern_line.get_tiles()))
+        
+        if self._wall_mask is not None:
+            result.append(self._wall_mask.mask)
+        else:
+            result.append(wall_to_mask([w_line.get_tiles() for w_line in self._wall_lines]))
+        
+        floor_tiles: List[Tile] = self._floor.get_tiles()
+        result.append(len(floor_tiles))
+        result.append(int(STARTING_PLAYER in floor_tiles))
+        return result
+
+    def floor_counts(self) -> List[int]:
+        """Returns number of tiles of each type (in order of TILE_TYPES) on the floor"""
+        return count_tile_types(self._floor.get_tiles())
+
     def get_pattern_lines(self) -> List[PatternLine]:
         return self._pattern_lines
     
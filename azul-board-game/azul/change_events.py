@@ -0,0 +1,78 @@
+"""Changes of the game caused by one command
+
+Game notifies change observers with the list of changes instead of rendered state.
+Every change names the rendered components (see Game.component_state()) it makes stale.
+"""
+
+
+from __future__ import annotations
+from typing import List, Optional
+
+
+TABLE_AREA: str = "table area"
+BAG: str = "bag"
+USED_TILES: str = "used tiles"
+
+
+def board_component(player_id: int) -> str:
+    return f"board {player_id}"
+
+
+class ChangeKind:
+    _name: str
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __str__(self) -> str:
+        return self._name
+
+
+SOURCE_EMPTIED: ChangeKind = ChangeKind("source emptied")           # index of factory
+CENTER_UPDATED: ChangeKind = ChangeKind("center updated")           # tiles taken or added
+STARTING_PLAYER_TAKEN: ChangeKind = ChangeKind("starting player taken")
+PATTERN_LINE_UPDATED: ChangeKind = ChangeKind("pattern line updated")   # index of the line
+FLOOR_UPDATED: ChangeKind = ChangeKind("floor updated")
+PLAYER_ON_TURN: ChangeKind = ChangeKind("player on turn")
+NEW_ROUND: ChangeKind = ChangeKind("new round")                     # everything changed
+GAME_ENDED: ChangeKind = ChangeKind("game ended")
+
+
+class ChangeEvent:
+    """Change of one part of the game, player_id and index are given where they apply"""
+
+    kind: ChangeKind
+    player_id: Optional[int]
+    index: Optional[int]
+
+    def __init__(self, kind: ChangeKind, player_id: Optional[int] = None,
+                 index: Optional[int] = None) -> None:
+        self.kind = kind
+        self.player_id = player_id
+        self.index = index
+
+    def components(self, player_ids: List[int]) -> List[str]:
+        """Returns rendered components, which are changed"""
+        if self.kind in (SOURCE_EMPTIED, CENTER_UPDATED):
+            return [TABLE_AREA]
+        if self.player_id is not None and self.kind in (STARTING_PLAYER_TAKEN,
+                                                        PATTERN_LINE_UPDATED, FLOOR_UPDATED):
+            return [board_component(self.player_id)]
+        if self.kind is NEW_ROUND:
+            return ([TABLE_AREA, BAG, USED_TILES]
+                    + [board_component(player_id) for player_id in player_ids])
+        return []
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChangeEvent):
+            return NotImplemented
+        return (self.kind is other.kind and self.player_id == other.player_id
+                and self.index == other.index)
+
+    def __hash__(self) -> int:
+        return hash((self.kind, self.player_id, self.index))
+
+    def __repr__(self) -> str:
+        details: str = ''.join(f' {value}' for value in (self.player_id, self.index)
+                               if value is not None)
+        return f'<{self.kind}{details}>'
@@ -0,0 +1,609 @@
+"""Compact core of the game
+
+Bag, used tiles, factories, table center and floors are vectors of counts of each
+tile type (indexes of tile types are tile codes of take command, see TILE_TYPES),
+pattern lines are pairs (type, count), walls are 25-bit masks (see azul.wall_mask) and
+points are plain ints. Moves and round scoring take time proportional to the number
+of tile types, not to the number of tiles. The rules are the same as in Game.
+
+CompactGame is an adapter of the core to GameInterface.
+"""
+
+
+from __future__ import annotations
+from typing import Callable, List, Optional, Tuple
+from random import Random
+from interfaces.game_interface import GameInterface
+from interfaces.game_elements_interfaces import GameObserverInterface
+from azul.game_observer import GameObserver
+from azul.simple_types import TILE_TYPES
+from azul.wall_mask import wall_column, points_after_put, final_points, has_full_row
+
+
+# (source_idx, idx, destination_idx) as in take command
+Move = Tuple[int, int, int]
+
+NUMBER_OF_TILE_TYPES: int = 5
+TILES_OF_EACH_TYPE: int = 20
+TILES_IN_FACTORY: int = 4
+NUMBER_OF_FACTORIES: dict[int, int] = {2: 5, 3: 7, 4: 9}
+
+# FLOOR_PENALTIES[i] is penalty for i tiles on the floor, every tile after the 7th costs 3 points
+FLOOR_PENALTIES: List[int] = [0, 1, 2, 4, 6, 8, 11, 14]
+
+def floor_penalty(count: int) -> int:
+    """Returns penalty for count tiles (including STARTING_PLAYER) on the floor"""
+    if count < len(FLOOR_PENALTIES):
+        return FLOOR_PENALTIES[count]
+    return FLOOR_PENALTIES[-1] + 3 * (count - len(FLOOR_PENALTIES) + 1)
+
+
+class UndoRecord:
+    """Everything apply() changed, so that undo() restores the state exactly"""
+
+    move: Move
+    count: int                      # tiles of type idx taken from the source
+    rest: List[int]                 # tiles moved from the factory to the center
+    took_starting_player: bool
+    next_starting_player: Optional[int]
+    line_type: int                  # type of the pattern line before the move
+    placed: int                     # tiles put on the pattern line, the rest fell on the floor
+    on_turn: int
+
+    def __init__(self, move: Move, count: int, rest: List[int], took_starting_player: bool,
+                 next_starting_player: Optional[int], line_type: int, placed: int,
+                 on_turn: int) -> None:
+        self.move = move
+        self.count = count
+        self.rest = rest
+        self.took_starting_player = took_starting_player
+        self.next_starting_player = next_starting_player
+        self.line_type = line_type
+        self.placed = placed
+        self.on_turn = on_turn
+
+
+class CompactState:
+    """State of the game as vectors of counts, players are indexed from 0 (seats)"""
+
+    number_of_players: int
+    random: Random
+
+    bag: List[int]
+    used_tiles: List[int]
+    factories: List[List[int]]
+    center: List[int]
+    starting_player_in_center: bool
+
+    line_types: List[List[int]]     # -1 for empty pattern line
+    line_counts: List[List[int]]
+    walls: List[int]
+    floors: List[List[int]]
+    starting_player_on_floor: List[bool]
+    points: List[int]
+
+    order: List[int]                # seats in order of play in current round
+    on_turn: int                    # index to order
+    next_starting_player: Optional[int]
+    round: int
+    ended: bool
+
+    def __init__(self, number_of_players: int, random: Optional[Random] = None) -> None:
+        self.number_of_players = number_of_players
+        self.random = random if random is not None else Random()
+
+        self.bag = [TILES_OF_EACH_TYPE] * NUMBER_OF_TILE_TYPES
+        self.used_tiles = [0] * NUMBER_OF_TILE_TYPES
+        self.factories = [[0] * NUMBER_OF_TILE_TYPES
+                          for _ in range(NUMBER_OF_FACTORIES[number_of_players])]
+        self.center = [0] * NUMBER_OF_TILE_TYPES
+        self.starting_player_in_center = False
+
+        self.line_types = [[-1] * 5 for _ in range(number_of_players)]
+        self.line_counts = [[0] * 5 for _ in range(number_of_players)]
+        self.walls = [0] * number_of_players
+        self.floors = [[0] * NUMBER_OF_TILE_TYPES for _ in range(number_of_players)]
+        self.starting_player_on_floor = [False] * number_of_players
+        self.points = [0] * number_of_players
+
+        self.order = list(range(number_of_players))
+        self.on_turn = 0
+        self.next_starting_player = None
+        self.round = 0
+        self.ended = False
+
+    def player_on_turn(self) -> int:
+        return self.order[self.on_turn]
+
+    def refill_bag(self, count: int) -> None:
+        """Moves all used tiles to the bag, if it has less than count tiles (as Bag.take())"""
+        if count > sum(self.bag):
+            for i in range(NUMBER_OF_TILE_TYPES):
+                self.bag[i] += self.used_tiles[i]
+                self.used_tiles[i] = 0
+
+    def draw_tiles(self, count: int) -> List[int]:
+        """Draws count random tiles from the bag, refills it from used tiles if needed
+
+        if even used tiles run out, returns all remaining tiles
+        """
+        self.refill_bag(count)
+        count = min(count, sum(self.bag))
+
+        drawn: List[int] = [0] * NUMBER_OF_TILE_TYPES
+        remaining: int = sum(self.bag)
+        for _ in range(count):
+            tile: int = self.random.randrange(remaining)
+            idx: int = 0
+            while tile >= self.bag[idx]:
+                tile -= self.bag[idx]
+                idx += 1
+            self.bag[idx] -= 1
+            drawn[idx] += 1
+            remaining -= 1
+        return drawn
+
+    def start_new_round(self) -> None:
+        """Puts STARTING_PLAYER to the center and fills factories from the bag"""
+        self.round += 1
+        self.starting_player_in_center = True
+        self.factories = [self.draw_tiles(TILES_IN_FACTORY) for _ in self.factories]
+
+    def take(self, source_idx: int, idx: int, destination_idx: int) -> None:
+        """Player on turn takes tiles of type idx from source and puts them to pattern line
+
+        source 0 is the table center, expects valid indexes, player on turn does not change
+        """
+        self.on_turn = self.apply((source_idx, idx, destination_idx)).on_turn
+
+    def free_space(self, player: int, destination_idx: int, idx: int) -> int:
+        """Returns how many tiles of type idx can be put on the pattern line"""
+        line_type: int = self.line_types[player][destination_idx]
+        if line_type == -1:
+            if self.walls[player] >> (5 * destination_idx + wall_column(destination_idx, idx)) & 1:
+                return 0
+        elif line_type != idx:
+            return 0
+        return destination_idx + 1 - self.line_counts[player][destination_idx]
+
+    def put(self, player: int, destination_idx: int, idx: int, count: int) -> int:
+        """Puts count tiles of type idx to pattern line, tiles which do not fit fall on the floor
+
+        returns number of tiles put on the pattern line
+        """
+        placed: int = min(count, self.free_space(player, destination_idx, idx))
+        if placed:
+            self.line_types[player][destination_idx] = idx
+            self.line_counts[player][destination_idx] += placed
+        self.floors[player][idx] += count - placed
+        return placed
+
+    def legal_moves(self) -> List[Move]:
+        """Returns all moves of the player on turn with different results
+
+        for each source and tile type in it, moves to all pattern lines which accept the tiles
+        and one move to a pattern line which does not (all tiles fall on the floor), if there is any
+        if only STARTING_PLAYER is left in the center, the only move takes it
+        """
+        player: int = self.player_on_turn()
+        # pattern lines for tiles of each type, same for all sources
+        destinations: List[List[int]] = []
+        for idx in range(NUMBER_OF_TILE_TYPES):
+            accepting: List[int] = [destination_idx for destination_idx in range(5)
+                                    if self.free_space(player, destination_idx, idx)]
+            if len(accepting) < 5:
+                accepting.append(next(destination_idx for destination_idx in range(5)
+                                      if destination_idx not in accepting))
+            destinations.append(sorted(accepting))
+
+        moves: List[Move] = []
+        source_idx: int
+        counts: List[int]
+        for source_idx, counts in enumerate([self.center] + self.factories):
+            for idx in range(NUMBER_OF_TILE_TYPES):
+                if counts[idx]:
+                    moves.extend((source_idx, idx, destination_idx)
+                                 for destination_idx in destinations[idx])
+        if not moves and self.starting_player_in_center:
+            moves.append((0, 0, 0))
+        return moves
+
+    def apply(self, move: Move) -> UndoRecord:
+        """Plays the move of the player on turn and passes the turn to the next player
+
+        the round is not finished, even if it should end, returned record is passed to undo()
+        """
+        source_idx, idx, destination_idx = move
+        player: int = self.player_on_turn()
+        record: UndoRecord = UndoRecord(move, 0, [], False, self.next_starting_player,
+                                        self.line_types[player][destination_idx], 0, self.on_turn)
+        if source_idx == 0:
+            record.count = self.center[idx]
+            self.center[idx] = 0
+            if self.starting_player_in_center:
+                record.took_starting_player = True
+                self.starting_player_in_center = False
+                self.starting_player_on_floor[player] = True
+                self.next_starting_player = player
+        else:
+            factory: List[int] = self.factories[source_idx - 1]
+            record.count = factory[idx]
+            factory[idx] = 0
+            record.rest = factory.copy()
+            for i in range(NUMBER_OF_TILE_TYPES):
+                self.center[i] += factory[i]
+                factory[i] = 0
+
+        if record.count:
+            record.placed = self.put(player, destination_idx, idx, record.count)
+        self.on_turn = (self.on_turn + 1) % self.number_of_players
+        return record
+
+    def undo(self, record: UndoRecord) -> None:
+        """Reverts the move played by apply(), moves have to be undone in reverse order"""
+        source_idx, idx, destination_idx = record.move
+        self.on_turn = record.on_turn
+        player: int = self.player_on_turn()
+
+        self.floors[player][idx] -= record.count - record.placed
+        self.line_counts[player][destination_idx] -= record.placed
+        self.line_types[player][destination_idx] = record.line_type
+
+        if source_idx == 0:
+            self.center[idx] = record.count
+            if record.took_starting_player:
+                self.starting_player_in_center = True
+                self.starting_player_on_floor[player] = False
+        else:
+            factory: List[int] = self.factories[source_idx - 1]
+            for i in range(NUMBER_OF_TILE_TYPES):
+                self.center[i] -= record.rest[i]
+                factory[i] = record.rest[i]
+            factory[idx] = record.count
+        self.next_starting_player = record.next_starting_player
+
+    def copy(self) -> CompactState:
+        """Returns independent copy of the state, the copy shares Random with this state"""
+        state: CompactState = CompactState.__new__(CompactState)
+        state.__dict__.update(self.__dict__)
+        state.bag = self.bag.copy()
+        state.used_tiles = self.used_tiles.copy()
+        state.factories = [factory.copy() for factory in self.factories]
+        state.center = self.center.copy()
+        state.line_types = [line_types.copy() for line_types in self.line_types]
+        state.line_counts = [line_counts.copy() for line_counts in self.line_counts]
+        state.walls = self.walls.copy()
+        state.floors = [floor.copy() for floor in self.floors]
+        state.starting_player_on_floor = self.starting_player_on_floor.copy()
+        state.points = self.points.copy()
+        state.order = self.order.copy()
+        return state
+
+    def is_round_end(self) -> bool:
+        return (not self.starting_player_in_center and not any(self.center)
+                and not any(any(factory) for factory in self.factories))
+
+    def next_player(self) -> None:
+        self.on_turn = (self.on_turn + 1) % self.number_of_players
+
+    def finish_round(self) -> bool:
+        """Moves tiles from full pattern lines to walls and scores them, clears floors
+
+        returns whether the game should end (any player has full wall line)
+        """
+        game_finished: bool = False
+        for player in range(self.number_of_players):
+            wall: int = self.walls[player]
+            points: int = 0
+            for row in range(5):
+                if self.line_counts[player][row] < row + 1:
+                    continue
+                idx: int = self.line_types[player][row]
+                column: int = wall_column(row, idx)
+                wall |= 1 << (5 * row + column)
+                points += points_after_put(wall, row, column)
+                self.used_tiles[idx] += row
+                self.line_types[player][row] = -1
+                self.line_counts[player][row] = 0
+
+            floor: List[int] = self.floors[player]
+            points -= floor_penalty(sum(floor) + self.starting_player_on_floor[player])
+            for idx in range(NUMBER_OF_TILE_TYPES):
+                self.used_tiles[idx] += floor[idx]
+                floor[idx] = 0
+            self.starting_player_on_floor[player] = False
+            self.points[player] += points
+
+            self.walls[player] = wall
+            if has_full_row(wall):
+                game_finished = True
+        return game_finished
+
+    def next_round_order(self) -> None:
+        """Player who took STARTING_PLAYER starts next round, the order of play is kept"""
+        while self.next_starting_player != self.order[0]:
+            self.order = self.order[1:] + [self.order[0]]
+        self.next_starting_player = None
+        self.on_turn = 0
+
+    def end_game(self) -> None:
+        for player in range(self.number_of_players):
+            self.points[player] += final_points(self.walls[player])
+        self.ended = True
+
+    @staticmethod
+    def from_numeric_state(state: Tuple[int, ...], random: Optional[Random] = None,
+                           floors: Optional[List[List[int]]] = None) -> CompactState:
+        """Creates state from numeric state of Game or CompactGame
+
+        floors are numbers of tiles of each type on floors (see Game.floor_counts()),
+        if they are not given, the tiles missing from the game are put on floors, which
+        is enough for playing (only the total number of tiles on a floor matters), but
+        not for comparing states
+        """
+        number_of_players: int = state[0]
+        result: CompactState = CompactState(number_of_players, random)
+        result.order = list(state[-number_of_players:])
+        result.on_turn = result.order.index(state[1])
+        result.center = list(state[2:7])
+        result.starting_player_in_center = bool(state[7])
+        position: int = 8
+        for factory in result.factories:
+            factory[:] = state[position:position + NUMBER_OF_TILE_TYPES]
+            position += NUMBER_OF_TILE_TYPES
+
+        floor_sizes: List[int] = []
+        for player in range(number_of_players):
+            board: Tuple[int, ...] = state[position:position + 14]
+            position += 14
+            result.points[player] = board[0]
+            result.line_types[player] = list(board[1:11:2])
+            result.line_counts[player] = list(board[2:11:2])
+            result.walls[player] = board[11]
+            result.starting_player_on_floor[player] = bool(board[13])
+            floor_sizes.append(board[12] - board[13])
+            if board[13]:
+                result.next_starting_player = player
+        result.bag = list(state[position:position + NUMBER_OF_TILE_TYPES])
+        result.used_tiles = list(state[position + NUMBER_OF_TILE_TYPES:
+                                       position + 2 * NUMBER_OF_TILE_TYPES])
+
+        if floors is not None:
+            result.floors = [list(floor) for floor in floors]
+            return result
+
+        # every tile not found elsewhere lies on some floor
+        missing: List[int] = [TILES_OF_EACH_TYPE - result.bag[idx] - result.used_tiles[idx]
+                              - result.center[idx]
+                              - sum(factory[idx] for factory in result.factories)
+                              for idx in range(NUMBER_OF_TILE_TYPES)]
+        for player in range(number_of_players):
+            for row in range(5):
+                if result.line_counts[player][row]:
+                    missing[result.line_types[player][row]] -= result.line_counts[player][row]
+                for idx in range(NUMBER_OF_TILE_TYPES):
+                    missing[idx] -= result.walls[player] >> (5 * row + wall_column(row, idx)) & 1
+        for player, floor_size in enumerate(floor_sizes):
+            for idx in range(NUMBER_OF_TILE_TYPES):
+                on_floor: int = min(floor_size, missing[idx])
+                result.floors[player][idx] = on_floor
+                missing[idx] -= on_floor
+                floor_size -= on_floor
+        return result
+
+    def board_numeric_state(self, player: int) -> List[int]:
+        """Same as Board.numeric_state()"""
+        result: List[int] = [self.points[player]]
+        for row in range(5):
+            result.append(self.line_types[player][row])
+            result.append(self.line_counts[player][row])
+        result.append(self.walls[player])
+        result.append(sum(self.floors[player]) + self.starting_player_on_floor[player])
+        result.append(int(self.starting_player_on_floor[player]))
+        return result
+
+    def numeric_state(self) -> Tuple[int, ...]:
+        """Same as Game.numeric_state(), players are ordered by seats"""
+        result: List[int] = [self.number_of_players, self.player_on_turn()]
+        result.extend(self.center)
+        result.append(int(self.starting_player_in_center))
+        for factory in self.factories:
+            result.extend(factory)
+        for player in range(self.number_of_players):
+            result.extend(self.board_numeric_state(player))
+        result.extend(self.bag)
+        result.extend(self.used_tiles)
+        result.extend(self.order)
+        return tuple(result)
+
+
+def render_counts(counts: List[int], starting_player: bool = False) -> str:
+    """Renders tiles as compressed tile list sorted by representation"""
+    tiles: List[str] = ['S'] if starting_player else []
+    for idx, count in enumerate(counts):
+        tiles.extend([str(TILE_TYPES[idx])] * count)
+    return ''.join(sorted(tiles))
+
+
+def render_counted_tiles(counts: List[int]) -> str:
+    """Renders tiles as in Bag.state()"""
+    return ' '.join(f'|{representation}: {count}|' for representation, count
+                    in sorted((str(TILE_TYPES[idx]), count)
+                              for idx, count in enumerate(counts) if count))
+
+
+class CompactGame(GameInterface):
+    """Game with the same interface, rules and state rendering as Game, played on CompactState
+
+    only difference in rendering is that tiles on floors are sorted
+    """
+
+    _core: CompactState
+    _seed: Optional[int]
+    _callback: Optional[Callable[[str], None]]
+    _game_observer: GameObserverInterface
+    _headless: bool
+    _game_started: bool
+    _player_ids: List[int]      # sorted, seat of player is the index of his ID
+
+    def __init__(self, seed: Optional[int] = None, headless: bool = False) -> None:
+        self._seed = seed
+        self._callback = None
+        self._game_observer = GameObserver()
+        self._headless = headless
+        self._game_started = False
+        self._player_ids = []
+        self._core = CompactState(2)
+
+    def register_callback(self, callback: Callable[[str], None]) -> None:
+        self._callback = callback
+
+    def get_game_observer(self) -> GameObserverInterface:
+        return self._game_observer
+
+    def start(self, num_of_players: int, *ids: int) -> bool:
+        """Starts the game, accepts the same arguments as Game.start()"""
+        if self._core.ended:
+            self.notify("Game has ended")
+            return False
+        if (num_of_players < 2 or num_of_players > 4 or self._game_started
+                or len(ids) != num_of_players):
+            return False
+        if any(not isinstance(player_id, int) or ids.count(player_id) > 1 for player_id in ids):
+            return False
+
+        self._player_ids = sorted(ids)
+        self._core = CompactState(num_of_players, Random(self._seed))
+        # first player to take is the first of ids, others follow in order of ids
+        self._core.order = [self._player_ids.index(player_id) for player_id in ids]
+        self._game_started = True
+        self.notify('Game started')
+        self._core.start_new_round()
+        self.notify_state()
+        return True
+
+    def take(self, player_id: int, source_idx: int, idx: int, destination_idx: int) -> bool:
+        """Same as Game.take()"""
+        core: CompactState = self._core
+        if core.ended:
+            self.notify("Game has ended")
+            return False
+        if not (self._game_started and
+                player_id == self._player_ids[core.player_on_turn()] and
+                0 <= source_idx <= len(core.factories) and
+                0 <= idx <= 4 and
+                0 <= destination_idx <= 4):
+            return False
+
+        core.take(source_idx, idx, destination_idx)
+        if core.is_round_end():
+            self.notify('Starting new round')
+            if core.finish_round():
+                core.end_game()
+                self.notify_scoreboard()
+            else:
+                core.next_round_order()
+                core.start_new_round()
+            self.notify_state()
+            return True
+
+        core.next_player()
+        self.notify_state()
+        return True
+
+    def notify_scoreboard(self) -> None:
+        if self._headless:
+            return
+        scoreboard: List[Tuple[int, int]] = sorted(
+            ((player_id, self._core.points[seat])
+             for seat, player_id in enumerate(self._player_ids)),
+            key=lambda item: item[1], reverse=True)
+        result: list[str] = ['▼' * 10, 'FINAL SCOREBOARD:']
+        current_rank: int = 1
+        previous_score: int = scoreboard[0][1]
+        for player_id, score in scoreboard:
+            if score < previous_score:
+                current_rank += 1
+            previous_score = score
+            result.append(f'{current_rank}. place: {player_id} with {score} points')
+        result.append('▲' * 10)
+        self.notify('\n'.join(result))
+
+    def notify_state(self) -> None:
+        if not self._headless:
+            self.notify(self.state())
+
+    def notify(self, new_state: str) -> None:
+        """Notifies the player and game observers, headless game notifies nobody"""
+        if self._headless:
+            return
+        if self._callback is not None:
+            self._callback(new_state)
+        self._game_observer.notify_everybody(new_state)
+
+    def state(self) -> str:
+        """Returns state of the game as a string, same as Game.state()"""
+        core: CompactState = self._core
+        factories: str = ''.join(f'|{i}: {render_counts(factory)}| '
+                                 for i, factory in enumerate(core.factories, start=1))
+        result: list[str] = [
+            '▼' * 10,
+            f'Player to take: {self._player_ids[core.player_on_turn()]}',
+            'Take command structure: take [player ID] [tile source] [tile code] [pattern line]',
+            '',
+            'Tile codes: |0: L| |1: B| |2: G| |3: R| |4: Y|',
+            '',
+            f'Table center: |0: {render_counts(core.center, core.starting_player_in_center)}|',
+            f'Factories: {factories}',
+            '',
+            self.get_state_of_boards(),
+            '',
+            f'Bag: {render_counted_tiles(core.bag)}',
+            f'Used tiles: {render_counted_tiles(core.used_tiles)}',
+            '▲' * 10
+        ]
+        return '\n'.join(result)
+
+    def board_state(self, seat: int) -> List[str]:
+        """Returns lines of state of the board, same as Board.state()"""
+        core: CompactState = self._core
+        result: List[str] = [f'Points: {core.points[seat]}']
+        for row in range(5):
+            count: int = core.line_counts[seat][row]
+            line: str = '_' * (row + 1 - count)
+            if count:
+                line += str(TILE_TYPES[core.line_types[seat][row]]) * count
+            wall: List[str] = [''] * 5
+            for idx, tile_type in enumerate(TILE_TYPES):
+                column: int = wall_column(row, idx)
+                wall[column] = (str(tile_type) if core.walls[seat] >> (5 * row + column) & 1
+                                else str(tile_type).lower())
+            result.append(f'{row} :' + ' ' * (4 - row) + line + ' ' + ''.join(wall))
+        floor: str = render_counts(core.floors[seat], core.starting_player_on_floor[seat])
+        result.append(f'Floor: {floor}')
+        return result
+
+    def get_state_of_boards(self) -> str:
+        board_states: List[List[str]] = []
+        for seat, player_id in enumerate(self._player_ids):
+            board_states.append(['-' * 15, f'Board of {player_id}']
+                                + self.board_state(seat) + ['-' * 15])
+        return '\n'.join(''.join('|' + board_state[i].ljust(15) + '|' + '\t'
+                                 for board_state in board_states)
+                         for i in range(len(board_states[0])))
+
+    def numeric_state(self) -> Tuple[int, ...]:
+        """Same as Game.numeric_state()"""
+        return self._core.numeric_state()
+
+    def get_player_on_turn(self) -> int:
+        return self._player_ids[self._core.player_on_turn()]
+
+    def get_points(self, player_id: int) -> int:
+        return self._core.points[self._player_ids.index(player_id)]
+
+    def is_ended(self) -> bool:
+        return self._core.ended
+
+    def get_core(self) -> CompactState:
+        return self._core
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import List
 from interfaces.factory_interfaces import FactoryBagInterface, FactoryTableCenterInterface
 from interfaces.tile_source import TileSource
-from azul.simple_types import Tile, compress_tile_list
+from azul.simple_types import Tile, compress_tile_list, count_tile_types
 
 
 class Factory(TileSource):
@@ -31,6 +31,10 @@ class Factory(TileSource):
     def state(self) -> str:
         return compress_tile_list(sorted(self._tiles, key=str))    
     
+    def numeric_state(self) -> List[int]:
+        """Returns number of tiles of each type"""
+        return count_tile_types(self._tiles)
+    
     def start_new_round(self) -> None:
         """Takes 4 new tile from bag"""
         self._tiles.extend(self._bag.take(4))
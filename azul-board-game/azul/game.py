@@ -7,18 +7,31 @@ from interfaces.round_results_interfaces import (FinalPointsCalculationInterface
                                                  GameFinishedInterface)
 from interfaces.game_elements_interfaces import (BoardInterface, TableAreaInterface,
                                                  GameObserverInterface)
+from interfaces.observer_interface import GameViewInterface
 from azul.instance_factory import InstanceFactory
 from azul.simple_types import (FinishRoundResult, GAME_FINISHED, 
                                Tile, STARTING_PLAYER,
                                Points)
+from azul.change_events import (ChangeEvent, TABLE_AREA, BAG, USED_TILES, board_component,
+                                SOURCE_EMPTIED, CENTER_UPDATED, STARTING_PLAYER_TAKEN,
+                                PATTERN_LINE_UPDATED, FLOOR_UPDATED, PLAYER_ON_TURN, NEW_ROUND,
+                                GAME_ENDED)
 
 
-class Game(GameInterface):
+# rendered block of all boards, cached as a component
+BOARDS: str = "boards"
+TABLE_CENTER_STATE_SIZE: int = 6
+FACTORY_STATE_SIZE: int = 5
+
+
+class Game(GameInterface, GameViewInterface):
     
     _factory: InstanceFactoryInterface
     _game_started: bool
     _callback: Optional[Callable[[str], None]]
     _ended: bool
+    _headless: bool
+    _rendered: Dict[str, str]
     
     _players: list[int]
     _number_of_players: int
@@ -33,13 +46,20 @@ class Game(GameInterface):
     _bag: BagInterface
     _used_tiles: UsedTilesInterface
         
-    def __init__(self, instance_factory: Optional[InstanceFactoryInterface] = None) -> None:
-        """Sets fields which are needed when start command is called"""
+    def __init__(self, instance_factory: Optional[InstanceFactoryInterface] = None,
+                 headless: bool = False) -> None:
+        """Sets fields which are needed when start command is called
+        
+        headless game does not render its state and does not notify anybody (used for simulations)
+        """
         self._callback = None
+        self._headless = headless
         if instance_factory:
             self._factory = instance_factory
         else:
             self._factory = InstanceFactory()
+        self._game_observer = self._factory.get_game_observer()
+        self._rendered = {}
         self._ended = False
         self._game_started = False
         self._players = []
@@ -79,7 +99,8 @@ class Game(GameInterface):
         self.create_game()
         self.notify('Game started')
         self._table_area.start_new_round()
-        self.notify(self.state())
+        self.notify_state([ChangeEvent(NEW_ROUND),
+                           ChangeEvent(PLAYER_ON_TURN, self.get_player_on_turn())])
         return True
         
     def create_game(self) -> None:
@@ -88,7 +109,6 @@ class Game(GameInterface):
         firstly, through InstanceFactory, sets up all instances which needs to be passed to inits
         secondly, creates TableArea and dictionary of player IDs and their boards
         """
-        self._game_observer = self._factory.get_game_observer()
         self._used_tiles = self._factory.get_used_tiles()
         self._bag = self._factory.get_bag(self._used_tiles)
         self._final_points_calculation = self._factory.get_final_points_calculation()
@@ -126,22 +146,66 @@ class Game(GameInterface):
             return False
         
 
+        board: BoardInterface = self._boards[player_id]
+        track_changes: bool = not self._headless and self._game_observer.has_change_observers()
+        table_area_before: List[int] = self._table_area.numeric_state() if track_changes else []
+        board_before: List[int] = board.numeric_state() if track_changes else []
+
         tiles_taken: List[Tile] = self._table_area.take(source_idx, idx)
-        if STARTING_PLAYER in tiles_taken:
+        took_starting_player: bool = STARTING_PLAYER in tiles_taken
+        if took_starting_player:
             self._player_to_start_next_round = player_id
             
-        self._boards[player_id].put(destination_idx, tiles_taken)
+        board.put(destination_idx, tiles_taken)
+        self.invalidate(TABLE_AREA, board_component(player_id))
+        changes: List[ChangeEvent] = []
+        if track_changes:
+            changes = self.changes_after_take(player_id, took_starting_player, table_area_before,
+                                              board_before)
         
         if self._table_area.is_round_end():
             self.notify('Starting new round')
             self.start_new_round()
-            self.notify(self.state())
+            self._rendered.clear()
+            if self._ended:
+                changes.append(ChangeEvent(GAME_ENDED))
+            else:
+                changes.append(ChangeEvent(NEW_ROUND))
+                changes.append(ChangeEvent(PLAYER_ON_TURN, self.get_player_on_turn()))
+            self.notify_state(changes)
             return True
 
         self._player_on_turn = (self._player_on_turn + 1) % self._number_of_players
-        self.notify(self.state())
+        changes.append(ChangeEvent(PLAYER_ON_TURN, self.get_player_on_turn()))
+        self.notify_state(changes)
         return True
     
+    def changes_after_take(self, player_id: int, took_starting_player: bool,
+                           table_area_before: List[int],
+                           board_before: List[int]) -> List[ChangeEvent]:
+        """Compares numeric states of TableArea and Board of the player before and after take"""
+        changes: List[ChangeEvent] = []
+        table_area: List[int] = self._table_area.numeric_state()
+        for source_idx in range(1, self.get_number_of_factories() + 1):
+            start: int = TABLE_CENTER_STATE_SIZE + FACTORY_STATE_SIZE * (source_idx - 1)
+            end: int = start + FACTORY_STATE_SIZE
+            if table_area[start:end] != table_area_before[start:end]:
+                changes.append(ChangeEvent(SOURCE_EMPTIED, index=source_idx))
+        if (table_area[:TABLE_CENTER_STATE_SIZE]
+                != table_area_before[:TABLE_CENTER_STATE_SIZE]):
+            changes.append(ChangeEvent(CENTER_UPDATED, index=0))
+        if took_starting_player:
+            changes.append(ChangeEvent(STARTING_PLAYER_TAKEN, player_id))
+        
+        # board: points, (type, count) of pattern lines, wall, floor
+        board: List[int] = self._boards[player_id].numeric_state()
+        for row in range(5):
+            if board[1 + 2 * row:3 + 2 * row] != board_before[1 + 2 * row:3 + 2 * row]:
+                changes.append(ChangeEvent(PATTERN_LINE_UPDATED, player_id, row))
+        if board[12:] != board_before[12:]:
+            changes.append(ChangeEvent(FLOOR_UPDATED, player_id))
+        return changes
+    
     def start_new_round(self) -> None:
         """ Starts new round
         
@@ -187,6 +251,9 @@ class Game(GameInterface):
 
     def determine_winner(self, scoreboard: List[Tuple[int, Points]]) -> None:
         """Handles who is the winner from scoreboard"""
+        self._ended = True
+        if self._headless:
+            return
         curent_rank: int = 1
         result: list[str] = []
         result.append('▼' * 10)
@@ -201,10 +268,9 @@ class Game(GameInterface):
             result.append(f'{curent_rank}. place: {player_id} with {score} points')
         result.append('▲' * 10)
         self.notify('\n'.join(result))
-        self._ended = True
     
     def state(self) -> str:
-        """Returns state of the game as a string"""
+        """Returns state of the game as a string, unchanged components are not rendered again"""
         result: list[str] = []
         result.append('▼' * 10)
         result.append(f'Player to take: {self._players[self._player_on_turn]}')
@@ -213,24 +279,55 @@ class Game(GameInterface):
         result.append('')
         result.append('Tile codes: |0: L| |1: B| |2: G| |3: R| |4: Y|')
         result.append('')
-        result.append(f'{self._table_area.state()}') 
+        result.append(self.component_state(TABLE_AREA))
         result.append('')       
         result.append(self.get_state_of_boards())
         result.append('')
-        result.append(f'Bag: {self._bag.state()}')
-        result.append(f'Used tiles: {self._used_tiles.state()}')
+        result.append(f'Bag: {self.component_state(BAG)}')
+        result.append(f'Used tiles: {self.component_state(USED_TILES)}')
         result.append('▲' * 10)
         return '\n'.join(result)
     
+    def component_state(self, component: str) -> str:
+        """Returns rendered component (see azul.change_events), renders it only if it changed"""
+        if component not in self._rendered:
+            self._rendered[component] = self.render_component(component)
+        return self._rendered[component]
+    
+    def render_component(self, component: str) -> str:
+        if component == TABLE_AREA:
+            return self._table_area.state()
+        if component == BAG:
+            return self._bag.state()
+        if component == USED_TILES:
+            return self._used_tiles.state()
+        if component == BOARDS:
+            return self.render_boards()
+        player_id: int
+        for player_id, board in self._boards.items():
+            if component == board_component(player_id):
+                return board.state()
+        raise ValueError(f'Unknown component "{component}"')
+    
+    def invalidate(self, *components: str) -> None:
+        """Rendered components will be rendered again, when they are needed"""
+        component: str
+        for component in components:
+            self._rendered.pop(component, None)
+            if component.startswith('board '):
+                self._rendered.pop(BOARDS, None)
+    
     def get_state_of_boards(self) -> str:
+        return self.component_state(BOARDS)
+    
+    def render_boards(self) -> str:
         board_states: list[list[str]] = []
         player_id: int
-        board: BoardInterface
-        for player_id, board in sorted(self._boards.items()):
+        for player_id in sorted(self._boards):
             current_state: list[str] = []
             current_state.append('-' * 15)
             current_state.append(f'Board of {player_id}')
-            current_state.extend(board.state().split('\n'))
+            current_state.extend(self.component_state(board_component(player_id)).split('\n'))
             current_state.append('-' * 15)
             board_states.append(current_state)
         
@@ -245,8 +342,49 @@ class Game(GameInterface):
         
         return '\n'.join(result)
     
+    def numeric_state(self) -> Tuple[int, ...]:
+        """Returns compact state of the game as tuple of ints
+        
+        number of players, index of player on turn (in order of sorted player IDs),
+        numeric states of TableArea, Boards (in order of sorted player IDs), Bag and UsedTiles,
+        indices of players (in order of sorted player IDs) in order of play in current round
+        """
+        player_ids: List[int] = sorted(self._boards)
+        result: List[int] = [self._number_of_players,
+                             player_ids.index(self._players[self._player_on_turn])]
+        result.extend(self._table_area.numeric_state())
+        player_id: int
+        for player_id in player_ids:
+            result.extend(self._boards[player_id].numeric_state())
+        result.extend(self._bag.numeric_state())
+        result.extend(self._used_tiles.numeric_state())
+        result.extend(player_ids.index(player_id) for player_id in self._players)
+        return tuple(result)
+    
+    def floor_counts(self) -> List[List[int]]:
+        """Returns number of tiles of each type on the floor of each player
+        
+        players are in order of sorted player IDs as in numeric_state(), which has only
+        the total number of tiles on each floor
+        """
+        return [self._boards[player_id].floor_counts() for player_id in sorted(self._boards)]
+    
+    def notify_state(self, changes: Optional[List[ChangeEvent]] = None) -> None:
+        """Notifies change observers with changes and players and observers with current state
+        
+        state is rendered only if somebody needs it, headless game does not notify anybody
+        """
+        if self._headless:
+            return
+        if changes and self._game_observer.has_change_observers():
+            self._game_observer.notify_changes(changes, self)
+        if self._callback is not None or self._game_observer.has_observers():
+            self.notify(self.state())
+    
     def notify(self, new_state: str) -> None:
         """Notifies players and game observers with passed state"""
+        if self._headless:
+            return
         if self._callback: 
             self._callback(new_state)
         self._game_observer.notify_everybody(new_state)
@@ -256,6 +394,19 @@ class Game(GameInterface):
         num_of_factories: dict[int, int] = {2: 5, 3: 7, 4: 9}
         return num_of_factories[self._number_of_players]
     
+    def get_game_observer(self) -> GameObserverInterface:
+        return self._game_observer
+    
     def get_board(self, player_id: int) -> BoardInterface:
         """Returns board of player_id player"""
         return self._boards[player_id]
+    
+    def get_points(self, player_id: int) -> int:
+        return self._boards[player_id].points.value
+    
+    def get_player_on_turn(self) -> int:
+        """Returns ID of the player on turn"""
+        return self._players[self._player_on_turn]
+    
+    def is_ended(self) -> bool:
+        return self._ended
@@ -0,0 +1,300 @@
+"""Binary log of a game and its replay
+
+RecordedGame is Game, which writes every successful start and take command and every
+draw from the bag to GameLog. The log is a sequence of fixed-size records
+(kind, a, b, c, value), 8 bytes each:
+- START: a = number of players, followed by PLAYER records, value = ID (in order of start)
+- DRAW: a = number of requested tiles, value = codes + 1 of drawn tiles, 3 bits each
+- TAKE: a, b, c = source_idx, idx, destination_idx, value = player ID
+Draws made during a command follow its record. Saved log starts with 8-byte header,
+records after it can be compressed by zlib.
+
+Replay rebuilds the game on CompactState, so getting a state does not create any
+objects of the game, and keeps snapshots of every snapshot_interval-th state, so
+state after any move is replayed from the nearest snapshot.
+"""
+
+
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple
+import struct
+import zlib
+from interfaces.game_elements_interfaces import (BoardInterface, TableAreaInterface,
+                                                 GameObserverInterface)
+from interfaces.instance_factory_interface import InstanceFactoryInterface
+from interfaces.combined_interfaces import BagInterface, UsedTilesInterface
+from interfaces.round_results_interfaces import (FinalPointsCalculationInterface,
+                                                 GameFinishedInterface)
+from interfaces.used_tiles_interfaces import UsedTilesTakeAllInterface
+from azul.compact_game import CompactState, NUMBER_OF_TILE_TYPES
+from azul.game import Game
+from azul.instance_factory import InstanceFactory
+from azul.simple_types import Tile, TILE_TYPES
+
+
+START: int = 1
+PLAYER: int = 2
+DRAW: int = 3
+TAKE: int = 4
+
+RECORD: struct.Struct = struct.Struct('<BBBBi')
+HEADER: struct.Struct = struct.Struct('<4sBBxx')
+MAGIC: bytes = b'AZLG'
+VERSION: int = 1
+COMPRESSED: int = 1
+
+# (kind, a, b, c, value)
+Event = Tuple[int, int, int, int, int]
+
+
+def pack_tiles(tiles: List[Tile]) -> int:
+    packed: int = 0
+    for i, tile in enumerate(tiles):
+        packed |= (TILE_TYPES.index(tile) + 1) << (3 * i)
+    return packed
+
+
+def unpack_counts(packed: int) -> List[int]:
+    """Returns number of drawn tiles of each type"""
+    counts: List[int] = [0] * NUMBER_OF_TILE_TYPES
+    while packed:
+        counts[(packed & 0b111) - 1] += 1
+        packed >>= 3
+    return counts
+
+
+class GameLog:
+    """Records of one game, draws are kept aside until the command which made them succeeds"""
+
+    _records: bytearray
+    _draws: List[Tuple[int, int]]
+
+    def __init__(self, data: bytes = b'') -> None:
+        if len(data) % RECORD.size:
+            raise ValueError('Log has to consist of whole records')
+        self._records = bytearray(data)
+        self._draws = []
+
+    def append(self, kind: int, a: int = 0, b: int = 0, c: int = 0, value: int = 0) -> None:
+        self._records += RECORD.pack(kind, a, b, c, value)
+
+    def record_draw(self, count: int, tiles: List[Tile]) -> None:
+        self._draws.append((count, pack_tiles(tiles)))
+
+    def record_start(self, ids: Tuple[int, ...]) -> None:
+        self.append(START, len(ids))
+        for player_id in ids:
+            self.append(PLAYER, value=player_id)
+        self.flush_draws()
+
+    def record_take(self, player_id: int, source_idx: int, idx: int,
+                    destination_idx: int) -> None:
+        self.append(TAKE, source_idx, idx, destination_idx, player_id)
+        self.flush_draws()
+
+    def flush_draws(self) -> None:
+        for count, packed in self._draws:
+            self.append(DRAW, count, value=packed)
+        self._draws = []
+
+    def discard_draws(self) -> None:
+        self._draws = []
+
+    def events(self) -> Iterator[Event]:
+        kind: int
+        for kind, a, b, c, value in RECORD.iter_unpack(self._records):
+            yield kind, a, b, c, value
+
+    def __len__(self) -> int:
+        return len(self._records) // RECORD.size
+
+    def to_bytes(self, compress: bool = False) -> bytes:
+        records: bytes = zlib.compress(bytes(self._records)) if compress else bytes(self._records)
+        return HEADER.pack(MAGIC, VERSION, COMPRESSED if compress else 0) + records
+
+    @staticmethod
+    def from_bytes(data: bytes) -> GameLog:
+        magic, version, flags = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Data is not a game log of this version')
+        records: bytes = data[HEADER.size:]
+        return GameLog(zlib.decompress(records) if flags & COMPRESSED else records)
+
+    def save(self, path: str, compress: bool = False) -> None:
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes(compress))
+
+    @staticmethod
+    def load(path: str) -> GameLog:
+        with open(path, 'rb') as file:
+            return GameLog.from_bytes(file.read())
+
+
+class RecordingBag(BagInterface):
+    """Bag which records all draws to GameLog"""
+
+    _bag: BagInterface
+    _log: GameLog
+
+    def __init__(self, bag: BagInterface, log: GameLog) -> None:
+        self._bag = bag
+        self._log = log
+
+    def take(self, count: int) -> List[Tile]:
+        tiles: List[Tile] = self._bag.take(count)
+        self._log.record_draw(count, tiles)
+        return tiles
+
+    def state(self) -> str:
+        return self._bag.state()
+
+    def numeric_state(self) -> List[int]:
+        return self._bag.numeric_state()
+
+
+class RecordingInstanceFactory(InstanceFactoryInterface):
+    """Creates the same instances as the given factory, only bag is wrapped by RecordingBag"""
+
+    _factory: InstanceFactoryInterface
+    _log: GameLog
+
+    def __init__(self, factory: InstanceFactoryInterface, log: GameLog) -> None:
+        self._factory = factory
+        self._log = log
+
+    def get_board(self, game_finished: GameFinishedInterface,
+                  final_points: FinalPointsCalculationInterface,
+                  used_tiles: UsedTilesInterface) -> BoardInterface:
+        return self._factory.get_board(game_finished, final_points, used_tiles)
+
+    def get_table_area(self, number_of_factories: int,
+                       bag: BagInterface) -> TableAreaInterface:
+        return self._factory.get_table_area(number_of_factories, bag)
+
+    def get_bag(self, used_tiles: UsedTilesTakeAllInterface) -> BagInterface:
+        return RecordingBag(self._factory.get_bag(used_tiles), self._log)
+
+    def get_game_observer(self) -> GameObserverInterface:
+        return self._factory.get_game_observer()
+
+    def get_final_points_calculation(self) -> FinalPointsCalculationInterface:
+        return self._factory.get_final_points_calculation()
+
+    def get_game_finished(self) -> GameFinishedInterface:
+        return self._factory.get_game_finished()
+
+    def get_used_tiles(self) -> UsedTilesInterface:
+        return self._factory.get_used_tiles()
+
+
+class RecordedGame(Game):
+    """Game which records successful commands and draws from the bag to its log"""
+
+    log: GameLog
+
+    def __init__(self, instance_factory: Optional[InstanceFactoryInterface] = None,
+                 headless: bool = False, log: Optional[GameLog] = None) -> None:
+        self.log = log if log is not None else GameLog()
+        super().__init__(RecordingInstanceFactory(instance_factory or InstanceFactory(),
+                                                  self.log), headless)
+
+    def start(self, num_of_players: int, *ids: int) -> bool:
+        if not super().start(num_of_players, *ids):
+            self.log.discard_draws()
+            return False
+        self.log.record_start(ids)
+        return True
+
+    def take(self, player_id: int, source_idx: int, idx: int, destination_idx: int) -> bool:
+        if not super().take(player_id, source_idx, idx, destination_idx):
+            self.log.discard_draws()
+            return False
+        self.log.record_take(player_id, source_idx, idx, destination_idx)
+        return True
+
+
+class Replay:
+    """States of the logged game, state_at(k) is the state after k take commands"""
+
+    player_ids: List[int]           # sorted, seat of player is the index of the ID
+    snapshot_interval: int
+    _events: List[Event]
+    _take_positions: List[int]      # index of k-th TAKE record in _events
+    _snapshots: Dict[int, Tuple[CompactState, int]]    # state after k moves, next factory
+
+    def __init__(self, log: GameLog, snapshot_interval: int = 16) -> None:
+        self._events = list(log.events())
+        if not self._events or self._events[0][0] != START:
+            raise ValueError('Log does not start with START record')
+        number_of_players: int = self._events[0][1]
+        ids: List[int] = [event[4] for event in self._events[1:1 + number_of_players]]
+        self.player_ids = sorted(ids)
+        self.snapshot_interval = snapshot_interval
+        self._take_positions = [i for i, event in enumerate(self._events) if event[0] == TAKE]
+
+        state: CompactState = CompactState(number_of_players)
+        state.order = [self.player_ids.index(player_id) for player_id in ids]
+        state.round = 1
+        state.starting_player_in_center = True
+        position: int = 1 + number_of_players
+        self._snapshots = {0: self.replay(state, 0, position, self.events_end(0))}
+
+    def number_of_moves(self) -> int:
+        return len(self._take_positions)
+
+    def events_end(self, moves: int) -> int:
+        """Returns index of the first record after the k-th move and its draws"""
+        if moves < len(self._take_positions):
+            return self._take_positions[moves]
+        return len(self._events)
+
+    def replay(self, state: CompactState, factory: int, start: int,
+               end: int) -> Tuple[CompactState, int]:
+        """Applies records start...end-1 to the state, returns it and index of next factory"""
+        for kind, a, b, c, value in self._events[start:end]:
+            if kind == DRAW:
+                state.refill_bag(a)
+                drawn: List[int] = unpack_counts(value)
+                for i in range(NUMBER_OF_TILE_TYPES):
+                    state.bag[i] -= drawn[i]
+                state.factories[factory] = drawn
+                factory += 1
+            elif kind == TAKE:
+                if self.player_ids[state.player_on_turn()] != value:
+                    raise ValueError(f'Player {value} is not on turn')
+                state.take(a, b, c)
+                if not state.is_round_end():
+                    state.next_player()
+                elif state.finish_round():
+                    state.end_game()
+                else:
+                    state.next_round_order()
+                    state.round += 1
+                    state.starting_player_in_center = True
+                    factory = 0
+        return state, factory
+
+    def state_at(self, moves: int) -> CompactState:
+        """Returns state after the moves, from the nearest snapshot (new snapshots are kept)"""
+        if not 0 <= moves <= self.number_of_moves():
+            raise IndexError(f'Game has {self.number_of_moves()} moves')
+        snapshot: int = moves - moves % self.snapshot_interval
+        while snapshot not in self._snapshots:
+            snapshot -= self.snapshot_interval
+        state, factory = self._snapshots[snapshot]
+        state = state.copy()
+        while snapshot < moves:
+            target: int = min(moves, snapshot + self.snapshot_interval)
+            state, factory = self.replay(state, factory, self.events_end(snapshot),
+                                         self.events_end(target))
+            snapshot = target
+            if snapshot % self.snapshot_interval == 0:
+                self._snapshots[snapshot] = (state.copy(), factory)
+        return state
+
+    def final_state(self) -> CompactState:
+        return self.state_at(self.number_of_moves())
+
+    def moves(self) -> List[Tuple[int, int, int, int]]:
+        """Returns (player ID, source_idx, idx, destination_idx) of all take commands"""
+        return [(self._events[i][4],) + self._events[i][1:4] for i in self._take_positions]
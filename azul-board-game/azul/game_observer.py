@@ -1,16 +1,23 @@
 from __future__ import annotations
 from typing import List
 from interfaces.game_elements_interfaces import GameObserverInterface
-from interfaces.observer_interface import ObserverInterface
+from interfaces.observer_interface import (ObserverInterface, ChangeObserverInterface,
+                                          GameViewInterface)
+from azul.change_events import ChangeEvent
 
 
 class GameObserver(GameObserverInterface):
-    """Keeps list of Observers which are notified upon change in Game"""
+    """Keeps list of Observers which are notified upon change in Game
+    
+    change observers are notified with changes, they render the state only if they need it
+    """
     
     _observers: List[ObserverInterface]
+    _change_observers: List[ChangeObserverInterface]
     
     def __init__(self) -> None:
         self._observers = []
+        self._change_observers = []
         
     def register_observer(self, observer: ObserverInterface) -> None:
         """Registers new observer"""
@@ -30,3 +37,22 @@ class GameObserver(GameObserverInterface):
     def get_observers(self) -> List[ObserverInterface]:
         """Returns list of all current observers"""
         return self._observers
+    
+    def has_observers(self) -> bool:
+        return bool(self._observers)
+    
+    def register_change_observer(self, observer: ChangeObserverInterface) -> None:
+        self._change_observers.append(observer)
+    
+    def cancel_change_observer(self, observer: ChangeObserverInterface) -> None:
+        if observer in self._change_observers:
+            self._change_observers.remove(observer)
+    
+    def notify_changes(self, changes: List[ChangeEvent], view: GameViewInterface) -> None:
+        """Notifies all change observers about changes"""
+        observer: ChangeObserverInterface
+        for observer in self._change_observers:
+            observer.notify_changes(changes, view)
+    
+    def has_change_observers(self) -> bool:
+        return bool(self._change_observers)
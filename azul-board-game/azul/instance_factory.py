@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
+from random import Random
 from interfaces.game_elements_interfaces import (BoardInterface, TableAreaInterface,
                                                  GameObserverInterface)
 from interfaces.instance_factory_interface import InstanceFactoryInterface
@@ -17,15 +18,29 @@ from azul.random_permutation_generator import RandomPermutationGenerator
 from azul.final_points_calculation import (FinalPointsCalculation, WallPointsCalculation,
                                            HorizontalRowPointsCalculation, 
                                            VerticalColumnPointsCalculation, ColorPointsCalculation)
+from azul.wall_mask import WallMask, MaskFinalPointsCalculation, MaskGameFinished
 from azul.simple_types import Tile, BLACK, BLUE, GREEN, RED, YELLOW
 
 
 class InstanceFactory(InstanceFactoryInterface):
-    """Structure to construct instances for Game class"""
+    """Structure to construct instances for Game class
+    
+    if seed is given, all Bags draw tiles from the same seeded Random, so the game can be repeated
+    if fast_scoring is True, walls are scored from bit masks (see azul.wall_mask)
+    """
+    
+    _random: Optional[Random]
+    _fast_scoring: bool
+    
+    def __init__(self, seed: Optional[int] = None, fast_scoring: bool = False) -> None:
+        self._random = None if seed is None else Random(seed)
+        self._fast_scoring = fast_scoring
     
     def get_board(self, game_finished: GameFinishedInterface, 
                   final_points: FinalPointsCalculationInterface,
                   used_tiles: UsedTilesInterface) -> BoardInterface:
+        if self._fast_scoring:
+            return Board(game_finished, final_points, used_tiles, WallMask())
         return Board(game_finished, final_points, used_tiles)
     
     def get_table_area(self, number_of_factories: int, 
@@ -38,12 +53,15 @@ class InstanceFactory(InstanceFactoryInterface):
         needs reference on UsedTiles and creates RandomPermutationGenerator
         """
         tiles: List[Tile] =  [BLACK, BLUE, GREEN, RED, YELLOW] * 20
-        return Bag(tiles, used_tiles, RandomPermutationGenerator())
+        return Bag(tiles, used_tiles, RandomPermutationGenerator(self._random))
     
     def get_game_observer(self) -> GameObserverInterface:
         return GameObserver()
     
     def get_final_points_calculation(self) -> FinalPointsCalculationInterface:
+        if self._fast_scoring:
+            return MaskFinalPointsCalculation()
+        
         horizontal = HorizontalRowPointsCalculation()
         vertical = VerticalColumnPointsCalculation()
         color = ColorPointsCalculation()
@@ -57,6 +75,8 @@ class InstanceFactory(InstanceFactoryInterface):
         return final_points_calculation
     
     def get_game_finished(self) -> GameFinishedInterface:
+        if self._fast_scoring:
+            return MaskGameFinished()
         return GameFinished()
     
     def get_used_tiles(self) -> UsedTilesInterface:
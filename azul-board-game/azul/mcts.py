@@ -0,0 +1,288 @@
+"""Monte Carlo Tree Search player
+
+The tree contains moves of the current round, which are fully observable. Hidden
+information is the order of tiles in the bag, it is handled by determinization:
+playouts continue the game into next rounds with their own random draws from the bag
+(playout of one round only does not draw any tiles, so at least 2 rounds are played
+by default).
+Playouts are run in the process, or in a process pool:
+- root parallelization: every worker searches its own tree, visits of moves are summed,
+- leaf parallelization: one tree, a batch of playouts from every new leaf is run in the pool.
+With a TranspositionTable (see azul.transposition), statistics of nodes are stored by the hash
+of their state, a new node of a state reached before by another order of moves (or in
+a search of a previous move) starts with the stored statistics.
+"""
+
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+from azul.compact_game import CompactState, Move, UndoRecord, floor_penalty
+from azul.game import Game
+from azul.transposition import HashedState, TableEntry, TranspositionTable
+
+
+# difference of points, at which playout counts as a clear win or loss
+REWARD_SCALE: float = 20.0
+
+
+class Node:
+    """Node of the search tree, rewards are summed for each player"""
+
+    move: Optional[Move]
+    player: int                 # player who played the move
+    parent: Optional[Node]
+    children: List[Node]
+    untried: List[Move]
+    visits: int
+    rewards: List[float]
+    state_hash: Optional[int]   # hash of the state after the move, if transpositions are used
+
+    def __init__(self, move: Optional[Move], player: int, parent: Optional[Node],
+                 untried: List[Move], number_of_players: int) -> None:
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.rewards = [0.0] * number_of_players
+        self.state_hash = None
+
+    def select_child(self, exploration: float) -> Node:
+        """Returns child with the highest upper confidence bound"""
+        log_visits: float = log(self.visits)
+        return max(self.children,
+                   key=lambda child: (child.rewards[child.player] / child.visits
+                                      + exploration * sqrt(log_visits / child.visits)))
+
+
+def playout_move(state: CompactState, random: Random, epsilon: float = 0.1) -> Move:
+    """Plays random legal move with probability epsilon, the most greedy one otherwise
+
+    greedy move puts the most tiles on pattern lines with the least penalty on the floor
+    """
+    moves: List[Move] = state.legal_moves()
+    if random.random() < epsilon:
+        return random.choice(moves)
+
+    player: int = state.player_on_turn()
+    floor: int = sum(state.floors[player]) + state.starting_player_on_floor[player]
+    best: Move = moves[0]
+    best_value: float = float('-inf')
+    for move in moves:
+        source_idx, idx, destination_idx = move
+        count: int = (state.factories[source_idx - 1] if source_idx else state.center)[idx]
+        placed: int = min(count, state.free_space(player, destination_idx, idx))
+        dropped: int = count - placed + (source_idx == 0 and state.starting_player_in_center)
+        value: float = (placed - floor_penalty(floor + dropped)
+                        + (placed and state.line_counts[player][destination_idx] + placed
+                           == destination_idx + 1) + random.random() * 0.5)
+        if value > best_value:
+            best_value = value
+            best = move
+    return best
+
+
+def playout(state: CompactState, rounds: int, random: Random) -> List[float]:
+    """Plays the game from the state till the end of the round (and rounds - 1 more rounds)
+
+    state is not changed, tiles drawn from the bag are determined by random
+    returns reward of each player, between 0 and 1, according to the difference of points
+    to the best other player (with final points, if the game ends)
+    """
+    # playout does not need the hash of HashedState
+    state = CompactState.copy(state)
+    state.random = random
+    while True:
+        while not state.is_round_end():
+            state.apply(playout_move(state, random))
+        rounds -= 1
+        if state.finish_round():
+            state.end_game()
+            break
+        if rounds <= 0:
+            break
+        state.next_round_order()
+        state.start_new_round()
+
+    rewards: List[float] = []
+    for player, points in enumerate(state.points):
+        best_other: int = max(other for i, other in enumerate(state.points) if i != player)
+        rewards.append(min(1.0, max(0.0, 0.5 + (points - best_other) / (2 * REWARD_SCALE))))
+    return rewards
+
+
+def run_playouts(state: CompactState, rounds: int, seed: int, count: int) -> List[float]:
+    """Runs count playouts, returns sum of rewards of each player (function for process pool)"""
+    random: Random = Random(seed)
+    total: List[float] = [0.0] * state.number_of_players
+    for _ in range(count):
+        for player, reward in enumerate(playout(state, rounds, random)):
+            total[player] += reward
+    return total
+
+
+def search(state: CompactState, playouts: int, time_limit: Optional[float], seed: int,
+           exploration: float = 1.0, rounds: int = 2, executor: Optional[Executor] = None,
+           batch: int = 1, table: Optional[TranspositionTable] = None
+           ) -> Dict[Move, Tuple[int, float]]:
+    """Builds search tree from the state, returns visits and summed reward of each root move
+
+    with executor, batch playouts from every leaf are run in it (leaf parallelization)
+    with table, visits and mean reward of the player who moved are stored for every visited
+    node by hash of its state (state has to be HashedState)
+    state is restored after the search
+    """
+    if table is not None and not isinstance(state, HashedState):
+        raise ValueError('Search with transposition table needs HashedState')
+    random: Random = Random(seed)
+    players: int = state.number_of_players
+    root: Node = Node(None, -1, None, state.legal_moves(), players)
+    deadline: float = perf_counter() + time_limit if time_limit is not None else float('inf')
+    iteration: int = 0
+    while iteration * batch < playouts and perf_counter() < deadline:
+        iteration += 1
+        node: Node = root
+        records: List[UndoRecord] = []
+        while not node.untried and node.children:
+            node = node.select_child(exploration)
+            assert node.move is not None
+            records.append(state.apply(node.move))
+        if node.untried:
+            move: Move = node.untried.pop(random.randrange(len(node.untried)))
+            player: int = state.player_on_turn()
+            records.append(state.apply(move))
+            child: Node = Node(move, player, node,
+                               [] if state.is_round_end() else state.legal_moves(), players)
+            if isinstance(state, HashedState) and table is not None:
+                child.state_hash = state.hash
+                entry: Optional[TableEntry] = table.lookup(state.hash)
+                if entry is not None:
+                    child.visits = entry.depth
+                    child.rewards[player] = entry.value * entry.depth
+            node.children.append(child)
+            node = child
+
+        if executor is None or batch == 1:
+            rewards: List[float] = run_playouts(state, rounds, random.getrandbits(64), batch)
+        else:
+            rewards = [0.0] * players
+            for batch_rewards in executor.map(run_playouts, [CompactState.copy(state)] * batch,
+                                              [rounds] * batch,
+                                              [random.getrandbits(64) for _ in range(batch)],
+                                              [1] * batch):
+                for i, reward in enumerate(batch_rewards):
+                    rewards[i] += reward
+
+        backpropagated: Optional[Node] = node
+        while backpropagated is not None:
+            backpropagated.visits += batch
+            for i, reward in enumerate(rewards):
+                backpropagated.rewards[i] += reward
+            if table is not None and backpropagated.state_hash is not None:
+                table.store(backpropagated.state_hash, backpropagated.visits,
+                            backpropagated.rewards[backpropagated.player] / backpropagated.visits,
+                            backpropagated.move)
+            backpropagated = backpropagated.parent
+        for record in reversed(records):
+            state.undo(record)
+
+    return {child.move: (child.visits, child.rewards[child.player])
+            for child in root.children if child.move is not None}
+
+
+class MCTSPlayer:
+    """Chooses moves by Monte Carlo Tree Search, can be used as a policy of azul.simulation
+
+    playouts - budget of playouts for one move, time_limit - budget of seconds for one move
+    workers - size of the process pool, parallel - "root" or "leaf" parallelization
+    rounds - number of rounds played in a playout, the current one included
+    batch - number of playouts from a leaf in leaf parallelization
+    table_size - size of TranspositionTable shared by searches of all moves (None for no table),
+    it is not used by root parallelization, where every worker searches in its own process
+    """
+
+    playouts: int
+    time_limit: Optional[float]
+    workers: int
+    parallel: str
+    exploration: float
+    rounds: int
+    batch: int
+    _random: Random
+    _executor: Optional[ProcessPoolExecutor]
+    _table: Optional[TranspositionTable]
+
+    def __init__(self, playouts: int = 1000, time_limit: Optional[float] = None, workers: int = 1,
+                 parallel: str = "root", exploration: float = 1.0, rounds: int = 2,
+                 batch: int = 8, seed: Optional[int] = None,
+                 table_size: Optional[int] = None) -> None:
+        if parallel not in ("root", "leaf"):
+            raise ValueError(f'Unknown parallelization "{parallel}"')
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.workers = workers
+        self.parallel = parallel
+        self.exploration = exploration
+        self.rounds = rounds
+        self.batch = batch
+        self._random = Random(seed)
+        self._executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        self._table = TranspositionTable(table_size) if table_size is not None else None
+
+    def choose_move(self, state: CompactState) -> Move:
+        """Returns the most visited move of the player on turn"""
+        moves: List[Move] = state.legal_moves()
+        if len(moves) == 1:
+            return moves[0]
+
+        statistics: Dict[Move, Tuple[int, float]]
+        if self._executor is None or self.parallel == "leaf":
+            if self._table is not None:
+                self._table.new_search()
+                if not isinstance(state, HashedState):
+                    state = HashedState(state)
+            statistics = search(state, self.playouts, self.time_limit, self._random.getrandbits(64),
+                                self.exploration, self.rounds, self._executor,
+                                self.batch if self._executor is not None else 1, self._table)
+        else:
+            statistics = {}
+            for worker_statistics in self._executor.map(
+                    search, [state] * self.workers, [self.playouts // self.workers] * self.workers,
+                    [self.time_limit] * self.workers,
+                    [self._random.getrandbits(64) for _ in range(self.workers)],
+                    [self.exploration] * self.workers, [self.rounds] * self.workers):
+                for move, (visits, reward) in worker_statistics.items():
+                    total_visits, total_reward = statistics.get(move, (0, 0.0))
+                    statistics[move] = (total_visits + visits, total_reward + reward)
+
+        return max(statistics, key=lambda move: statistics[move])
+
+    def choose_game_move(self, game: Game) -> Move:
+        """Returns move of the player on turn in the game, its state is converted exactly"""
+        return self.choose_move(HashedState.from_game(game, Random(self._random.getrandbits(64))))
+
+    def __call__(self, state: Tuple[int, ...], random: Random) -> Move:
+        """Policy interface, state is numeric state of Game or CompactGame"""
+        return self.choose_move(CompactState.from_numeric_state(state,
+                                                                Random(random.getrandbits(64))))
+
+    def close(self) -> None:
+        """Shuts down the process pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+if __name__ == "__main__":
+    from azul.simulation import SimulationResult, simulate_games, greedy_policy
+    mcts_player: MCTSPlayer = MCTSPlayer(playouts=200, seed=0)
+    result: SimulationResult = simulate_games(10, [mcts_player, greedy_policy], seed=0,
+                                              compact=True)
+    mcts_player.close()
+    print(f'MCTS (200 playouts) vs greedy: wins {result.wins()}, '
+          f'{result.seconds / result.moves * 2:.3f} s per move of MCTS')
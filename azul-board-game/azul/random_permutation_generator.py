@@ -1,11 +1,23 @@
 from __future__ import annotations
-from random import shuffle
+from typing import Optional
+from random import Random, shuffle
 from interfaces.permutation_generator_interface import PermutationGeneratorInterface
 
 
 class RandomPermutationGenerator(PermutationGeneratorInterface):
-    """Permutation generator for Bag, to isolate random element"""
+    """Permutation generator for Bag, to isolate random element
+    
+    uses its own Random instance if it is given, module random otherwise
+    """
+    _random: Optional[Random]
+    
+    def __init__(self, random: Optional[Random] = None) -> None:
+        self._random = random
+    
     def get_permutation(self, length: int) -> list[int]:
         permutation = list(range(length))
-        shuffle(permutation)
+        if self._random is None:
+            shuffle(permutation)
+        else:
+            self._random.shuffle(permutation)
         return permutation
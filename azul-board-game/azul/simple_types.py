@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, List
+from collections import Counter
 
 
 class Points:
@@ -70,5 +71,21 @@ BLACK: Tile = Tile("L")
 NORMAL: FinishRoundResult = FinishRoundResult(0)
 GAME_FINISHED: FinishRoundResult = FinishRoundResult(1)
 
+# order of tile types given by tile codes of take command
+TILE_TYPES: List[Tile] = [BLACK, BLUE, GREEN, RED, YELLOW]
+
 def compress_tile_list(tiles: List[Tile]) -> str:
     return "".join([str(x) for x in tiles])
+
+def count_tile_types(tiles: List[Tile]) -> List[int]:
+    """Returns number of tiles of each type in order of TILE_TYPES, without STARTING_PLAYER"""
+    return [tiles.count(tile_type) for tile_type in TILE_TYPES]
+
+def counted_tiles_state(tiles: List[Tile]) -> str:
+    """Returns |type: count| of each type of tiles, state of Bag and UsedTiles"""
+    counted_tiles: Dict[Tile, int] = dict(Counter(tiles))
+    result: list[str] = []
+    tile_type: Tile
+    for tile_type in sorted(counted_tiles, key=str):
+        result.append(f'|{str(tile_type)}: {counted_tiles[tile_type]}|')
+    return ' '.join(result)
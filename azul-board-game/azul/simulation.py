@@ -0,0 +1,172 @@
+"""Headless self-play of Azul
+
+Games are played by policies, functions which get numeric state of the game
+(see Game.numeric_state()) and return move (source_idx, idx, destination_idx).
+Game is run headless, so no state strings are rendered and nobody is notified.
+"""
+
+
+from __future__ import annotations
+from typing import Callable, List, Optional, Tuple, Union
+from random import Random
+from time import perf_counter
+from azul.game import Game
+from azul.instance_factory import InstanceFactory
+from azul.compact_game import CompactGame, Move, NUMBER_OF_FACTORIES
+from azul.wall_mask import wall_column
+
+
+NumericState = Tuple[int, ...]
+Policy = Callable[[NumericState, Random], Move]
+
+TABLE_CENTER_STATE_SIZE: int = 6
+FACTORY_STATE_SIZE: int = 5
+BOARD_STATE_SIZE: int = 14
+
+
+def tile_sources(state: NumericState) -> List[List[int]]:
+    """Returns number of tiles of each type in TableCenter and all Factories"""
+    sources: List[List[int]] = [list(state[2:7])]
+    start: int = 2 + TABLE_CENTER_STATE_SIZE
+    for _ in range(NUMBER_OF_FACTORIES[state[0]]):
+        sources.append(list(state[start:start + FACTORY_STATE_SIZE]))
+        start += FACTORY_STATE_SIZE
+    return sources
+
+
+def board_state(state: NumericState, player_index: int) -> NumericState:
+    """Returns numeric state of the board of player_index-th player (in order of sorted IDs)"""
+    start: int = (2 + TABLE_CENTER_STATE_SIZE + FACTORY_STATE_SIZE * NUMBER_OF_FACTORIES[state[0]]
+                  + BOARD_STATE_SIZE * player_index)
+    return state[start:start + BOARD_STATE_SIZE]
+
+
+def available_takes(state: NumericState) -> List[Tuple[int, int]]:
+    """Returns all pairs (source_idx, idx) for which some tiles would be taken"""
+    return [(source_idx, idx)
+            for source_idx, counts in enumerate(tile_sources(state))
+            for idx, count in enumerate(counts) if count > 0]
+
+
+def placed_tiles(board: NumericState, idx: int, count: int, destination_idx: int) -> int:
+    """Returns how many of count tiles of type idx would stay on the pattern line
+
+    the rest of them would fall on the floor
+    """
+    line_type: int = board[1 + 2 * destination_idx]
+    line_count: int = board[2 + 2 * destination_idx]
+    if line_type == -1:
+        if board[11] >> (5 * destination_idx + wall_column(destination_idx, idx)) & 1:
+            return 0
+    elif line_type != idx:
+        return 0
+    return min(count, destination_idx + 1 - line_count)
+
+
+def random_policy(state: NumericState, random: Random) -> Move:
+    """Takes random tiles and puts them on random pattern line"""
+    source_idx, idx = random.choice(available_takes(state))
+    return source_idx, idx, random.randrange(5)
+
+
+def greedy_policy(state: NumericState, random: Random) -> Move:
+    """Chooses move with the least tiles falling on the floor, then with the most placed tiles
+
+    ties are broken randomly
+    """
+    board: NumericState = board_state(state, state[1])
+    sources: List[List[int]] = tile_sources(state)
+    best_moves: List[Move] = []
+    best_value: Tuple[int, int] = (-100, 0)
+    for source_idx, idx in available_takes(state):
+        count: int = sources[source_idx][idx]
+        for destination_idx in range(5):
+            placed: int = placed_tiles(board, idx, count, destination_idx)
+            value: Tuple[int, int] = (placed - count, placed)
+            if value > best_value:
+                best_value = value
+                best_moves = []
+            if value == best_value:
+                best_moves.append((source_idx, idx, destination_idx))
+    return random.choice(best_moves)
+
+
+class SimulationResult:
+    """Results of games played by simulate_games()"""
+
+    scores: List[List[int]]
+    moves: int
+    seconds: float
+
+    def __init__(self) -> None:
+        self.scores = []
+        self.moves = 0
+        self.seconds = 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return len(self.scores) / self.seconds if self.seconds > 0 else 0.0
+
+    def wins(self) -> List[float]:
+        """Returns number of wins of each player, ties are split"""
+        wins: List[float] = [0.0] * len(self.scores[0]) if self.scores else []
+        game_scores: List[int]
+        for game_scores in self.scores:
+            best: int = max(game_scores)
+            winners: List[int] = [i for i, score in enumerate(game_scores) if score == best]
+            for i in winners:
+                wins[i] += 1 / len(winners)
+        return wins
+
+
+def play_game(policies: List[Policy], seed: Optional[int] = None,
+              random: Optional[Random] = None, compact: bool = False) -> Tuple[List[int], int]:
+    """Plays one headless game, i-th policy plays for player with ID i
+
+    seed is used for drawing tiles from the bag, random is passed to policies
+    if compact is True, game is played on CompactGame instead of Game
+    returns points of players and number of moves
+    """
+    if random is None:
+        random = Random(seed)
+    game: Union[Game, CompactGame] = (CompactGame(seed, headless=True) if compact
+                                      else Game(InstanceFactory(seed), headless=True))
+    if not game.start(len(policies), *range(len(policies))):
+        raise ValueError(f'{len(policies)} players can not play the game')
+
+    moves: int = 0
+    while not game.is_ended():
+        state: NumericState = game.numeric_state()
+        player_id: int = game.get_player_on_turn()
+        source_idx, idx, destination_idx = policies[player_id](state, random)
+        if tile_sources(state)[source_idx][idx] == 0 or not game.take(player_id, source_idx,
+                                                                       idx, destination_idx):
+            raise ValueError(f'Invalid move {(source_idx, idx, destination_idx)} '
+                             f'of player {player_id}')
+        moves += 1
+
+    return [game.get_points(i) for i in range(len(policies))], moves
+
+
+def simulate_games(number_of_games: int, policies: List[Policy],
+                   seed: Optional[int] = None, compact: bool = False) -> SimulationResult:
+    """Plays number_of_games headless games between policies, measures games per second"""
+    random: Random = Random(seed)
+    result: SimulationResult = SimulationResult()
+    start: float = perf_counter()
+    for _ in range(number_of_games):
+        scores, moves = play_game(policies, random.getrandbits(32), random, compact)
+        result.scores.append(scores)
+        result.moves += moves
+    result.seconds = perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    for use_compact in (False, True):
+        simulation: SimulationResult = simulate_games(200, [greedy_policy, random_policy],
+                                                      seed=0, compact=use_compact)
+        print(f'{"CompactGame" if use_compact else "Game"}: {len(simulation.scores)} games, '
+              f'{simulation.moves} moves in {simulation.seconds:.2f} s, '
+              f'{simulation.games_per_second:.1f} games/s, '
+              f'wins (greedy, random): {simulation.wins()}')
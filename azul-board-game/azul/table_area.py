@@ -53,5 +53,13 @@ class TableArea(TableAreaInterface):
                 result += f'|{i}: {tile_source.state()}| '
         return result
 
+    def numeric_state(self) -> List[int]:
+        """Concatenates numeric states of TableCenter and all Factories"""
+        result: List[int] = []
+        tile_source: TileSource
+        for tile_source in self._tile_sources:
+            result.extend(tile_source.numeric_state())
+        return result
+
     def get_tile_sources(self) -> List[TileSource]:
         return self._tile_sources
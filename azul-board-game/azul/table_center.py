@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import List
 from interfaces.factory_interfaces import FactoryTableCenterInterface
-from azul.simple_types import Tile, compress_tile_list, STARTING_PLAYER
+from azul.simple_types import Tile, compress_tile_list, count_tile_types, STARTING_PLAYER
 
 
 class TableCenter(FactoryTableCenterInterface):
@@ -29,6 +29,10 @@ class TableCenter(FactoryTableCenterInterface):
     def state(self) -> str:
         return compress_tile_list(sorted(self._tiles, key=str))
     
+    def numeric_state(self) -> List[int]:
+        """Returns number of tiles of each type and whether STARTING_PLAYER is here (1 or 0)"""
+        return count_tile_types(self._tiles) + [int(STARTING_PLAYER in self._tiles)]
+    
     def start_new_round(self) -> None:
         """Creates new STARTING_PLAYER tile"""
         self._tiles.append(STARTING_PLAYER)
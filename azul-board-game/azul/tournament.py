@@ -0,0 +1,456 @@
+"""Tournaments between policies
+
+Matches are headless games of Game with seeded InstanceFactory (or CompactGame),
+seed of every match is derived from the seed of the tournament and the match ID,
+so a tournament can be repeated and resumed. Formats:
+- round-robin: every group of players_per_game entrants plays in every rotation of seats,
+- Swiss: in every round, entrants with similar scores play together, rematches are avoided.
+Matches of one round are played in a process pool, completed matches are appended to
+a checkpoint (JSON lines, settings first). Entrants are rated by Elo of the Bradley-Terry
+model fitted to pairwise results of games, with bootstrap confidence intervals.
+"""
+
+
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from itertools import combinations
+from math import log10, sqrt
+from random import Random
+from time import perf_counter
+import json
+import os
+from azul.simulation import Policy, play_game
+
+
+ROUND_ROBIN: str = "round-robin"
+SWISS: str = "swiss"
+ELO_BASE: float = 1500.0
+BOOTSTRAP_SAMPLES: int = 200
+
+
+class Match:
+    """Game to be played, names are entrants in order of seats"""
+
+    match_id: str
+    names: List[str]
+    seed: int
+
+    def __init__(self, match_id: str, names: List[str], seed: int) -> None:
+        self.match_id = match_id
+        self.names = names
+        self.seed = seed
+
+
+class MatchResult:
+    """Played game, or a bye (single name, no scores) in Swiss tournament"""
+
+    match_id: str
+    names: List[str]
+    seed: int
+    scores: List[int]
+    moves: int
+
+    def __init__(self, match_id: str, names: List[str], seed: int, scores: List[int],
+                 moves: int) -> None:
+        self.match_id = match_id
+        self.names = names
+        self.seed = seed
+        self.scores = scores
+        self.moves = moves
+
+    def is_bye(self) -> bool:
+        return not self.scores
+
+    def game_scores(self) -> List[float]:
+        """Returns 1 for the winner, ties are split"""
+        best: int = max(self.scores)
+        winners: int = self.scores.count(best)
+        return [1 / winners if score == best else 0.0 for score in self.scores]
+
+    def to_json(self) -> Dict[str, object]:
+        return {"match_id": self.match_id, "names": self.names, "seed": self.seed,
+                "scores": self.scores, "moves": self.moves}
+
+    @staticmethod
+    def from_json(data: Dict[str, object]) -> MatchResult:
+        names: object = data["names"]
+        scores: object = data["scores"]
+        seed: object = data["seed"]
+        moves: object = data["moves"]
+        assert isinstance(names, list) and isinstance(scores, list)
+        assert isinstance(seed, int) and isinstance(moves, int)
+        return MatchResult(str(data["match_id"]), [str(name) for name in names], seed,
+                           [int(score) for score in scores], moves)
+
+
+def match_seed(seed: int, match_id: str) -> int:
+    return Random(f'{seed}-{match_id}').getrandbits(32)
+
+
+def play_match(match: Match, policies: List[Policy], compact: bool = False) -> MatchResult:
+    """Plays the match, policies are in order of seats (function for process pool)"""
+    scores, moves = play_game(policies, match.seed, compact=compact)
+    return MatchResult(match.match_id, match.names, match.seed, scores, moves)
+
+
+def round_robin_matches(names: List[str], players_per_game: int, games_per_seating: int,
+                        seed: int) -> List[Match]:
+    """Returns games of every group of entrants in every rotation of seats
+
+    match ID is made of indices of seated entrants in names, names may contain "-"
+    """
+    matches: List[Match] = []
+    for group in combinations(range(len(names)), players_per_game):
+        for rotation in range(players_per_game):
+            seats: Tuple[int, ...] = group[rotation:] + group[:rotation]
+            for repetition in range(games_per_seating):
+                match_id: str = f'{"-".join(map(str, seats))}-{repetition}'
+                matches.append(Match(match_id, [names[seat] for seat in seats],
+                                     match_seed(seed, match_id)))
+    return matches
+
+
+def pair_key(first: str, second: str) -> Tuple[str, str]:
+    return (first, second) if first < second else (second, first)
+
+
+def swiss_matches(names: List[str], players_per_game: int, results: List[MatchResult],
+                  round_number: int, seed: int) -> List[Match]:
+    """Returns games of the Swiss round and byes (matches with single name)
+
+    entrants are ordered by score and points, the best unseated one is seated with the next
+    ones it met the least times, entrants left over get byes (the ones with fewest byes)
+    """
+    standings: Dict[str, Standing] = compute_standings(names, results, players_per_game)
+    met: Dict[Tuple[str, str], int] = {}
+    byes: Dict[str, int] = {name: 0 for name in names}
+    for result in results:
+        if result.is_bye():
+            byes[result.names[0]] += 1
+        for first, second in combinations(result.names, 2):
+            met[pair_key(first, second)] = met.get(pair_key(first, second), 0) + 1
+
+    order: List[str] = sorted(names, key=lambda name: (-standings[name].score,
+                                                       -standings[name].points, name))
+    random: Random = Random(f'{seed}-swiss-{round_number}')
+    matches: List[Match] = []
+    for _ in range(len(order) % players_per_game):
+        bye: str = min(reversed(order), key=lambda name: byes[name])
+        order.remove(bye)
+        match_id: str = f'{round_number}-bye-{bye}'
+        matches.append(Match(match_id, [bye], 0))
+
+    table: int = 0
+    while order:
+        seats: List[str] = [order.pop(0)]
+        while len(seats) < players_per_game:
+            opponent: str = min(order, key=lambda name: sum(
+                met.get(pair_key(name, seated), 0) for seated in seats))
+            order.remove(opponent)
+            seats.append(opponent)
+        random.shuffle(seats)
+        match_id = f'{round_number}-{table}'
+        matches.append(Match(match_id, seats, match_seed(seed, match_id)))
+        table += 1
+    return matches
+
+
+class Standing:
+    """Results of one entrant"""
+
+    name: str
+    games: int
+    score: float            # sum of game scores, a bye counts as average score of a game
+    points: int
+    game_scores: List[float]
+    elo: float
+    elo_interval: Tuple[float, float]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.games = 0
+        self.score = 0.0
+        self.points = 0
+        self.game_scores = []
+        self.elo = ELO_BASE
+        self.elo_interval = (ELO_BASE, ELO_BASE)
+
+    def score_interval(self) -> Tuple[float, float]:
+        """Returns 95% confidence interval of mean game score (normal approximation)"""
+        if self.games < 2:
+            return (0.0, 1.0)
+        mean: float = sum(self.game_scores) / self.games
+        variance: float = (sum((score - mean) ** 2 for score in self.game_scores)
+                           / (self.games - 1))
+        margin: float = 1.96 * sqrt(variance / self.games)
+        return (max(0.0, mean - margin), min(1.0, mean + margin))
+
+
+def compute_standings(names: List[str], results: List[MatchResult],
+                      players_per_game: int) -> Dict[str, Standing]:
+    standings: Dict[str, Standing] = {name: Standing(name) for name in names}
+    for result in results:
+        if result.is_bye():
+            standings[result.names[0]].score += 1 / players_per_game
+            continue
+        for name, points, game_score in zip(result.names, result.scores,
+                                            result.game_scores()):
+            standing: Standing = standings[name]
+            standing.games += 1
+            standing.score += game_score
+            standing.points += points
+            standing.game_scores.append(game_score)
+    return standings
+
+
+def pairwise_results(results: List[MatchResult]) -> List[Tuple[str, str, float]]:
+    """Splits games to results of pairs of players, (first, second, score of first)"""
+    pairs: List[Tuple[str, str, float]] = []
+    for result in results:
+        for i, j in combinations(range(len(result.names)), 2):
+            score: float = (0.5 if result.scores[i] == result.scores[j]
+                            else float(result.scores[i] > result.scores[j]))
+            pairs.append((result.names[i], result.names[j], score))
+    return pairs
+
+
+def elo_ratings(names: List[str], pairs: List[Tuple[str, str, float]],
+                iterations: int = 100) -> Dict[str, float]:
+    """Fits Bradley-Terry model to the pairwise results, returns strengths on Elo scale
+
+    every pair of entrants gets one virtual draw, so the ratings are finite and unbeaten
+    or winless entrants are shrunk towards the average
+    """
+    wins: Dict[str, float] = {name: 0.5 * (len(names) - 1) for name in names}
+    games: Dict[Tuple[str, str], float] = {pair_key(first, second): 1.0
+                                           for first, second in combinations(names, 2)}
+    for first, second, score in pairs:
+        wins[first] += score
+        wins[second] += 1 - score
+        games[pair_key(first, second)] += 1
+
+    opponents: Dict[str, List[Tuple[str, float]]] = {name: [] for name in names}
+    for (first, second), count in games.items():
+        opponents[first].append((second, count))
+        opponents[second].append((first, count))
+
+    strength: Dict[str, float] = {name: 1.0 for name in names}
+    for _ in range(iterations):
+        strength = {name: wins[name] / sum(count / (strength[name] + strength[opponent])
+                                           for opponent, count in opponents[name])
+                    if opponents[name] else 1.0
+                    for name in names}
+        mean_log: float = sum(log10(value) for value in strength.values()) / len(names)
+        strength = {name: value / 10 ** mean_log for name, value in strength.items()}
+    return {name: ELO_BASE + 400 * log10(value) for name, value in strength.items()}
+
+
+def rate(standings: Dict[str, Standing], results: List[MatchResult], seed: int) -> None:
+    """Sets Elo of standings and its 95% confidence interval by bootstrap over games"""
+    names: List[str] = list(standings)
+    games: List[MatchResult] = [result for result in results if not result.is_bye()]
+    for name, elo in elo_ratings(names, pairwise_results(games)).items():
+        standings[name].elo = elo
+    if not games:
+        return
+
+    random: Random = Random(seed)
+    samples: Dict[str, List[float]] = {name: [] for name in names}
+    for _ in range(BOOTSTRAP_SAMPLES):
+        resampled: List[MatchResult] = [random.choice(games) for _ in games]
+        for name, elo in elo_ratings(names, pairwise_results(resampled), 30).items():
+            samples[name].append(elo)
+    for name, values in samples.items():
+        values.sort()
+        standings[name].elo_interval = (values[int(0.025 * len(values))],
+                                        values[int(0.975 * len(values)) - 1])
+
+
+class Tournament:
+    """Tournament of registered policies, see module docstring
+
+    rounds - number of Swiss rounds, games_per_seating - repetitions of each round-robin game
+    workers - size of the process pool (policies have to be picklable), checkpoint - JSON file
+    """
+
+    policies: Dict[str, Policy]
+    players_per_game: int
+    tournament_format: str
+    rounds: int
+    games_per_seating: int
+    seed: int
+    workers: int
+    checkpoint: Optional[str]
+    compact: bool
+    results: Dict[str, MatchResult]
+    seconds: float
+
+    def __init__(self, policies: Dict[str, Policy], players_per_game: int = 2,
+                 tournament_format: str = ROUND_ROBIN, rounds: int = 5,
+                 games_per_seating: int = 1, seed: int = 0, workers: int = 1,
+                 checkpoint: Optional[str] = None, compact: bool = False) -> None:
+        if not 2 <= players_per_game <= 4:
+            raise ValueError(f'Games of {players_per_game} players can not be played')
+        if len(policies) < players_per_game:
+            raise ValueError(f'{len(policies)} entrants are not enough for games of '
+                             f'{players_per_game} players')
+        if tournament_format not in (ROUND_ROBIN, SWISS):
+            raise ValueError(f'Unknown tournament format "{tournament_format}"')
+        self.policies = policies
+        self.players_per_game = players_per_game
+        self.tournament_format = tournament_format
+        self.rounds = rounds
+        self.games_per_seating = games_per_seating
+        self.seed = seed
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.compact = compact
+        self.results = {}
+        self.seconds = 0.0
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load(checkpoint)
+
+    def settings(self) -> Dict[str, object]:
+        return {"entrants": sorted(self.policies), "players_per_game": self.players_per_game,
+                "format": self.tournament_format, "rounds": self.rounds,
+                "games_per_seating": self.games_per_seating, "seed": self.seed,
+                "compact": self.compact}
+
+    def load(self, path: str) -> None:
+        """Reads the checkpoint, incomplete last line (interrupted append) is ignored"""
+        with open(path, encoding="utf-8") as file:
+            lines: List[str] = file.read().splitlines()
+        if not lines or json.loads(lines[0]) != self.settings():
+            raise ValueError(f'Checkpoint {path} is of a different tournament')
+        for number, line in enumerate(lines[1:], 2):
+            try:
+                result: MatchResult = MatchResult.from_json(json.loads(line))
+            except json.JSONDecodeError:
+                if number == len(lines):
+                    break
+                raise
+            self.results[result.match_id] = result
+
+    def save(self) -> None:
+        """Writes the whole checkpoint, replaces the old one only when the new one is written"""
+        if self.checkpoint is None:
+            return
+        temporary: str = self.checkpoint + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(json.dumps(self.settings()) + "\n")
+            for result in self.results.values():
+                file.write(json.dumps(result.to_json()) + "\n")
+        os.replace(temporary, self.checkpoint)
+
+    def add_result(self, result: MatchResult) -> None:
+        """Stores the result and appends it to the checkpoint"""
+        self.results[result.match_id] = result
+        if self.checkpoint is None:
+            return
+        with open(self.checkpoint, "a", encoding="utf-8") as file:
+            file.write(json.dumps(result.to_json()) + "\n")
+
+    def round_matches(self, round_number: int) -> List[Match]:
+        names: List[str] = sorted(self.policies)
+        if self.tournament_format == ROUND_ROBIN:
+            return round_robin_matches(names, self.players_per_game, self.games_per_seating,
+                                       self.seed)
+        previous: List[MatchResult] = [result for result in self.results.values()
+                                       if int(result.match_id.split("-")[0]) < round_number]
+        return swiss_matches(names, self.players_per_game, previous, round_number, self.seed)
+
+    def run(self, max_matches: Optional[int] = None) -> List[MatchResult]:
+        """Plays all matches, which are not in the checkpoint, returns results of all matches
+
+        with max_matches, at most so many matches are played (the run can be resumed later)
+        """
+        start: float = perf_counter()
+        executor: Optional[ProcessPoolExecutor] = (ProcessPoolExecutor(self.workers)
+                                                   if self.workers > 1 else None)
+        played: int = 0
+        # checkpoint is written again only once per run, completed matches are appended to it
+        self.save()
+        try:
+            rounds: int = 1 if self.tournament_format == ROUND_ROBIN else self.rounds
+            for round_number in range(rounds):
+                pending: List[Match] = []
+                for match in self.round_matches(round_number):
+                    if match.match_id in self.results:
+                        continue
+                    if len(match.names) == 1:
+                        self.add_result(MatchResult(match.match_id, match.names, 0, [], 0))
+                    else:
+                        pending.append(match)
+                if max_matches is not None:
+                    pending = pending[:max_matches - played]
+                played += len(pending)
+                for result in self.play(pending, executor):
+                    self.add_result(result)
+                if max_matches is not None and played >= max_matches:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.seconds += perf_counter() - start
+        return self.get_results()
+
+    def play(self, matches: List[Match], executor: Optional[ProcessPoolExecutor]
+             ) -> Iterator[MatchResult]:
+        """Yields results of the matches as they are completed"""
+        if executor is None:
+            for match in matches:
+                yield play_match(match, self.seated_policies(match), self.compact)
+            return
+        futures: List[Future[MatchResult]] = [
+            executor.submit(play_match, match, self.seated_policies(match), self.compact)
+            for match in matches]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def seated_policies(self, match: Match) -> List[Policy]:
+        return [self.policies[name] for name in match.names]
+
+    def get_results(self) -> List[MatchResult]:
+        return sorted(self.results.values(), key=lambda result: result.match_id)
+
+    def standings(self) -> List[Standing]:
+        """Returns standings ordered by Elo"""
+        standings: Dict[str, Standing] = compute_standings(sorted(self.policies),
+                                                           self.get_results(),
+                                                           self.players_per_game)
+        rate(standings, self.get_results(), self.seed)
+        return sorted(standings.values(), key=lambda standing: (-standing.elo, standing.name))
+
+    def report(self) -> str:
+        """Returns table of standings"""
+        games: List[MatchResult] = [result for result in self.get_results()
+                                    if not result.is_bye()]
+        lines: List[str] = [f'{len(games)} games of {self.players_per_game} players '
+                            f'({self.tournament_format})',
+                            f'{"#":>2} {"Entrant":<16}{"Games":>6}{"Score":>8}'
+                            f'{"Score rate (95% CI)":>24}{"Avg points":>12}'
+                            f'{"Elo (95% CI)":>22}']
+        for rank, standing in enumerate(self.standings(), 1):
+            low, high = standing.score_interval()
+            rate_text: str = (f'{sum(standing.game_scores) / standing.games:.2f} '
+                              f'({low:.2f}-{high:.2f})' if standing.games else '-')
+            average: str = f'{standing.points / standing.games:.1f}' if standing.games else '-'
+            elo_low, elo_high = standing.elo_interval
+            lines.append(f'{rank:>2} {standing.name:<16}{standing.games:>6}'
+                         f'{standing.score:>8.1f}{rate_text:>24}{average:>12}'
+                         f'{f"{standing.elo:.0f} ({elo_low:.0f}-{elo_high:.0f})":>22}')
+        if self.seconds > 0 and games:
+            lines.append(f'{len(games) / self.seconds:.1f} games/s')
+        return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    from azul.simulation import greedy_policy, random_policy
+    from azul.mcts import MCTSPlayer
+    tournament: Tournament = Tournament({"greedy": greedy_policy, "random": random_policy,
+                                         "mcts-50": MCTSPlayer(playouts=50, seed=0)},
+                                        players_per_game=3, games_per_seating=2,
+                                        workers=os.cpu_count() or 1, compact=True)
+    tournament.run()
+    print(tournament.report())
@@ -0,0 +1,335 @@
+"""Zobrist hashing of the compact state and transposition table
+
+HashedState is CompactState with a 64-bit Zobrist hash, which apply() and undo()
+update incrementally. Factories are hashed as a multiset, so states which differ
+only in the order of factories have the same hash (and the same canonical key).
+Round transitions recompute the hash from scratch. HashedState.from_game() converts
+a running Game exactly (including types of tiles on floors), so the same position of
+Game always has the same hash. TranspositionTable is used by azul.mcts.search.
+"""
+
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from random import Random
+from azul.compact_game import CompactState, Move, UndoRecord, NUMBER_OF_TILE_TYPES
+from azul.game import Game
+
+
+MAX_PLAYERS: int = 4
+MAX_FACTORIES: int = 9
+MAX_COUNT: int = 101            # counts of tiles of one type are at most 100
+# scores are hashed by the value in the range -POINTS_OFFSET ... POINTS_RANGE - POINTS_OFFSET - 1
+POINTS_OFFSET: int = 256
+POINTS_RANGE: int = 1024
+# content of factory (at most 4 tiles of each type) as number in base 5
+FACTORY_CONTENTS: int = 5 ** NUMBER_OF_TILE_TYPES
+
+StateKey = Tuple[object, ...]
+
+
+def factory_content(factory: List[int]) -> int:
+    return (factory[0] + 5 * factory[1] + 25 * factory[2] + 125 * factory[3]
+            + 625 * factory[4])
+
+
+class ZobristKeys:
+    """Random 64-bit keys of all features of the state"""
+
+    turn: List[int]                         # [player on turn]
+    first: List[int]                        # [first player of the round]
+    next_starting_player: List[int]         # [player + 1], 0 for None
+    starting_player_in_center: int
+    center: List[List[int]]                 # [type][count]
+    factories: List[List[int]]              # [content][number of factories with the content]
+    lines: List[List[List[int]]]            # [player][row][6 * (type + 1) + count]
+    walls: List[List[int]]                  # [player][bit]
+    floors: List[List[List[int]]]           # [player][type][count]
+    starting_player_on_floor: List[int]     # [player]
+    points: List[List[int]]                 # [player][points + POINTS_OFFSET]
+    bag: List[List[int]]                    # [type][count]
+    used_tiles: List[List[int]]             # [type][count]
+
+    def __init__(self, seed: int = 0) -> None:
+        random: Random = Random(seed)
+
+        def keys(count: int) -> List[int]:
+            return [random.getrandbits(64) for _ in range(count)]
+
+        self.turn = keys(MAX_PLAYERS)
+        self.first = keys(MAX_PLAYERS)
+        self.next_starting_player = [0] + keys(MAX_PLAYERS)
+        self.starting_player_in_center = random.getrandbits(64)
+        self.center = [[0] + keys(MAX_COUNT - 1) for _ in range(NUMBER_OF_TILE_TYPES)]
+        self.factories = [[0] + keys(MAX_FACTORIES) for _ in range(FACTORY_CONTENTS)]
+        self.lines = [[keys(6 * (NUMBER_OF_TILE_TYPES + 1)) for _ in range(5)]
+                      for _ in range(MAX_PLAYERS)]
+        self.walls = [keys(25) for _ in range(MAX_PLAYERS)]
+        self.floors = [[[0] + keys(MAX_COUNT - 1) for _ in range(NUMBER_OF_TILE_TYPES)]
+                       for _ in range(MAX_PLAYERS)]
+        self.starting_player_on_floor = keys(MAX_PLAYERS)
+        self.points = [keys(POINTS_RANGE) for _ in range(MAX_PLAYERS)]
+        self.bag = [[0] + keys(MAX_COUNT - 1) for _ in range(NUMBER_OF_TILE_TYPES)]
+        self.used_tiles = [[0] + keys(MAX_COUNT - 1) for _ in range(NUMBER_OF_TILE_TYPES)]
+
+
+DEFAULT_KEYS: ZobristKeys = ZobristKeys()
+
+
+class HashedState(CompactState):
+    """CompactState with incrementally updated Zobrist hash"""
+
+    keys: ZobristKeys
+    hash: int
+    factory_counts: Dict[int, int]      # number of factories with each content
+
+    def __init__(self, state: CompactState, keys: Optional[ZobristKeys] = None) -> None:
+        # pylint: disable=super-init-not-called
+        self.__dict__.update(state.copy().__dict__)
+        self.keys = keys if keys is not None else DEFAULT_KEYS
+        self.rehash()
+
+    @staticmethod
+    def from_game(game: Game, random: Optional[Random] = None,
+                  keys: Optional[ZobristKeys] = None) -> HashedState:
+        """Returns the current state of the game, random is used for draws from the bag"""
+        return HashedState(CompactState.from_numeric_state(game.numeric_state(), random,
+                                                           game.floor_counts()), keys)
+
+    def rehash(self) -> None:
+        """Computes the hash from scratch"""
+        self.factory_counts = {}
+        for factory in self.factories:
+            content: int = factory_content(factory)
+            self.factory_counts[content] = self.factory_counts.get(content, 0) + 1
+        self.hash = self.compute_hash()
+
+    def compute_hash(self) -> int:
+        keys: ZobristKeys = self.keys
+        result: int = (keys.turn[self.player_on_turn()] ^ keys.first[self.order[0]]
+                       ^ keys.next_starting_player[self.player_key(self.next_starting_player)])
+        if self.starting_player_in_center:
+            result ^= keys.starting_player_in_center
+        for content, count in self.factory_counts.items():
+            result ^= keys.factories[content][count]
+        for idx in range(NUMBER_OF_TILE_TYPES):
+            result ^= (keys.center[idx][self.center[idx]] ^ keys.bag[idx][self.bag[idx]]
+                       ^ keys.used_tiles[idx][self.used_tiles[idx]])
+        for player in range(self.number_of_players):
+            result ^= keys.points[player][self.points[player] + POINTS_OFFSET]
+            for row in range(5):
+                result ^= self.line_key(player, row)
+            for bit in range(25):
+                if self.walls[player] >> bit & 1:
+                    result ^= keys.walls[player][bit]
+            for idx in range(NUMBER_OF_TILE_TYPES):
+                result ^= keys.floors[player][idx][self.floors[player][idx]]
+            if self.starting_player_on_floor[player]:
+                result ^= keys.starting_player_on_floor[player]
+        return result
+
+    @staticmethod
+    def player_key(player: Optional[int]) -> int:
+        return 0 if player is None else player + 1
+
+    def line_key(self, player: int, row: int) -> int:
+        return self.keys.lines[player][row][6 * (self.line_types[player][row] + 1)
+                                            + self.line_counts[player][row]]
+
+    def move_key(self, move: Move, player: int) -> int:
+        """XOR of keys of all features, which the move of the player can change
+
+        factories are handled separately in apply() and undo()
+        """
+        source_idx, idx, destination_idx = move
+        keys: ZobristKeys = self.keys
+        result: int = (keys.turn[self.player_on_turn()]
+                       ^ keys.next_starting_player[self.player_key(self.next_starting_player)]
+                       ^ self.line_key(player, destination_idx)
+                       ^ keys.floors[player][idx][self.floors[player][idx]])
+        if self.starting_player_in_center:
+            result ^= keys.starting_player_in_center
+        if self.starting_player_on_floor[player]:
+            result ^= keys.starting_player_on_floor[player]
+        if source_idx == 0:
+            result ^= keys.center[idx][self.center[idx]]
+        else:
+            for i in range(NUMBER_OF_TILE_TYPES):
+                result ^= keys.center[i][self.center[i]]
+        return result
+
+    def change_factory(self, before: int, after: int) -> None:
+        """Updates hash of factories when one factory changes its content"""
+        factories: List[List[int]] = self.keys.factories
+        counts: Dict[int, int] = self.factory_counts
+        count_before: int = counts.get(before, 0)
+        count_after: int = counts.get(after, 0)
+        self.hash ^= (factories[before][count_before] ^ factories[before][count_before - 1]
+                      ^ factories[after][count_after] ^ factories[after][count_after + 1])
+        if count_before == 1:
+            del counts[before]
+        else:
+            counts[before] = count_before - 1
+        counts[after] = count_after + 1
+
+    def apply(self, move: Move) -> UndoRecord:
+        player: int = self.player_on_turn()
+        source_idx: int = move[0]
+        content: int = factory_content(self.factories[source_idx - 1]) if source_idx else 0
+        self.hash ^= self.move_key(move, player)
+        record: UndoRecord = super().apply(move)
+        self.hash ^= self.move_key(move, player)
+        if source_idx and content:
+            self.change_factory(content, 0)
+        return record
+
+    def undo(self, record: UndoRecord) -> None:
+        player: int = self.order[record.on_turn]
+        source_idx: int = record.move[0]
+        self.hash ^= self.move_key(record.move, player)
+        super().undo(record)
+        self.hash ^= self.move_key(record.move, player)
+        if source_idx:
+            content: int = factory_content(self.factories[source_idx - 1])
+            if content:
+                self.change_factory(0, content)
+
+    def take(self, source_idx: int, idx: int, destination_idx: int) -> None:
+        on_turn: int = self.on_turn
+        self.apply((source_idx, idx, destination_idx))
+        self.hash ^= self.keys.turn[self.player_on_turn()] ^ self.keys.turn[self.order[on_turn]]
+        self.on_turn = on_turn
+
+    def next_player(self) -> None:
+        self.hash ^= self.keys.turn[self.player_on_turn()]
+        super().next_player()
+        self.hash ^= self.keys.turn[self.player_on_turn()]
+
+    def start_new_round(self) -> None:
+        super().start_new_round()
+        self.rehash()
+
+    def finish_round(self) -> bool:
+        game_finished: bool = super().finish_round()
+        self.rehash()
+        return game_finished
+
+    def next_round_order(self) -> None:
+        super().next_round_order()
+        self.rehash()
+
+    def end_game(self) -> None:
+        super().end_game()
+        self.rehash()
+
+    def copy(self) -> HashedState:
+        return HashedState(super().copy(), self.keys)
+
+    def canonical_key(self) -> StateKey:
+        """Returns hashable key of the state, order of factories does not matter"""
+        return (self.number_of_players, tuple(self.order), self.on_turn, self.next_starting_player,
+                tuple(self.center), self.starting_player_in_center,
+                tuple(sorted(tuple(factory) for factory in self.factories)),
+                tuple(tuple(line_types) for line_types in self.line_types),
+                tuple(tuple(line_counts) for line_counts in self.line_counts),
+                tuple(self.walls), tuple(tuple(floor) for floor in self.floors),
+                tuple(self.starting_player_on_floor), tuple(self.points),
+                tuple(self.bag), tuple(self.used_tiles))
+
+
+class TableEntry:
+    """Evaluation of a state stored in TranspositionTable"""
+
+    hash: int
+    depth: int
+    value: float
+    move: Optional[Move]
+    generation: int
+
+    def __init__(self, hash_: int, depth: int, value: float, move: Optional[Move],
+                 generation: int) -> None:
+        self.hash = hash_
+        self.depth = depth
+        self.value = value
+        self.move = move
+        self.generation = generation
+
+
+class TranspositionTable:
+    """Bounded table of evaluations of states by their hashes
+
+    each of size buckets (hash modulo size) has two slots:
+    - depth-preferred slot keeps the entry searched to the greatest depth, entries from older
+      searches (see new_search()) are replaced regardless of depth,
+    - the other slot always takes the newest entry, which did not get to the first slot
+    """
+
+    size: int
+    generation: int
+    hits: int
+    misses: int
+    _deep: List[Optional[TableEntry]]
+    _recent: List[Optional[TableEntry]]
+
+    def __init__(self, size: int = 1 << 16) -> None:
+        self.size = size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._deep = [None] * size
+        self._recent = [None] * size
+
+    def new_search(self) -> None:
+        """Marks all stored entries as old, they will be replaced by entries of the new search"""
+        self.generation += 1
+
+    def lookup(self, hash_: int) -> Optional[TableEntry]:
+        bucket: int = hash_ % self.size
+        for entry in (self._deep[bucket], self._recent[bucket]):
+            if entry is not None and entry.hash == hash_:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, hash_: int, depth: int, value: float, move: Optional[Move] = None) -> None:
+        bucket: int = hash_ % self.size
+        entry: TableEntry = TableEntry(hash_, depth, value, move, self.generation)
+        deep: Optional[TableEntry] = self._deep[bucket]
+        if (deep is None or deep.hash == hash_ or depth >= deep.depth
+                or deep.generation != self.generation):
+            if deep is not None and deep.hash != hash_:
+                self._recent[bucket] = deep
+            elif deep is not None:
+                recent: Optional[TableEntry] = self._recent[bucket]
+                if recent is not None and recent.hash == hash_:
+                    self._recent[bucket] = None
+            self._deep[bucket] = entry
+        else:
+            self._recent[bucket] = entry
+
+    def __len__(self) -> int:
+        return sum(entry is not None for entry in self._deep + self._recent)
+
+
+def count_leaves(state: HashedState, depth: int,
+                 table: Optional[TranspositionTable] = None) -> int:
+    """Counts move sequences of length depth within the round, reuses counts of transpositions
+
+    stored values are counts of leaves under the state, searched to depth
+    """
+    if depth == 0 or state.is_round_end():
+        return 1
+    if table is not None:
+        entry: Optional[TableEntry] = table.lookup(state.hash)
+        if entry is not None and entry.depth == depth:
+            return int(entry.value)
+
+    leaves: int = 0
+    for move in state.legal_moves():
+        record: UndoRecord = state.apply(move)
+        leaves += count_leaves(state, depth - 1, table)
+        state.undo(record)
+    if table is not None:
+        table.store(state.hash, depth, leaves)
+    return leaves
@@ -1,7 +1,6 @@
 from __future__ import annotations
-from typing import List, Dict
-from collections import Counter
-from azul.simple_types import Tile, STARTING_PLAYER
+from typing import List
+from azul.simple_types import Tile, count_tile_types, counted_tiles_state, STARTING_PLAYER
 from interfaces.combined_interfaces import UsedTilesInterface
 
 class UsedTiles(UsedTilesInterface):
@@ -25,12 +24,11 @@ class UsedTiles(UsedTilesInterface):
         return new_copy
         
     def state(self) -> str:
-        counted_tiles: Dict[Tile, int] = dict(Counter(self._tiles))
-        result: list[str] = []
-        tile_type: Tile
-        for tile_type in sorted(counted_tiles, key=str):
-            result.append(f'|{str(tile_type)}: {counted_tiles[tile_type]}|')
-        return ' '.join(result)
+        return counted_tiles_state(self._tiles)
+    
+    def numeric_state(self) -> List[int]:
+        """Returns number of tiles of each type"""
+        return count_tile_types(self._tiles)
     
     def get_tiles(self) -> List[Tile]:
         return self._tiles
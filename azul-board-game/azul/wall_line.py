@@ -13,12 +13,15 @@ class WallLine(WallLineAdjacentLineInterface, PatternWallLineInterface):
     _line_down: Optional[WallLineAdjacentLineInterface]
     _after_put_point_counter: AfterPutPointCounterInterface
 
-    def __init__(self, tile_types: List[Tile]) -> None:
+    def __init__(self, tile_types: List[Tile],
+                 after_put_point_counter: Optional[AfterPutPointCounterInterface] = None) -> None:
         self._tile_types = tile_types
         self._tiles = [None] * 5
         self._line_up = None
         self._line_down = None
-        self._after_put_point_counter = AfterPutPointCounter()
+        if after_put_point_counter is None:
+            after_put_point_counter = AfterPutPointCounter()
+        self._after_put_point_counter = after_put_point_counter
 
     def can_put_tile(self, tile: Tile) -> bool:
         """Checks whether corresponding slot on wall line is not occupied"""
@@ -0,0 +1,158 @@
+"""Wall as a 25-bit mask
+
+Bit 5 * row + column is set for occupied slot of the wall. Points for put tile
+and end game bonuses are computed from precomputed tables and bit operations.
+Mask versions of the point counter, final points calculation and game finished
+check can be passed to Board and Game instead of the ones working with lists of tiles.
+"""
+
+
+from __future__ import annotations
+from typing import List, Optional, Tuple
+from interfaces.round_results_interfaces import (FinalPointsCalculationInterface,
+                                                 GameFinishedInterface)
+from interfaces.wall_line_interface import WallLineAdjacentLineInterface
+from azul.simple_types import Tile, Points, FinishRoundResult, NORMAL, GAME_FINISHED
+from azul.wall_line import AfterPutPointCounterInterface
+
+
+FULL_LINE: int = 0b11111
+# bits of the first column, other columns are shifted by column index
+FIRST_COLUMN: int = sum(1 << (5 * row) for row in range(5))
+# multiplying masked column by this moves bit 5 * row to bit 20 + row, without carries
+COLUMN_GATHER: int = sum(1 << (20 - 4 * row) for row in range(5))
+
+# column of tile type (index in TILE_TYPES) in the first wall line, next lines are shifted by one
+FIRST_WALL_LINE_COLUMNS: List[int] = [3, 0, 4, 2, 1]
+
+ROW_MASKS: List[int] = [FULL_LINE << (5 * row) for row in range(5)]
+COLUMN_MASKS: List[int] = [FIRST_COLUMN << column for column in range(5)]
+# slots of one tile type, in order of TILE_TYPES
+TILE_TYPE_MASKS: List[int] = [
+    sum(1 << (5 * row + (first_column + row) % 5) for row in range(5))
+    for first_column in FIRST_WALL_LINE_COLUMNS
+]
+BONUS_MASKS: List[Tuple[int, int]] = ([(mask, 2) for mask in ROW_MASKS]
+                                      + [(mask, 7) for mask in COLUMN_MASKS]
+                                      + [(mask, 10) for mask in TILE_TYPE_MASKS])
+
+
+def wall_column(row: int, idx: int) -> int:
+    """Returns column of the wall line row, where tile with tile code idx belongs"""
+    return (FIRST_WALL_LINE_COLUMNS[idx] + row) % 5
+
+
+def run_lengths() -> List[List[int]]:
+    """RUN_LENGTH[position][line] is length of run of set bits in 5-bit line containing position"""
+    table: List[List[int]] = []
+    for position in range(5):
+        lengths: List[int] = []
+        for line in range(32):
+            if not line >> position & 1:
+                lengths.append(0)
+                continue
+            start: int = position
+            while start > 0 and line >> (start - 1) & 1:
+                start -= 1
+            end: int = position
+            while end < 4 and line >> (end + 1) & 1:
+                end += 1
+            lengths.append(end - start + 1)
+        table.append(lengths)
+    return table
+
+
+RUN_LENGTH: List[List[int]] = run_lengths()
+
+
+def row_of(mask: int, row: int) -> int:
+    """Returns 5 bits of the row, column i is bit i"""
+    return mask >> (5 * row) & FULL_LINE
+
+
+def column_of(mask: int, column: int) -> int:
+    """Returns 5 bits of the column, row i is bit i"""
+    return ((mask >> column & FIRST_COLUMN) * COLUMN_GATHER) >> 20 & FULL_LINE
+
+
+def points_after_put(mask: int, row: int, column: int) -> int:
+    """Returns points for tile put to (row, column), mask already contains the put tile"""
+    horizontal: int = RUN_LENGTH[column][row_of(mask, row)]
+    vertical: int = RUN_LENGTH[row][column_of(mask, column)]
+    if horizontal == 1:
+        return vertical
+    if vertical == 1:
+        return horizontal
+    return horizontal + vertical
+
+
+def final_points(mask: int) -> int:
+    """Returns bonus points for full rows, full columns and all tiles of one type on the wall"""
+    return sum(points for bonus_mask, points in BONUS_MASKS if mask & bonus_mask == bonus_mask)
+
+
+def has_full_row(mask: int) -> bool:
+    return any(mask & row_mask == row_mask for row_mask in ROW_MASKS)
+
+
+def wall_to_mask(wall: List[List[Optional[Tile]]]) -> int:
+    """Converts wall as list of wall lines to mask"""
+    mask: int = 0
+    for row, line in enumerate(wall):
+        for column, tile in enumerate(line):
+            if tile is not None:
+                mask |= 1 << (5 * row + column)
+    return mask
+
+
+class WallMask:
+    """Mask of the wall of one Board, shared by MaskPointCounters of its WallLines"""
+    mask: int
+
+    def __init__(self) -> None:
+        self.mask = 0
+
+
+class MaskPointCounter(AfterPutPointCounterInterface):
+    """Counts points after put using WallMask instead of walking adjacent WallLines"""
+
+    _wall_mask: WallMask
+    _row: int
+
+    def __init__(self, wall_mask: WallMask, row: int) -> None:
+        self._wall_mask = wall_mask
+        self._row = row
+
+    def count_points_after_put(self, tiles: List[Optional[Tile]], col: int,
+                               line_up: Optional[WallLineAdjacentLineInterface],
+                               line_down: Optional[WallLineAdjacentLineInterface]) -> Points:
+        self._wall_mask.mask |= 1 << (5 * self._row + col)
+        return Points(points_after_put(self._wall_mask.mask, self._row, col))
+
+
+class MaskFinalPointsCalculation(FinalPointsCalculationInterface):
+    """Same as FinalPointsCalculation composed of all wall point calculations
+
+    Board with WallMask passes its mask to get_points_of_mask, the wall is not scanned
+    """
+
+    def get_points(self, wall: List[List[Optional[Tile]]]) -> Points:
+        return self.get_points_of_mask(wall_to_mask(wall))
+
+    def get_points_of_mask(self, mask: int) -> Points:
+        """Returns bonus points of the wall given as mask"""
+        return Points(final_points(mask))
+
+
+class MaskGameFinished(GameFinishedInterface):
+    """Same as GameFinished
+
+    Board with WallMask passes its mask to game_finished_of_mask, the wall is not scanned
+    """
+
+    def game_finished(self, wall: List[List[Optional[Tile]]]) -> FinishRoundResult:
+        return self.game_finished_of_mask(wall_to_mask(wall))
+
+    def game_finished_of_mask(self, mask: int) -> FinishRoundResult:
+        """Returns whether the wall given as mask has a full row"""
+        return GAME_FINISHED if has_full_row(mask) else NORMAL
@@ -1,5 +1,10 @@
+from typing import Dict, Optional
+import sys
+from random import Random
 from interfaces.game_interface import GameInterface
 from azul.game import Game
+from azul.simulation import Policy
+from azul.mcts import MCTSPlayer
 
 class InputError(Exception):
     
@@ -11,13 +16,18 @@ class Communication:
     
     Registers callback function to game to display state on terminal
     Checks initial validness of inputs
+    Players with IDs in bots are played by their policies
     """
     _game: GameInterface
+    _bots: Dict[int, Policy]
+    _random: Random
     
-    def __init__(self) -> None:
+    def __init__(self, bots: Optional[Dict[int, Policy]] = None) -> None:
         """Initializes game, registers callback function for displaying on the terminal"""
         self._game = Game()
         self._game.register_callback(self.display)
+        self._bots = bots if bots is not None else {}
+        self._random = Random()
         self.session()
     
     def session(self) -> None:
@@ -51,6 +61,7 @@ class Communication:
             ids: list[int] = list(parameters[1:])
             if not self._game.start(number_of_players, *ids):
                 raise InputError
+            self.play_bots()
         except InputError as e:
             self.display(f'Invalid start command: {str(e)}')
         except IndexError:
@@ -66,14 +77,27 @@ class Communication:
             destination_idx: int = parameters[3]
             if not self._game.take(player_id, source_idx, idx, destination_idx):
                 raise InputError
+            self.play_bots()
         except InputError as e:
             self.display(f'Invalid take command: {str(e)}')
         except IndexError:
             self.display('Invalid start command: insufficient arguments')
     
+    def play_bots(self) -> None:
+        """Plays moves of bots until a player who is not a bot is on turn"""
+        while not self._game.is_ended() and self._game.get_player_on_turn() in self._bots:
+            player_id: int = self._game.get_player_on_turn()
+            source_idx, idx, destination_idx = self._bots[player_id](self._game.numeric_state(),
+                                                                     self._random)
+            self.display(f'take {player_id} {source_idx} {idx} {destination_idx}')
+            if not self._game.take(player_id, source_idx, idx, destination_idx):
+                self.display(f'Invalid take command of bot {player_id}, bots are stopped')
+                return
+    
     def display(self, state: str) -> None:
         """Displays state string on terminal"""
         print(state)
 
 if __name__ == "__main__":
-    Communication()
+    # IDs of players played by MCTS bot can be given as arguments
+    Communication({int(player_id): MCTSPlayer() for player_id in sys.argv[1:]})
@@ -0,0 +1,334 @@
+"""Server hosting many games, line protocol over TCP
+
+Commands of a client (one per line), every one gets one reply, "ok ..." or "error ...":
+    new [seed]                                          ok <table>
+    start <table> <number of players> <ids...>          ok
+    take <table> <player ID> <source> <tile code> <pattern line>    ok
+    subscribe <table> / unsubscribe <table>             ok
+    state <table>                                       ok <version> <numeric state...>
+    quit
+Subscribers of a table are notified through its GameObserver, they get pushed lines:
+    full <table> <version> <numeric state...>           after start and after subscribe
+    diff <table> <version> <index>:<value>...           changed items of numeric state
+Version is the number of successful commands of the table. Games are headless, so their
+states are never rendered.
+
+Every connection has bounded queue of outgoing lines. If a subscriber does not read
+fast enough and the queue is full, its diffs are dropped and it gets full state of
+the table once the queue is drained. Replies wait for space in the queue, so the server
+stops reading commands of such connection.
+"""
+
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import sys
+from azul.game import Game
+from azul.game_observer import GameObserver
+from azul.instance_factory import InstanceFactory
+from azul.observer import Observer
+
+
+class Table:
+    """Game hosted by the server with its subscribers"""
+
+    table_id: int
+    game: Game
+    version: int
+    observers: GameObserver
+    _state: Tuple[int, ...]
+
+    def __init__(self, table_id: int, seed: Optional[int] = None) -> None:
+        self.table_id = table_id
+        self.game = Game(InstanceFactory(seed, fast_scoring=True), headless=True)
+        self.version = 0
+        self.observers = GameObserver()
+        self._state = ()
+
+    def start(self, num_of_players: int, *ids: int) -> bool:
+        if not self.game.start(num_of_players, *ids):
+            return False
+        self.version += 1
+        self._state = self.game.numeric_state()
+        self.observers.notify_everybody(self.full_state())
+        return True
+
+    def take(self, player_id: int, source_idx: int, idx: int, destination_idx: int) -> bool:
+        if not self._state or not self.game.take(player_id, source_idx, idx, destination_idx):
+            return False
+        self.version += 1
+        state: Tuple[int, ...] = self.game.numeric_state()
+        changes: List[str] = [f'{i}:{value}' for i, (value, old) in
+                              enumerate(zip(state, self._state)) if value != old]
+        self._state = state
+        self.observers.notify_everybody(f'diff {self.table_id} {self.version} '
+                                        + ' '.join(changes))
+        return True
+
+    def state(self) -> str:
+        return ' '.join(map(str, (self.version,) + self._state))
+
+    def full_state(self) -> str:
+        return f'full {self.table_id} {self.state()}'
+
+
+class Subscription(Observer):
+    """Observer of a table, which passes notifications to the connection of the subscriber"""
+
+    _connection: Connection
+    _table_id: int
+
+    def __init__(self, connection: Connection, table_id: int) -> None:
+        super().__init__()
+        self._connection = connection
+        self._table_id = table_id
+
+    def notify(self, new_state: str) -> None:
+        super().notify(new_state)
+        self._connection.push(self._table_id, new_state)
+
+
+class Connection:
+    """Client connected to the server"""
+
+    _server: Server
+    _reader: asyncio.StreamReader
+    _writer: asyncio.StreamWriter
+    _queue: asyncio.Queue[Optional[str]]
+    _stale: Set[int]                        # tables which need full state
+    subscriptions: Dict[int, Subscription]
+    dropped: int
+    finished: asyncio.Event
+
+    def __init__(self, server: Server, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, queue_size: int) -> None:
+        self._server = server
+        self._reader = reader
+        self._writer = writer
+        self._queue = asyncio.Queue(queue_size)
+        self._stale = set()
+        self.subscriptions = {}
+        self.dropped = 0
+        self.finished = asyncio.Event()
+
+    def push(self, table_id: int, line: str) -> None:
+        """Queues line for the subscriber, drops it and marks the table stale if queue is full"""
+        if table_id in self._stale:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(line)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._stale.add(table_id)
+
+    async def serve(self) -> None:
+        writing: asyncio.Task[None] = asyncio.create_task(self.write())
+        try:
+            while True:
+                line: bytes = await self._reader.readline()
+                if not line or line.strip() == b'quit':
+                    break
+                await self._queue.put(self._server.execute(self, line.decode().strip()))
+        except ConnectionError:
+            pass
+        finally:
+            for table_id in list(self.subscriptions):
+                self.unsubscribe(table_id)
+            await self._queue.put(None)
+            await writing
+            self._writer.close()
+            self.finished.set()
+
+    def close(self) -> None:
+        """Closes the connection, serve() finishes as if the client disconnected"""
+        self._writer.close()
+
+    async def write(self) -> None:
+        """Writes queued lines, full states of stale tables when the queue is drained"""
+        try:
+            while True:
+                line: Optional[str] = await self._queue.get()
+                if line is None:
+                    return
+                self._writer.write(line.encode() + b'\n')
+                while self._queue.empty() and self._stale:
+                    table: Optional[Table] = self._server.tables.get(self._stale.pop())
+                    if table is not None:
+                        self._writer.write(table.full_state().encode() + b'\n')
+                await self._writer.drain()
+        except ConnectionError:
+            # nothing more can be written, lines are discarded so that serve() does not block
+            while await self._queue.get() is not None:
+                pass
+
+    def subscribe(self, table: Table) -> None:
+        if table.table_id not in self.subscriptions:
+            self.subscriptions[table.table_id] = Subscription(self, table.table_id)
+            table.observers.register_observer(self.subscriptions[table.table_id])
+        self._stale.add(table.table_id)
+
+    def unsubscribe(self, table_id: int) -> None:
+        subscription: Optional[Subscription] = self.subscriptions.pop(table_id, None)
+        table: Optional[Table] = self._server.tables.get(table_id)
+        if subscription is not None and table is not None:
+            table.observers.cancel_observer(subscription)
+        self._stale.discard(table_id)
+
+
+class Server:
+    """Hosts tables and serves connections, see module docstring for the protocol"""
+
+    tables: Dict[int, Table]
+    connections: Set[Connection]
+    queue_size: int
+    _server: Optional[asyncio.AbstractServer]
+    _next_table_id: int
+
+    def __init__(self, queue_size: int = 256) -> None:
+        self.tables = {}
+        self.connections = set()
+        self.queue_size = queue_size
+        self._server = None
+        self._next_table_id = 1
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> Tuple[str, int]:
+        """Starts listening, returns the address (port 0 picks a free port)"""
+        self._server = await asyncio.start_server(self.connect, host, port)
+        address: Tuple[str, int] = self._server.sockets[0].getsockname()[:2]
+        return address
+
+    async def close(self) -> None:
+        """Stops listening, closes all connections and waits till they are finished"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        connections: List[Connection] = list(self.connections)
+        for connection in connections:
+            connection.close()
+        await asyncio.gather(*(connection.finished.wait() for connection in connections))
+
+    async def connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection: Connection = Connection(self, reader, writer, self.queue_size)
+        self.connections.add(connection)
+        try:
+            await connection.serve()
+        finally:
+            self.connections.discard(connection)
+
+    def new_table(self, seed: Optional[int] = None) -> Table:
+        table: Table = Table(self._next_table_id, seed)
+        self.tables[table.table_id] = table
+        self._next_table_id += 1
+        return table
+
+    def execute(self, connection: Connection, line: str) -> str:
+        """Executes command of the connection, returns the reply"""
+        try:
+            command, *parameters = line.split()
+            arguments: List[int] = list(map(int, parameters))
+        except ValueError:
+            return 'error commands are "new", "start", "take", "subscribe", "unsubscribe", ' \
+                '"state" and "quit" with int parameters'
+
+        if command == 'new':
+            if len(arguments) > 1:
+                return 'error new takes at most one parameter'
+            return f'ok {self.new_table(*arguments).table_id}'
+        if not arguments or arguments[0] not in self.tables:
+            return 'error unknown table'
+        table: Table = self.tables[arguments[0]]
+
+        if command == 'start':
+            if len(arguments) < 2 or not table.start(arguments[1], *arguments[2:]):
+                return 'error invalid start command'
+            return 'ok'
+        if command == 'take':
+            if len(arguments) != 5 or not table.take(*arguments[1:]):
+                return 'error invalid take command'
+            return 'ok'
+        if command == 'subscribe':
+            connection.subscribe(table)
+            return 'ok'
+        if command == 'unsubscribe':
+            connection.unsubscribe(table.table_id)
+            return 'ok'
+        if command == 'state':
+            return f'ok {table.state()}'
+        return f'error command "{command}" not recognized'
+
+
+class Client:
+    """Client of Server, keeps the states of subscribed tables updated by pushed lines"""
+
+    _reader: asyncio.StreamReader
+    _writer: asyncio.StreamWriter
+    states: Dict[int, List[int]]
+    versions: Dict[int, int]
+    pushed: int
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self.states = {}
+        self.versions = {}
+        self.pushed = 0
+
+    @staticmethod
+    async def connect(host: str, port: int) -> Client:
+        reader, writer = await asyncio.open_connection(host, port)
+        return Client(reader, writer)
+
+    async def command(self, line: str) -> str:
+        """Sends the command, returns its reply, pushed lines received before it are applied"""
+        self._writer.write(line.encode() + b'\n')
+        await self._writer.drain()
+        while True:
+            reply: str = await self.receive()
+            if reply.startswith(('ok', 'error')):
+                return reply
+            self.apply(reply)
+
+    async def receive(self) -> str:
+        line: bytes = await self._reader.readline()
+        if not line:
+            raise ConnectionError('Server closed the connection')
+        return line.decode().rstrip('\n')
+
+    async def wait_for(self, table_id: int, version: int) -> None:
+        """Receives pushed lines until the state of the table has the version"""
+        while self.versions.get(table_id, -1) < version:
+            self.apply(await self.receive())
+
+    def apply(self, line: str) -> None:
+        kind, table, version, *items = line.split()
+        table_id: int = int(table)
+        self.pushed += 1
+        if kind == 'full':
+            self.states[table_id] = [int(item) for item in items]
+            self.versions[table_id] = int(version)
+        elif kind == 'diff' and self.versions.get(table_id) == int(version) - 1:
+            state: List[int] = self.states[table_id]
+            for item in items:
+                index, value = item.split(':')
+                state[int(index)] = int(value)
+            self.versions[table_id] = int(version)
+
+    async def close(self) -> None:
+        self._writer.write(b'quit\n')
+        await self._writer.drain()
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def serve_forever(port: int) -> None:
+    server: Server = Server()
+    host, port = await server.start('0.0.0.0', port)
+    print(f'Serving on {host}:{port}')
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve_forever(int(sys.argv[1]) if len(sys.argv) > 1 else 8765))
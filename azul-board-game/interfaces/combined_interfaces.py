@@ -9,6 +9,7 @@ this structure then implement these combined interfaces.
 """
 
 
+from typing import List
 from abc import ABC, abstractmethod
 from interfaces.factory_interfaces import FactoryBagInterface
 from interfaces.used_tiles_interfaces import UsedTilesGiveInterface, UsedTilesTakeAllInterface
@@ -24,6 +25,10 @@ class BagInterface(FactoryBagInterface, ABC):
     @abstractmethod
     def state(self) -> str:
         pass
+    
+    @abstractmethod
+    def numeric_state(self) -> List[int]:
+        pass
 
 class UsedTilesInterface(UsedTilesGiveInterface, UsedTilesTakeAllInterface, ABC):
     """combines UsedTilesGive for PatternLine and Floor and UsedTilesTakeAll for Bag
@@ -32,3 +37,7 @@ class UsedTilesInterface(UsedTilesGiveInterface, UsedTilesTakeAllInterface, ABC)
     @abstractmethod
     def state(self) -> str:
         pass
+    
+    @abstractmethod
+    def numeric_state(self) -> List[int]:
+        pass
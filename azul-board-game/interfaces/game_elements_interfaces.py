@@ -6,7 +6,9 @@ utilizes substantially
 from __future__ import annotations
 from typing import List
 from abc import ABC, abstractmethod
-from interfaces.observer_interface import ObserverInterface
+from interfaces.observer_interface import (ObserverInterface, ChangeObserverInterface,
+                                          GameViewInterface)
+from azul.change_events import ChangeEvent
 from azul.simple_types import Tile, Points, FinishRoundResult
 
 
@@ -28,6 +30,10 @@ class TableAreaInterface(ABC):
     @abstractmethod
     def state(self) -> str:
         pass
+    
+    @abstractmethod
+    def numeric_state(self) -> List[int]:
+        pass
 
 class BoardInterface(ABC):
     """communication between Board and Game"""
@@ -49,6 +55,14 @@ class BoardInterface(ABC):
     @abstractmethod
     def state(self) -> str:
         pass
+    
+    @abstractmethod
+    def numeric_state(self) -> List[int]:
+        pass
+    
+    @abstractmethod
+    def floor_counts(self) -> List[int]:
+        """Returns number of tiles of each type on the floor, STARTING_PLAYER is not counted"""
 
 class GameObserverInterface(ABC):
     """Interface for observers of the game"""
@@ -63,3 +77,23 @@ class GameObserverInterface(ABC):
     @abstractmethod
     def cancel_observer(self, observer: ObserverInterface) -> None:
         pass
+    
+    @abstractmethod
+    def has_observers(self) -> bool:
+        pass
+    
+    @abstractmethod
+    def notify_changes(self, changes: List[ChangeEvent], view: GameViewInterface) -> None:
+        pass
+    
+    @abstractmethod
+    def register_change_observer(self, observer: ChangeObserverInterface) -> None:
+        pass
+    
+    @abstractmethod
+    def cancel_change_observer(self, observer: ChangeObserverInterface) -> None:
+        pass
+    
+    @abstractmethod
+    def has_change_observers(self) -> bool:
+        pass
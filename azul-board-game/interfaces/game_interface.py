@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, Tuple
 from abc import ABC, abstractmethod
 
 
@@ -25,3 +25,15 @@ class GameInterface(ABC):
         tileIdx - which type of Tile he takes
         destinationIdx - on which PatternLine he places the Tile/Tiles
         """
+    
+    @abstractmethod
+    def numeric_state(self) -> Tuple[int, ...]:
+        """Returns compact state of the game as tuple of ints"""
+    
+    @abstractmethod
+    def get_player_on_turn(self) -> int:
+        """Returns ID of the player on turn"""
+    
+    @abstractmethod
+    def is_ended(self) -> bool:
+        """Returns whether the game has ended"""
@@ -1,5 +1,7 @@
 from __future__ import annotations
+from typing import List
 from abc import ABC, abstractmethod
+from azul.change_events import ChangeEvent
 
 
 class ObserverInterface(ABC):
@@ -11,3 +13,21 @@ class ObserverInterface(ABC):
     @abstractmethod
     def get_message(self) -> str:
         pass
+
+
+class GameViewInterface(ABC):
+    """Rendered state of the game, components are rendered on demand"""
+    @abstractmethod
+    def state(self) -> str:
+        pass
+
+    @abstractmethod
+    def component_state(self, component: str) -> str:
+        pass
+
+
+class ChangeObserverInterface(ABC):
+    """Interface of observers, which get changes instead of rendered state of the game"""
+    @abstractmethod
+    def notify_changes(self, changes: List[ChangeEvent], view: GameViewInterface) -> None:
+        pass
@@ -18,6 +18,10 @@ class TileSource(ABC):
     def state(self) -> str:
         pass
     
+    @abstractmethod
+    def numeric_state(self) -> List[int]:
+        pass
+    
     @abstractmethod
     def start_new_round(self) -> None:
         pass
@@ -6,8 +6,10 @@ from interfaces.instance_factory_interface import InstanceFactoryInterface
 from interfaces.combined_interfaces import UsedTilesInterface, BagInterface
 from interfaces.round_results_interfaces import (FinalPointsCalculationInterface,
                                                  GameFinishedInterface)
-from interfaces.observer_interface import ObserverInterface
+from interfaces.observer_interface import (ObserverInterface, ChangeObserverInterface,
+                                          GameViewInterface)
 from interfaces.used_tiles_interfaces import UsedTilesTakeAllInterface
+from azul.change_events import ChangeEvent
 from azul.simple_types import (Points, Tile, FinishRoundResult, NORMAL, 
                                BLUE, YELLOW, RED, BLACK, GREEN, STARTING_PLAYER)
 
@@ -71,6 +73,12 @@ class FakeBoard(BoardInterface):
         for line in self.lines:
             result.append(str(list(map(str, line))))
         return '\n'.join(result)
+    
+    def numeric_state(self) -> List[int]:
+        return [self.points.value] + [len(line) for line in self.lines]
+    
+    def floor_counts(self) -> List[int]:
+        return [0] * 5
 
 class FakeTableArea(TableAreaInterface):
     tile_sources: List[List[Tile]]
@@ -113,6 +121,9 @@ class FakeTableArea(TableAreaInterface):
     
     def state(self) -> str:
         return str(self.tile_sources)
+    
+    def numeric_state(self) -> List[int]:
+        return [len(tile_source) for tile_source in self.tile_sources]
 
 class FakeBag(BagInterface):
     def take(self, count: int) -> List[Tile]:
@@ -120,6 +131,9 @@ class FakeBag(BagInterface):
     
     def state(self) -> str:
         return ''
+    
+    def numeric_state(self) -> List[int]:
+        return []
 
 class FakeUsedTiles(UsedTilesInterface):
     def give(self, tiles: List[Tile]) -> None:
@@ -131,6 +145,9 @@ class FakeUsedTiles(UsedTilesInterface):
     def state(self) -> str:
         return ''
     
+    def numeric_state(self) -> List[int]:
+        return []
+    
 class FakeGameFinished(GameFinishedInterface):
     def game_finished(self, wall: List[List[Tile | None]]) -> FinishRoundResult:
         return NORMAL
@@ -149,3 +166,18 @@ class FakeGameObserver(GameObserverInterface):
     
     def cancel_observer(self, observer: ObserverInterface) -> None:
         pass
+    
+    def has_observers(self) -> bool:
+        return False
+    
+    def notify_changes(self, changes: List[ChangeEvent], view: GameViewInterface) -> None:
+        pass
+    
+    def register_change_observer(self, observer: ChangeObserverInterface) -> None:
+        pass
+    
+    def cancel_change_observer(self, observer: ChangeObserverInterface) -> None:
+        pass
+    
+    def has_change_observers(self) -> bool:
+        return False
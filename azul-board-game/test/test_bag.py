@@ -18,6 +18,12 @@ class FakeUsedTiles(UsedTilesTakeAllInterface):
     def take_all(self) -> List[Tile]:
         return [YELLOW, RED, GREEN, RED]
 
+
+class FakeEmptyUsedTiles(UsedTilesTakeAllInterface):
+    
+    def take_all(self) -> List[Tile]:
+        return []
+
 class TestBag(unittest.TestCase):
     
     bag: Bag
@@ -65,4 +71,10 @@ class TestBag(unittest.TestCase):
         self.assertCountEqual(self.bag.get_tiles(), [])
         self.assertCountEqual(self.bag.take(0), [])
         self.assertCountEqual(self.bag.get_tiles(), [])
+    
+    def test_take_more_than_all_tiles(self) -> None:
+        self.bag = Bag([RED, YELLOW], FakeEmptyUsedTiles(), self.permutation_generator)
         
+        self.assertCountEqual(self.bag.take(4), [RED, YELLOW])
+        self.assertCountEqual(self.bag.get_tiles(), [])
+        self.assertCountEqual(self.bag.take(4), [])
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import unittest
+from random import Random
+from typing import List
+from interfaces.observer_interface import ChangeObserverInterface, GameViewInterface
+from azul.change_events import (ChangeEvent, TABLE_AREA, BAG, USED_TILES, board_component,
+                                SOURCE_EMPTIED, CENTER_UPDATED, STARTING_PLAYER_TAKEN,
+                                PATTERN_LINE_UPDATED, FLOOR_UPDATED, PLAYER_ON_TURN, NEW_ROUND,
+                                GAME_ENDED)
+from azul.game import Game
+from azul.game_observer import GameObserver
+from azul.instance_factory import InstanceFactory
+from azul.simulation import greedy_policy, tile_sources
+
+
+class ChangeObserver(ChangeObserverInterface):
+    """Renders components named by changes, as a client which redraws only them would"""
+    changes: List[List[ChangeEvent]]
+    rendered: List[str]
+
+    def __init__(self) -> None:
+        self.changes = []
+        self.rendered = []
+
+    def notify_changes(self, changes: List[ChangeEvent], view: GameViewInterface) -> None:
+        self.changes.append(changes)
+        for change in changes:
+            for component in change.components([1, 2, 3]):
+                self.rendered.append(view.component_state(component))
+
+
+class TestChangeEvents(unittest.TestCase):
+
+    game: Game
+    observer: ChangeObserver
+
+    def setUp(self) -> None:
+        self.game = Game(InstanceFactory(4))
+        self.observer = ChangeObserver()
+        self.game.get_game_observer().register_change_observer(self.observer)
+        self.game.start(3, 1, 2, 3)
+
+    def test_game_observer(self) -> None:
+        game_observer: GameObserver = GameObserver()
+        self.assertFalse(game_observer.has_change_observers())
+        game_observer.register_change_observer(self.observer)
+        self.assertTrue(game_observer.has_change_observers())
+        game_observer.notify_changes([ChangeEvent(GAME_ENDED)], self.game)
+        self.assertEqual(self.observer.changes[-1], [ChangeEvent(GAME_ENDED)])
+        game_observer.cancel_change_observer(self.observer)
+        game_observer.cancel_change_observer(self.observer)
+        self.assertFalse(game_observer.has_change_observers())
+
+    def test_hash(self) -> None:
+        events: List[ChangeEvent] = [ChangeEvent(PATTERN_LINE_UPDATED, 1, 2),
+                                     ChangeEvent(PATTERN_LINE_UPDATED, 1, 2),
+                                     ChangeEvent(PATTERN_LINE_UPDATED, 1, 3),
+                                     ChangeEvent(FLOOR_UPDATED, 1)]
+        self.assertEqual(len(set(events)), 3)
+        self.assertEqual(hash(events[0]), hash(events[1]))
+        self.assertIn(ChangeEvent(FLOOR_UPDATED, 1), {event: None for event in events})
+
+    def test_start(self) -> None:
+        self.assertEqual(self.observer.changes, [[ChangeEvent(NEW_ROUND),
+                                                  ChangeEvent(PLAYER_ON_TURN, 1)]])
+        self.assertEqual(len(self.observer.rendered), 6)
+        self.assertEqual(ChangeEvent(NEW_ROUND).components([1, 2]),
+                         [TABLE_AREA, BAG, USED_TILES, 'board 1', 'board 2'])
+
+    def test_take(self) -> None:
+        factory: List[int] = tile_sources(self.game.numeric_state())[1]
+        idx: int = factory.index(max(factory))
+        self.assertTrue(self.game.take(1, 1, idx, 1))
+        expected: List[ChangeEvent] = [ChangeEvent(SOURCE_EMPTIED, index=1),
+                                       ChangeEvent(CENTER_UPDATED, index=0),
+                                       ChangeEvent(PATTERN_LINE_UPDATED, 1, 1)]
+        if max(factory) > 2:
+            expected.append(ChangeEvent(FLOOR_UPDATED, 1))
+        expected.append(ChangeEvent(PLAYER_ON_TURN, 2))
+        self.assertEqual(self.observer.changes[-1], expected)
+
+        center: List[int] = tile_sources(self.game.numeric_state())[0]
+        idx = center.index(max(center))
+        self.assertTrue(self.game.take(2, 0, idx, 4))
+        self.assertEqual(self.observer.changes[-1], [
+            ChangeEvent(CENTER_UPDATED, index=0), ChangeEvent(STARTING_PLAYER_TAKEN, 2),
+            ChangeEvent(PATTERN_LINE_UPDATED, 2, 4), ChangeEvent(FLOOR_UPDATED, 2),
+            ChangeEvent(PLAYER_ON_TURN, 3)])
+        self.assertIn('S', self.game.component_state(board_component(2)))
+        self.assertEqual(repr(ChangeEvent(PATTERN_LINE_UPDATED, 2, 4)),
+                         '<pattern line updated 2 4>')
+
+    def test_cache(self) -> None:
+        random: Random = Random(0)
+        components: List[str] = [TABLE_AREA, BAG, USED_TILES] + [board_component(i)
+                                                                 for i in (1, 2, 3)]
+        while not self.game.is_ended():
+            player_id: int = self.game.get_player_on_turn()
+            others: List[str] = [self.game.component_state(board_component(i))
+                                 for i in (1, 2, 3) if i != player_id]
+            changes: int = len(self.observer.changes)
+            self.assertTrue(self.game.take(player_id,
+                                           *greedy_policy(self.game.numeric_state(), random)))
+            self.assertEqual(len(self.observer.changes), changes + 1)
+            if not {NEW_ROUND, GAME_ENDED} & {change.kind for change in self.observer.changes[-1]}:
+                # boards of other players are not rendered again
+                self.assertEqual([self.game.component_state(board_component(i))
+                                  for i in (1, 2, 3) if i != player_id], others)
+                self.assertTrue(all(
+                    self.game.component_state(board_component(i)) is state for i, state
+                    in zip([i for i in (1, 2, 3) if i != player_id], others)))
+
+            cached: str = self.game.state()
+            self.game.invalidate(*components)
+            self.assertEqual(self.game.state(), cached)
+        self.assertEqual(self.observer.changes[-1][-1], ChangeEvent(GAME_ENDED))
+        self.assertRaises(ValueError, self.game.component_state, 'board 7')
+
+    def test_headless(self) -> None:
+        game: Game = Game(InstanceFactory(4), headless=True)
+        observer: ChangeObserver = ChangeObserver()
+        game.get_game_observer().register_change_observer(observer)
+        game.start(2, 1, 2)
+        game.take(1, 1, 0, 0)
+        self.assertEqual(observer.changes, [])
@@ -0,0 +1,214 @@
+from __future__ import annotations
+import unittest
+from random import Random
+from typing import List, Tuple
+from test.deterministic_instance_factory import TrivialPermutationGenerator
+from interfaces.combined_interfaces import BagInterface
+from interfaces.used_tiles_interfaces import UsedTilesTakeAllInterface
+from azul.bag import Bag
+from azul.game import Game
+from azul.instance_factory import InstanceFactory
+from azul.simple_types import Tile, TILE_TYPES
+from azul.compact_game import CompactGame, CompactState, Move, UndoRecord, floor_penalty
+from azul.simulation import NumericState, Policy, random_policy, greedy_policy
+
+
+class ScriptedBag(Bag):
+    """Bag which gives tiles drawn by CompactState"""
+    draws: List[List[Tile]]
+
+    def __init__(self, used_tiles: UsedTilesTakeAllInterface, draws: List[List[Tile]]) -> None:
+        super().__init__(TILE_TYPES * 20, used_tiles, TrivialPermutationGenerator())
+        self.draws = draws
+
+    def get_random_tiles(self, count: int) -> List[Tile]:
+        tiles: List[Tile] = self.draws.pop(0)
+        assert len(tiles) == count
+        return tiles
+
+
+class ScriptedInstanceFactory(InstanceFactory):
+    draws: List[List[Tile]]
+
+    def __init__(self, draws: List[List[Tile]]) -> None:
+        super().__init__()
+        self.draws = draws
+
+    def get_bag(self, used_tiles: UsedTilesTakeAllInterface) -> BagInterface:
+        return ScriptedBag(used_tiles, self.draws)
+
+
+def without_floors(state: str) -> str:
+    """Tiles on floor are ordered differently in CompactGame"""
+    return '\n'.join(line for line in state.split('\n') if 'Floor:' not in line)
+
+
+class TestCompactGame(unittest.TestCase):
+
+    def test_floor_penalty(self) -> None:
+        self.assertEqual([floor_penalty(i) for i in range(10)],
+                         [0, 1, 2, 4, 6, 8, 11, 14, 17, 20])
+
+    def test_draw_tiles(self) -> None:
+        state: CompactState = CompactState(2, Random(0))
+        state.bag = [1, 0, 2, 0, 0]
+        state.used_tiles = [0, 3, 0, 0, 1]
+        self.assertEqual(sum(state.draw_tiles(3)), 3)
+        self.assertEqual(sum(state.draw_tiles(4)), 4)
+        self.assertEqual(state.used_tiles, [0, 0, 0, 0, 0])
+        self.assertEqual(state.draw_tiles(4), [0, 0, 0, 0, 0])
+        state.bag = [1, 0, 2, 0, 0]
+        state.used_tiles = [0, 0, 0, 0, 0]
+        self.assertEqual(state.draw_tiles(4), [1, 0, 2, 0, 0])
+
+    def random_states(self, seed: int) -> List[CompactState]:
+        """Returns copies of states after every move of a random game"""
+        random: Random = Random(seed)
+        state: CompactState = CompactState(2 + seed % 3, random)
+        state.start_new_round()
+        states: List[CompactState] = []
+        while True:
+            states.append(state.copy())
+            state.take(*random.choice(state.legal_moves()))
+            if state.is_round_end():
+                if state.finish_round():
+                    return states
+                state.next_round_order()
+                state.start_new_round()
+            else:
+                state.next_player()
+
+    def search(self, state: CompactState, depth: int) -> None:
+        """Applies and undoes all legal moves recursively, checks that state is restored"""
+        if depth == 0 or state.is_round_end():
+            return
+        before: CompactState = state.copy()
+        move: Move
+        for move in state.legal_moves():
+            record: UndoRecord = state.apply(move)
+            self.assertNotEqual(state.__dict__, before.__dict__)
+            self.search(state, depth - 1)
+            state.undo(record)
+            self.assertEqual(state.__dict__, before.__dict__)
+
+    def test_apply_undo(self) -> None:
+        for seed in range(3):
+            for state in self.random_states(seed)[::4]:
+                self.search(state, 2)
+
+    def test_legal_moves(self) -> None:
+        for seed in range(3):
+            for state in self.random_states(seed):
+                # results of all take commands which take some tiles
+                results: List[Tuple[int, ...]] = []
+                for source_idx, counts in enumerate([state.center] + state.factories):
+                    for idx in range(5):
+                        for destination_idx in range(5):
+                            after: CompactState = state.copy()
+                            after.take(source_idx, idx, destination_idx)
+                            if counts[idx]:
+                                results.append(after.numeric_state())
+                if not results:
+                    self.assertEqual(state.legal_moves(), [(0, 0, 0)])
+                    continue
+
+                legal_results: List[Tuple[int, ...]] = []
+                for move in state.legal_moves():
+                    after = state.copy()
+                    after.take(*move)
+                    legal_results.append(after.numeric_state())
+                self.assertEqual(len(set(legal_results)), len(legal_results))
+                self.assertEqual(set(legal_results), set(results))
+
+    def test_only_starting_player_left(self) -> None:
+        state: CompactState = CompactState(2, Random(0))
+        state.starting_player_in_center = True
+        state.factories[0] = [4, 0, 0, 0, 0]
+        state.floors[1] = [0, 0, 0, 3, 0]
+        self.assertEqual(state.legal_moves(), [(1, 0, 0), (1, 0, 1), (1, 0, 2), (1, 0, 3),
+                                               (1, 0, 4)])
+        state.walls[0] = 0b11111
+        state.line_types[0][1] = 2
+        state.line_types[0][4] = 0
+        state.line_counts[0][4] = 5
+        self.assertEqual(state.legal_moves(), [(1, 0, 0), (1, 0, 2), (1, 0, 3)])
+
+        record: UndoRecord = state.apply((1, 0, 0))
+        self.assertEqual(state.floors[0], [4, 0, 0, 0, 0])
+        self.assertEqual(state.legal_moves(), [(0, 0, 0)])
+        record_starting: UndoRecord = state.apply((0, 0, 0))
+        self.assertTrue(state.starting_player_on_floor[1])
+        self.assertEqual(state.next_starting_player, 1)
+        self.assertTrue(state.is_round_end())
+        state.undo(record_starting)
+        state.undo(record)
+        self.assertEqual(state.factories[0], [4, 0, 0, 0, 0])
+        self.assertEqual(state.floors, [[0] * 5, [0, 0, 0, 3, 0]])
+        self.assertTrue(state.starting_player_in_center)
+        self.assertIsNone(state.next_starting_player)
+
+    def add_draws(self, compact: CompactGame, draws: List[List[Tile]]) -> None:
+        """Tiles drawn to factories in new round of CompactGame will be drawn in Game too"""
+        draws.extend([tile for idx, count in enumerate(factory)
+                      for tile in [TILE_TYPES[idx]] * count]
+                     for factory in compact.get_core().factories)
+
+    def play_both(self, players: int, seed: int) -> None:
+        """Plays the same game on Game and CompactGame, compares states after every move"""
+        draws: List[List[Tile]] = []
+        game: Game = Game(ScriptedInstanceFactory(draws))
+        compact: CompactGame = CompactGame(seed)
+        game_states: List[str] = []
+        compact_states: List[str] = []
+        game.register_callback(game_states.append)
+        compact.register_callback(compact_states.append)
+
+        random: Random = Random(seed)
+        ids: List[int] = [20, 10, 40, 30][:players]
+        self.assertTrue(compact.start(players, *ids))
+        self.add_draws(compact, draws)
+        self.assertTrue(game.start(players, *ids))
+        while True:
+            self.assertEqual(game.numeric_state(), compact.numeric_state())
+            self.assertEqual([without_floors(state) for state in game_states],
+                             [without_floors(state) for state in compact_states])
+            if compact.is_ended():
+                break
+
+            state: NumericState = compact.numeric_state()
+            policy: Policy = random_policy if random.random() < 0.5 else greedy_policy
+            source_idx, idx, destination_idx = policy(state, random)
+            player_id: int = compact.get_player_on_turn()
+            rounds: int = compact.get_core().round
+            self.assertTrue(compact.take(player_id, source_idx, idx, destination_idx))
+            if compact.get_core().round != rounds:
+                self.add_draws(compact, draws)
+            self.assertTrue(game.take(player_id, source_idx, idx, destination_idx))
+
+        self.assertTrue(game.is_ended())
+        self.assertEqual([game.get_points(i) for i in ids], [compact.get_points(i) for i in ids])
+
+    def test_same_as_game(self) -> None:
+        for seed in range(12):
+            self.play_both(2 + seed % 3, seed)
+
+    def test_take_calls(self) -> None:
+        compact: CompactGame = CompactGame(0, headless=True)
+        self.assertFalse(compact.take(10, 0, 0, 0))
+        self.assertFalse(compact.start(1, 10))
+        self.assertFalse(compact.start(2, 10, 10))
+        self.assertTrue(compact.start(2, 11, 10))
+        self.assertFalse(compact.start(2, 11, 10))
+        self.assertFalse(compact.take(10, 1, 0, 0))
+        self.assertFalse(compact.take(11, 6, 0, 0))
+        self.assertFalse(compact.take(11, 1, 5, 0))
+        self.assertFalse(compact.take(11, 1, 0, 5))
+        self.assertTrue(compact.take(11, 1, 0, 0))
+        self.assertEqual(compact.get_player_on_turn(), 10)
+
+    def test_default_game_factory(self) -> None:
+        game: Game = Game(InstanceFactory(5), headless=True)
+        self.assertTrue(game.start(2, 1, 2))
+        compact: CompactGame = CompactGame(5, headless=True)
+        self.assertTrue(compact.start(2, 1, 2))
+        self.assertEqual(len(game.numeric_state()), len(compact.numeric_state()))
@@ -20,6 +20,9 @@ class FakeTableCenter(FactoryTableCenterInterface):
     def state(self) -> str:
         return compress_tile_list(self.tiles)
     
+    def numeric_state(self) -> List[int]:
+        return []
+    
     def take(self, idx: Tile) -> List[Tile]:
         return []
     
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import os
+import tempfile
+import unittest
+from random import Random
+from typing import List, Tuple
+from azul.game_log import GameLog, RecordedGame, Replay, Event, START, PLAYER, DRAW, TAKE
+from azul.instance_factory import InstanceFactory
+from azul.simple_types import BLUE, RED, YELLOW
+from azul.simulation import greedy_policy, random_policy
+
+
+class TestGameLog(unittest.TestCase):
+
+    def play(self, players: int, seed: int) -> Tuple[RecordedGame, List[Tuple[int, ...]]]:
+        """Plays recorded game, returns it and numeric states after every move"""
+        game: RecordedGame = RecordedGame(InstanceFactory(seed), headless=True)
+        self.assertTrue(game.start(players, *[7, 3, 12, 5][:players]))
+        states: List[Tuple[int, ...]] = [game.numeric_state()]
+        random: Random = Random(seed)
+        while not game.is_ended():
+            policy = greedy_policy if random.random() < 0.7 else random_policy
+            self.assertTrue(game.take(game.get_player_on_turn(),
+                                      *policy(game.numeric_state(), random)))
+            states.append(game.numeric_state())
+        return game, states
+
+    def test_records(self) -> None:
+        game: RecordedGame = RecordedGame(InstanceFactory(0), headless=True)
+        self.assertFalse(game.start(1, 4))
+        self.assertEqual(len(game.log), 0)
+        self.assertTrue(game.start(2, 4, 2))
+        events: List[Event] = list(game.log.events())
+        self.assertEqual(events[:3], [(START, 2, 0, 0, 0), (PLAYER, 0, 0, 0, 4),
+                                      (PLAYER, 0, 0, 0, 2)])
+        self.assertEqual([event[:2] for event in events[3:]], [(DRAW, 4)] * 5)
+
+        self.assertFalse(game.take(2, 1, 0, 0))
+        player_id: int = game.get_player_on_turn()
+        source_idx, idx, destination_idx = greedy_policy(game.numeric_state(), Random(0))
+        self.assertTrue(game.take(player_id, source_idx, idx, destination_idx))
+        self.assertEqual(len(game.log), 9)
+        self.assertEqual(list(game.log.events())[-1],
+                         (TAKE, source_idx, idx, destination_idx, player_id))
+
+    def test_draw_records(self) -> None:
+        log: GameLog = GameLog()
+        log.record_draw(4, [BLUE, YELLOW, BLUE, RED])
+        log.record_draw(4, [RED])
+        self.assertEqual(len(log), 0)
+        log.flush_draws()
+        events: List[Event] = list(log.events())
+        self.assertEqual(events[0], (DRAW, 4, 0, 0, 2 | 5 << 3 | 2 << 6 | 4 << 9))
+        self.assertEqual(events[1], (DRAW, 4, 0, 0, 4))
+
+    def test_replay(self) -> None:
+        for seed in range(6):
+            game, states = self.play(2 + seed % 3, seed)
+            replay: Replay = Replay(game.log, snapshot_interval=7)
+            self.assertEqual(replay.number_of_moves(), len(states) - 1)
+            for moves in [len(states) - 1, 0, 20, 19, 3] + list(range(len(states))):
+                self.assertEqual(replay.state_at(moves).numeric_state(), states[moves])
+            self.assertTrue(replay.final_state().ended)
+            self.assertRaises(IndexError, replay.state_at, len(states))
+
+    def test_bytes(self) -> None:
+        game, states = self.play(4, 1)
+        for compress in (False, True):
+            data: bytes = game.log.to_bytes(compress)
+            log: GameLog = GameLog.from_bytes(data)
+            self.assertEqual(list(log.events()), list(game.log.events()))
+            self.assertEqual(Replay(log).final_state().numeric_state(), states[-1])
+        self.assertLess(len(game.log.to_bytes(True)), len(game.log.to_bytes()))
+        self.assertEqual(len(game.log.to_bytes()), 8 + 8 * len(game.log))
+        self.assertRaises(ValueError, GameLog.from_bytes, b'AZUL\x01\x00\x00\x00')
+        self.assertRaises(ValueError, GameLog, b'\x01\x02\x00')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, 'game.azlg')
+            game.log.save(path, compress=True)
+            self.assertEqual(list(GameLog.load(path).events()), list(game.log.events()))
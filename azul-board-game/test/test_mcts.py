@@ -0,0 +1,92 @@
+from __future__ import annotations
+import unittest
+from random import Random
+from typing import Dict, List, Tuple
+from azul.compact_game import CompactState, Move
+from azul.game import Game
+from azul.instance_factory import InstanceFactory
+from azul.mcts import MCTSPlayer, playout, playout_move, search
+from azul.simulation import random_policy, simulate_games, SimulationResult
+from azul.transposition import HashedState, TranspositionTable
+
+
+class TestMCTS(unittest.TestCase):
+
+    state: CompactState
+
+    def setUp(self) -> None:
+        self.state = CompactState(3, Random(0))
+        self.state.start_new_round()
+        for _ in range(4):
+            self.state.take(*self.state.legal_moves()[-1])
+            self.state.next_player()
+
+    def test_from_numeric_state(self) -> None:
+        game: Game = Game(InstanceFactory(2), headless=True)
+        game.start(3, 0, 2, 1)
+        random: Random = Random(0)
+        while not game.is_ended():
+            state: Tuple[int, ...] = game.numeric_state()
+            compact: CompactState = CompactState.from_numeric_state(state)
+            self.assertEqual(compact.numeric_state(), state)
+            self.assertEqual(compact.player_on_turn(), game.get_player_on_turn())
+            # order of play is 0, 2, 1 as given to start
+            self.assertEqual(compact.order[(compact.on_turn + 1) % 3],
+                             [2, 0, 1][game.get_player_on_turn()])
+            self.assertTrue(all(count >= 0 for floor in compact.floors for count in floor))
+            player_id: int = game.get_player_on_turn()
+            game.take(player_id, *random_policy(state, random))
+
+    def test_playout(self) -> None:
+        before: Tuple[int, ...] = self.state.numeric_state()
+        rewards: List[float] = playout(self.state, 1, Random(0))
+        self.assertEqual(len(rewards), 3)
+        self.assertTrue(all(0 <= reward <= 1 for reward in rewards))
+        self.assertEqual(playout(self.state, 1, Random(0)), rewards)
+        playout(self.state, 10, Random(1))
+        self.assertEqual(self.state.numeric_state(), before)
+        self.assertIn(playout_move(self.state, Random(0)), self.state.legal_moves())
+
+    def test_search(self) -> None:
+        before: Tuple[int, ...] = self.state.numeric_state()
+        statistics: Dict[Move, Tuple[int, float]] = search(self.state, 300, None, 0)
+        self.assertEqual(self.state.numeric_state(), before)
+        self.assertTrue(set(statistics) <= set(self.state.legal_moves()))
+        self.assertEqual(sum(visits for visits, _ in statistics.values()), 300)
+        self.assertEqual(search(self.state, 300, None, 0), statistics)
+
+    def test_search_with_table(self) -> None:
+        state: HashedState = HashedState(self.state)
+        before: Tuple[int, ...] = state.numeric_state()
+        table: TranspositionTable = TranspositionTable(1 << 12)
+        statistics: Dict[Move, Tuple[int, float]] = search(state, 300, None, 0, table=table)
+        self.assertEqual(state.numeric_state(), before)
+        self.assertEqual(state.hash, state.compute_hash())
+        self.assertTrue(set(statistics) <= set(state.legal_moves()))
+        self.assertGreater(len(table), 0)
+        table.new_search()
+        search(state, 300, None, 1, table=table)
+        self.assertGreater(table.hits, 0)
+        self.assertRaises(ValueError, search, self.state, 10, None, 0, table=table)
+
+        player: MCTSPlayer = MCTSPlayer(playouts=100, seed=0, table_size=1 << 12)
+        game: Game = Game(InstanceFactory(0), headless=True)
+        game.start(2, 0, 1)
+        self.assertIn(player.choose_game_move(game), HashedState.from_game(game).legal_moves())
+
+    def test_player(self) -> None:
+        player: MCTSPlayer = MCTSPlayer(playouts=100, seed=0)
+        self.assertIn(player.choose_move(self.state), self.state.legal_moves())
+        self.assertRaises(ValueError, MCTSPlayer, parallel="tree")
+
+        result: SimulationResult = simulate_games(2, [player, random_policy], seed=0, compact=True)
+        self.assertEqual(result.wins(), [2.0, 0.0])
+
+    def test_parallel_player(self) -> None:
+        for parallel in ("root", "leaf"):
+            player: MCTSPlayer = MCTSPlayer(playouts=40, workers=2, parallel=parallel,
+                                            batch=4, seed=0)
+            try:
+                self.assertIn(player.choose_move(self.state), self.state.legal_moves())
+            finally:
+                player.close()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import asyncio
+import unittest
+from random import Random
+from typing import List, Tuple
+from azul.compact_game import Move
+from azul.game import Game
+from azul.instance_factory import InstanceFactory
+from azul.simulation import greedy_policy
+from communication.server import Server, Client, Table
+
+
+def game_moves(seed: int, *ids: int) -> List[Tuple[int, Move]]:
+    """Plays game with the same draws as table with the seed, returns its moves"""
+    game: Game = Game(InstanceFactory(seed), headless=True)
+    game.start(len(ids), *ids)
+    random: Random = Random(seed)
+    moves: List[Tuple[int, Move]] = []
+    while not game.is_ended():
+        player_id: int = game.get_player_on_turn()
+        move: Move = greedy_policy(game.numeric_state(), random)
+        game.take(player_id, *move)
+        moves.append((player_id, move))
+    return moves
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+
+    server: Server
+    host: str
+    port: int
+
+    async def asyncSetUp(self) -> None:
+        self.server = Server(queue_size=4)
+        self.host, self.port = await self.server.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.server.close()
+
+    async def test_commands(self) -> None:
+        client: Client = await Client.connect(self.host, self.port)
+        self.assertEqual(await client.command('new 3'), 'ok 1')
+        self.assertEqual(await client.command('new'), 'ok 2')
+        self.assertTrue((await client.command('start 3 2 10')).startswith('error'))
+        self.assertTrue((await client.command('take 1 10 1 0 0')).startswith('error'))
+        self.assertTrue((await client.command('start 1 2 10 11 12')).startswith('error'))
+        self.assertEqual(await client.command('start 1 2 10 11'), 'ok')
+        self.assertTrue((await client.command('start 1 2 10 11')).startswith('error'))
+        self.assertTrue((await client.command('take 1 11 1 0 0')).startswith('error'))
+        self.assertTrue((await client.command('take 1 10 1 0')).startswith('error'))
+        self.assertTrue((await client.command('move 1')).startswith('error'))
+        self.assertTrue((await client.command('take 1 x')).startswith('error'))
+
+        player_id, move = game_moves(3, 10, 11)[0]
+        self.assertEqual(await client.command(f'take 1 {player_id} {move[0]} {move[1]} {move[2]}'),
+                         'ok')
+        game: Game = self.server.tables[1].game
+        self.assertEqual(await client.command('state 1'),
+                         'ok 2 ' + ' '.join(map(str, game.numeric_state())))
+        self.assertEqual(await client.command('state 2'), 'ok 0')
+        await client.close()
+
+    async def test_subscriber(self) -> None:
+        player: Client = await Client.connect(self.host, self.port)
+        watcher: Client = await Client.connect(self.host, self.port)
+        await player.command('new 5')
+        self.assertEqual(await watcher.command('subscribe 1'), 'ok')
+        await player.command('start 1 3 4 5 6')
+        moves: List[Tuple[int, Move]] = game_moves(5, 4, 5, 6)
+        for number, (player_id, move) in enumerate(moves, 2):
+            self.assertEqual(await player.command(f'take 1 {player_id} {move[0]} {move[1]} '
+                                                  f'{move[2]}'), 'ok')
+            await watcher.wait_for(1, number)
+            self.assertEqual(tuple(watcher.states[1]),
+                             self.server.tables[1].game.numeric_state())
+        self.assertTrue(self.server.tables[1].game.is_ended())
+
+        self.assertEqual(await watcher.command('unsubscribe 1'), 'ok')
+        self.assertEqual(len(self.server.tables[1].observers.get_observers()), 0)
+        await watcher.close()
+        await player.close()
+
+    async def test_backpressure(self) -> None:
+        player: Client = await Client.connect(self.host, self.port)
+        watcher: Client = await Client.connect(self.host, self.port)
+        await player.command('new 7')
+        await player.command('start 1 2 1 2')
+        await watcher.command('subscribe 1')
+        moves: List[Tuple[int, Move]] = game_moves(7, 1, 2)
+        # all commands are sent at once, the server executes them faster than it writes diffs
+        commands: str = ''.join(f'take 1 {player_id} {move[0]} {move[1]} {move[2]}\n'
+                                for player_id, move in moves)
+        self.assertEqual(await player.command(commands.rstrip('\n')), 'ok')
+        for _ in moves[1:]:
+            self.assertEqual(await player.receive(), 'ok')
+
+        await watcher.wait_for(1, len(moves) + 1)
+        self.assertEqual(tuple(watcher.states[1]), self.server.tables[1].game.numeric_state())
+        self.assertGreater(sum(connection.dropped for connection in self.server.connections), 0)
+        await watcher.close()
+        await player.close()
+
+    async def test_many_tables(self) -> None:
+        clients: List[Client] = [await Client.connect(self.host, self.port) for _ in range(10)]
+
+        async def open_tables(client: Client, count: int) -> None:
+            for _ in range(count):
+                table: str = (await client.command('new')).split()[1]
+                self.assertEqual(await client.command(f'start {table} 4 1 2 3 4'), 'ok')
+
+        await asyncio.gather(*(open_tables(client, 100) for client in clients))
+        self.assertEqual(len(self.server.tables), 1000)
+        self.assertTrue(all(table.version == 1 for table in self.server.tables.values()))
+        for client in clients:
+            await client.close()
+
+    def test_table_diff(self) -> None:
+        table: Table = Table(1, 0)
+        self.assertFalse(table.take(1, 1, 0, 0))
+        self.assertTrue(table.start(2, 1, 2))
+        self.assertEqual(table.full_state().split()[:3], ['full', '1', '1'])
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import unittest
+from random import Random
+from typing import List
+from test.fake_instance_factory import FakeGameFinished, FakeFinalPointsCalculation, FakeUsedTiles
+from azul.board import Board
+from azul.game import Game
+from azul.instance_factory import InstanceFactory
+from azul.simple_types import TILE_TYPES
+from azul.wall_mask import wall_column
+from azul.compact_game import Move
+from azul.simulation import (NumericState, SimulationResult, tile_sources,
+                             board_state, available_takes, random_policy, greedy_policy,
+                             play_game, simulate_games)
+
+
+def invalid_policy(_: NumericState, __: Random) -> Move:
+    return 0, 0, 0
+
+
+class TestSimulation(unittest.TestCase):
+
+    game: Game
+    displayed: List[str]
+
+    def setUp(self) -> None:
+        self.displayed = []
+        self.game = Game(InstanceFactory(1), headless=True)
+        self.game.register_callback(self.displayed.append)
+        self.game.start(3, 12, 10, 11)
+
+    def test_wall_column(self) -> None:
+        board: Board = Board(FakeGameFinished(), FakeFinalPointsCalculation(), FakeUsedTiles())
+        for row, wall_line in enumerate(board.get_wall_lines()):
+            for idx, tile_type in enumerate(TILE_TYPES):
+                self.assertTrue(wall_line.can_put_tile(tile_type))
+                wall_line.put_tile(tile_type)
+                self.assertIs(wall_line.get_tile_in_column(wall_column(row, idx)), tile_type)
+
+    def test_numeric_state(self) -> None:
+        state: NumericState = self.game.numeric_state()
+        self.assertEqual(len(state), 2 + 6 + 7 * 5 + 3 * 14 + 5 + 5 + 3)
+        self.assertEqual(state[0], 3)
+        self.assertEqual(state[1], [10, 11, 12].index(self.game.get_player_on_turn()))
+        self.assertEqual(tile_sources(state)[0], [0, 0, 0, 0, 0])
+        self.assertEqual(state[7], 1)
+        self.assertTrue(all(sum(counts) == 4 for counts in tile_sources(state)[1:]))
+        self.assertEqual(sum(state[-13:-8]), 100 - 7 * 4)
+        self.assertEqual(board_state(state, 2), (0, -1, 0, -1, 0, -1, 0, -1, 0, -1, 0, 0, 0, 0))
+
+        self.assertTrue(self.game.take(12, 1, available_takes(state)[0][1], 0))
+        state = self.game.numeric_state()
+        self.assertEqual(sum(tile_sources(state)[1]), 0)
+        self.assertEqual(sum(board_state(state, 2)[2:11:2]) + board_state(state, 2)[12]
+                         + sum(tile_sources(state)[0]), 4)
+
+    def test_headless_game_does_not_notify(self) -> None:
+        source_idx, idx = available_takes(self.game.numeric_state())[0]
+        self.assertTrue(self.game.take(12, source_idx, idx, 0))
+        self.assertEqual(self.displayed, [])
+
+    def test_play_game(self) -> None:
+        scores, moves = play_game([greedy_policy, random_policy], seed=3)
+        self.assertEqual(play_game([greedy_policy, random_policy], seed=3), (scores, moves))
+        self.assertGreater(moves, 0)
+        self.assertRaises(ValueError, play_game, [invalid_policy, invalid_policy], 3)
+        self.assertRaises(ValueError, play_game, [random_policy], 3)
+
+        scores, moves = play_game([greedy_policy, random_policy], seed=3, compact=True)
+        self.assertEqual(play_game([greedy_policy, random_policy], seed=3, compact=True),
+                         (scores, moves))
+
+    def test_simulate_games(self) -> None:
+        result: SimulationResult = simulate_games(5, [greedy_policy, random_policy,
+                                                      random_policy, random_policy], seed=2)
+        self.assertEqual(len(result.scores), 5)
+        self.assertTrue(all(len(scores) == 4 for scores in result.scores))
+        self.assertAlmostEqual(sum(result.wins()), 5)
+        self.assertGreater(result.games_per_second, 0)
+        self.assertEqual(simulate_games(5, [greedy_policy, random_policy, random_policy,
+                                            random_policy], seed=2).scores, result.scores)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import os
+import tempfile
+import unittest
+from random import Random
+from typing import Dict, List
+from azul.compact_game import Move
+from azul.simulation import NumericState, Policy, greedy_policy, random_policy
+from azul.tournament import (Match, MatchResult, Standing, Tournament, round_robin_matches,
+                             swiss_matches, elo_ratings, ROUND_ROBIN, SWISS)
+
+
+def failing_policy(_: NumericState, __: Random) -> Move:
+    raise AssertionError("match should not be played")
+
+
+POLICIES: Dict[str, Policy] = {"greedy": greedy_policy, "random": random_policy,
+                               "greedy2": greedy_policy}
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_round_robin_matches(self) -> None:
+        matches: List[Match] = round_robin_matches(["a", "b", "c", "d"], 3, 2, 0)
+        self.assertEqual(len(matches), 4 * 3 * 2)
+        self.assertEqual(len({match.match_id for match in matches}), len(matches))
+        for name in "abcd":
+            for seat in range(3):
+                self.assertEqual(sum(match.names[seat] == name for match in matches), 6 // 2 * 2)
+        self.assertEqual([match.seed for match in matches],
+                         [match.seed for match in round_robin_matches(["a", "b", "c", "d"],
+                                                                      3, 2, 0)])
+        # names with "-" do not make the same IDs for different seatings
+        matches = round_robin_matches(["a", "a-b", "b-c", "c"], 2, 1, 0)
+        self.assertEqual(len({match.match_id for match in matches}), len(matches))
+        self.assertEqual(len({match.seed for match in matches}), len(matches))
+
+    def test_swiss_matches(self) -> None:
+        names: List[str] = ["a", "b", "c", "d", "e"]
+        first: List[Match] = swiss_matches(names, 2, [], 0, 0)
+        self.assertEqual(sorted(len(match.names) for match in first), [1, 2, 2])
+        self.assertEqual(sorted(name for match in first for name in match.names), names)
+
+        results: List[MatchResult] = [
+            MatchResult("0-bye-e", ["e"], 0, [], 0),
+            MatchResult("0-0", ["a", "b"], 1, [30, 10], 50),
+            MatchResult("0-1", ["c", "d"], 2, [20, 25], 50)]
+        second: List[Match] = swiss_matches(names, 2, results, 1, 0)
+        byes: List[str] = [match.names[0] for match in second if len(match.names) == 1]
+        self.assertEqual(len(byes), 1)
+        self.assertNotEqual(byes[0], "e")
+        for match in second:
+            self.assertNotIn(sorted(match.names), [["a", "b"], ["c", "d"]])
+
+    def test_elo_ratings(self) -> None:
+        ratings: Dict[str, float] = elo_ratings(["a", "b", "c"], [("a", "b", 0.5)] * 10)
+        self.assertAlmostEqual(ratings["a"], 1500)
+        self.assertAlmostEqual(ratings["c"], 1500)
+        ratings = elo_ratings(["a", "b", "c"], [("a", "b", 1.0), ("b", "c", 1.0)] * 5)
+        self.assertGreater(ratings["a"], ratings["b"])
+        self.assertGreater(ratings["b"], ratings["c"])
+        self.assertAlmostEqual(sum(ratings.values()) / 3, 1500)
+
+    def test_round_robin(self) -> None:
+        tournament: Tournament = Tournament(POLICIES, 2, ROUND_ROBIN, compact=True)
+        results: List[MatchResult] = tournament.run()
+        self.assertEqual(len(results), 6)
+        standings: List[Standing] = tournament.standings()
+        self.assertEqual(standings[-1].name, "random")
+        self.assertEqual(sum(standing.score for standing in standings), 6)
+        low, high = standings[-1].elo_interval
+        self.assertLessEqual(low, standings[-1].elo)
+        self.assertLessEqual(standings[-1].elo, high)
+        self.assertIn("random", tournament.report())
+
+    def test_swiss(self) -> None:
+        policies: Dict[str, Policy] = dict(POLICIES, random2=random_policy)
+        tournament: Tournament = Tournament(policies, 3, SWISS, rounds=3, seed=1)
+        results: List[MatchResult] = tournament.run()
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sum(result.is_bye() for result in results), 3)
+        self.assertAlmostEqual(sum(standing.score for standing in tournament.standings()),
+                               3 + 3 / 3)
+
+    def test_checkpoint(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "tournament.json")
+            tournament: Tournament = Tournament(POLICIES, 2, SWISS, rounds=2, checkpoint=path)
+            self.assertEqual(len(tournament.run(max_matches=1)), 2)
+            resumed: Tournament = Tournament(POLICIES, 2, SWISS, rounds=2, checkpoint=path)
+            self.assertEqual(len(resumed.results), 2)
+            results: List[MatchResult] = resumed.run()
+            self.assertEqual(len(results), 4)
+
+            complete: Tournament = Tournament(POLICIES, 2, SWISS, rounds=2, checkpoint=path)
+            complete.run()
+            self.assertEqual(complete.run()[-1].scores, results[-1].scores)
+            failing: Dict[str, Policy] = {name: failing_policy for name in POLICIES}
+            self.assertEqual(len(Tournament(failing, 2, SWISS, rounds=2, checkpoint=path).run()),
+                             4)
+            self.assertRaises(ValueError, Tournament, POLICIES, 2, SWISS, 3, checkpoint=path)
+
+            # result of a match interrupted while being appended is ignored and played again
+            with open(path, "a", encoding="utf-8") as file:
+                file.write('{"match_id": "1-')
+            interrupted: Tournament = Tournament(POLICIES, 2, SWISS, rounds=2, checkpoint=path)
+            self.assertEqual(len(interrupted.results), 4)
+            self.assertEqual(len(interrupted.run()), 4)
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(len(file.read().splitlines()), 1 + 4)
+
+    def test_workers(self) -> None:
+        sequential: Tournament = Tournament(POLICIES, 3, ROUND_ROBIN, compact=True)
+        parallel: Tournament = Tournament(POLICIES, 3, ROUND_ROBIN, compact=True, workers=2)
+        self.assertEqual([result.scores for result in sequential.run()],
+                         [result.scores for result in parallel.run()])
+
+    def test_invalid_settings(self) -> None:
+        self.assertRaises(ValueError, Tournament, POLICIES, 4)
+        self.assertRaises(ValueError, Tournament, POLICIES, 5)
+        self.assertRaises(ValueError, Tournament, POLICIES, 2, "knockout")
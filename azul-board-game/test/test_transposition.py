@@ -0,0 +1,152 @@
+from __future__ import annotations
+import unittest
+from random import Random
+from typing import List, Optional
+from azul.compact_game import CompactState, Move, UndoRecord
+from azul.game import Game
+from azul.instance_factory import InstanceFactory
+from azul.transposition import HashedState, TableEntry, TranspositionTable, count_leaves
+
+
+def new_state(players: int, seed: int) -> HashedState:
+    state: CompactState = CompactState(players, Random(seed))
+    state.start_new_round()
+    return HashedState(state)
+
+
+class TestHashedState(unittest.TestCase):
+
+    def assert_hash(self, state: HashedState) -> None:
+        self.assertEqual(state.hash, state.compute_hash())
+        fresh: HashedState = state.copy()
+        self.assertEqual(fresh.hash, state.hash)
+        self.assertEqual(fresh.factory_counts, state.factory_counts)
+
+    def search(self, state: HashedState, depth: int) -> None:
+        if depth == 0 or state.is_round_end():
+            return
+        before: int = state.hash
+        for move in state.legal_moves():
+            record: UndoRecord = state.apply(move)
+            self.assert_hash(state)
+            self.search(state, depth - 1)
+            state.undo(record)
+            self.assertEqual(state.hash, before)
+        self.assert_hash(state)
+
+    def test_random_games(self) -> None:
+        for seed in range(3):
+            random: Random = Random(seed)
+            state: HashedState = new_state(2 + seed % 3, seed)
+            moves: int = 0
+            while True:
+                self.search(state, 2 if moves == 0 else 1)
+                state.take(*random.choice(state.legal_moves()))
+                moves += 1
+                self.assert_hash(state)
+                if state.is_round_end():
+                    if state.finish_round():
+                        state.end_game()
+                        self.assert_hash(state)
+                        break
+                    state.next_round_order()
+                    state.start_new_round()
+                else:
+                    state.next_player()
+                self.assert_hash(state)
+
+    def test_order_of_factories(self) -> None:
+        state: HashedState = new_state(2, 0)
+        state.factories = [[4, 0, 0, 0, 0], [1, 1, 1, 1, 0], [4, 0, 0, 0, 0], [0, 0, 2, 0, 2],
+                           [1, 1, 1, 1, 0]]
+        state.rehash()
+        permuted: HashedState = state.copy()
+        permuted.factories = [state.factories[i].copy() for i in (4, 2, 3, 1, 0)]
+        permuted.rehash()
+        self.assertEqual(permuted.hash, state.hash)
+        self.assertEqual(permuted.canonical_key(), state.canonical_key())
+
+        permuted.factories[0] = [0, 1, 1, 1, 1]
+        permuted.rehash()
+        self.assertNotEqual(permuted.hash, state.hash)
+        self.assertNotEqual(permuted.canonical_key(), state.canonical_key())
+
+    def test_transposition(self) -> None:
+        state: HashedState = new_state(2, 1)
+        state.factories = [[4, 0, 0, 0, 0], [0, 4, 0, 0, 0], [0, 0, 3, 1, 0], [0, 0, 0, 0, 4],
+                           [2, 2, 0, 0, 0]]
+        state.rehash()
+        first: HashedState = state.copy()
+        for move in [(1, 0, 3), (2, 1, 1), (3, 2, 2)]:
+            first.apply(move)
+        second: HashedState = state.copy()
+        for move in [(3, 2, 2), (2, 1, 1), (1, 0, 3)]:
+            second.apply(move)
+        self.assertEqual(first.canonical_key(), second.canonical_key())
+        self.assertEqual(first.hash, second.hash)
+        self.assertEqual(first.hash, first.compute_hash())
+
+    def test_from_game(self) -> None:
+        game: Game = Game(InstanceFactory(4), headless=True)
+        game.start(3, 5, 3, 4)
+        random: Random = Random(4)
+        while not game.is_ended():
+            state: HashedState = HashedState.from_game(game)
+            self.assertEqual(state.numeric_state(), game.numeric_state())
+            self.assertEqual(state.floors, game.floor_counts())
+            self.assertEqual(state.hash, state.compute_hash())
+            move: Move = random.choice(state.legal_moves())
+            state.apply(move)
+            self.assertTrue(game.take(game.get_player_on_turn(), *move))
+            if not state.is_round_end():
+                # the same position of the game has the same hash
+                self.assertEqual(HashedState.from_game(game).canonical_key(),
+                                 state.canonical_key())
+                self.assertEqual(HashedState.from_game(game).hash, state.hash)
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_store_lookup(self) -> None:
+        table: TranspositionTable = TranspositionTable(16)
+        self.assertIsNone(table.lookup(5))
+        table.store(5, 2, 0.5, (1, 2, 3))
+        entry: Optional[TableEntry] = table.lookup(5)
+        assert entry is not None
+        self.assertEqual((entry.depth, entry.value, entry.move), (2, 0.5, (1, 2, 3)))
+        self.assertIsNone(table.lookup(21))
+        self.assertEqual((table.hits, table.misses), (1, 2))
+        table.store(5, 1, 0.25)
+        entry = table.lookup(5)
+        assert entry is not None
+        self.assertEqual(entry.value, 0.25)
+        self.assertEqual(len(table), 1)
+
+    def test_replacement(self) -> None:
+        table: TranspositionTable = TranspositionTable(16)
+        table.store(5, 3, 1.0)
+        table.store(21, 1, 2.0)
+        table.store(37, 2, 3.0)
+        # the deepest entry stays, the shallower ones replace each other
+        self.assertIsNotNone(table.lookup(5))
+        self.assertIsNone(table.lookup(21))
+        self.assertIsNotNone(table.lookup(37))
+        table.store(53, 4, 4.0)
+        entries: List[Optional[TableEntry]] = [table.lookup(i) for i in (5, 37, 53)]
+        self.assertEqual([entry is not None for entry in entries], [True, False, True])
+
+        table.new_search()
+        table.store(69, 0, 5.0)
+        entries = [table.lookup(i) for i in (5, 53, 69)]
+        self.assertEqual([entry is not None for entry in entries], [False, True, True])
+        self.assertEqual(len(table), 2)
+
+    def test_count_leaves(self) -> None:
+        state: HashedState = new_state(2, 2)
+        state.factories = [[2, 0, 0, 2, 0], [0, 0, 0, 0, 0], [0, 3, 0, 1, 0], [0, 0, 0, 0, 0],
+                           [0, 0, 0, 0, 0]]
+        state.rehash()
+        table: TranspositionTable = TranspositionTable()
+        self.assertEqual(count_leaves(state, 4, table), count_leaves(state, 4))
+        self.assertGreater(table.hits, 0)
+        self.assertEqual(state.hash, state.compute_hash())
@@ -0,0 +1,95 @@
+from __future__ import annotations
+import unittest
+from random import Random
+from typing import List, Optional
+from test.fake_instance_factory import FakeGameFinished, FakeFinalPointsCalculation, FakeUsedTiles
+from azul.board import Board
+from azul.game import Game
+from azul.game_finished import GameFinished
+from azul.instance_factory import InstanceFactory
+from azul.simple_types import Tile, TILE_TYPES
+from azul.wall_mask import (WallMask, MaskFinalPointsCalculation, MaskGameFinished, wall_column,
+                            row_of, column_of, points_after_put, final_points, wall_to_mask)
+from azul.simulation import greedy_policy, random_policy, NumericState
+
+
+class TestWallMask(unittest.TestCase):
+
+    random: Random
+
+    def setUp(self) -> None:
+        self.random = Random(0)
+
+    def random_wall(self) -> List[List[Optional[Tile]]]:
+        density: float = self.random.random()
+        wall: List[List[Optional[Tile]]] = []
+        for row in range(5):
+            # tile codes in order of columns of the row
+            idxs: List[int] = [0] * 5
+            for idx in range(5):
+                idxs[wall_column(row, idx)] = idx
+            wall.append([TILE_TYPES[idx] if self.random.random() < density else None
+                         for idx in idxs])
+        return wall
+
+    def test_row_and_column(self) -> None:
+        for _ in range(200):
+            mask: int = self.random.getrandbits(25)
+            for i in range(5):
+                self.assertEqual(row_of(mask, i),
+                                 sum((mask >> (5 * i + j) & 1) << j for j in range(5)))
+                self.assertEqual(column_of(mask, i),
+                                 sum((mask >> (5 * j + i) & 1) << j for j in range(5)))
+
+    def test_points_after_put(self) -> None:
+        mask: int = 0
+        for row, column, points in [(0, 0, 1), (0, 1, 2), (1, 1, 2), (2, 1, 3), (1, 0, 4),
+                                    (1, 2, 3), (3, 4, 1), (4, 3, 1), (3, 3, 4), (0, 2, 5)]:
+            mask |= 1 << (5 * row + column)
+            self.assertEqual(points_after_put(mask, row, column), points)
+
+    def test_same_points_as_wall_lines(self) -> None:
+        for _ in range(50):
+            board: Board = Board(FakeGameFinished(), FakeFinalPointsCalculation(), FakeUsedTiles())
+            mask_board: Board = Board(FakeGameFinished(), FakeFinalPointsCalculation(),
+                                      FakeUsedTiles(), WallMask())
+            slots: List[int] = list(range(25))
+            self.random.shuffle(slots)
+            mask: int = 0
+            for slot in slots:
+                row, idx = divmod(slot, 5)
+                tile: Tile = TILE_TYPES[idx]
+                points: int = board.get_wall_lines()[row].put_tile(tile).value
+                self.assertEqual(mask_board.get_wall_lines()[row].put_tile(tile).value, points)
+                mask |= 1 << (5 * row + wall_column(row, idx))
+                self.assertEqual(points_after_put(mask, row, wall_column(row, idx)), points)
+                self.assertEqual(mask_board.numeric_state(), board.numeric_state())
+
+    def test_final_points(self) -> None:
+        self.assertEqual(final_points((1 << 25) - 1), 5 * 2 + 5 * 7 + 5 * 10)
+        self.assertEqual(final_points(0b11111), 2)
+        for _ in range(300):
+            wall: List[List[Optional[Tile]]] = self.random_wall()
+            self.assertEqual(MaskFinalPointsCalculation().get_points(wall),
+                             InstanceFactory().get_final_points_calculation().get_points(wall))
+            self.assertEqual(MaskGameFinished().game_finished(wall),
+                             GameFinished().game_finished(wall))
+            self.assertEqual(bin(wall_to_mask(wall)).count('1'),
+                             sum(tile is not None for line in wall for tile in line))
+
+    def test_fast_scoring_game(self) -> None:
+        for seed in range(4):
+            game: Game = Game(InstanceFactory(seed), headless=True)
+            fast_game: Game = Game(InstanceFactory(seed, fast_scoring=True), headless=True)
+            self.assertTrue(game.start(2 + seed % 3, *range(2 + seed % 3)))
+            self.assertTrue(fast_game.start(2 + seed % 3, *range(2 + seed % 3)))
+            while not game.is_ended():
+                state: NumericState = game.numeric_state()
+                self.assertEqual(fast_game.numeric_state(), state)
+                source_idx, idx, destination_idx = (greedy_policy if seed % 2 else random_policy)(
+                    state, self.random)
+                player_id: int = game.get_player_on_turn()
+                self.assertTrue(game.take(player_id, source_idx, idx, destination_idx))
+                self.assertTrue(fast_game.take(player_id, source_idx, idx, destination_idx))
+            self.assertTrue(fast_game.is_ended())
+            self.assertEqual(fast_game.numeric_state(), game.numeric_state())
@@ -0,0 +1,262 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import Connection
+from typing import Any
+
+from crossword import (CompiledWordIndex, CrossWord, Grid, SolverStatistics, SolvingInterrupted,
+                       compile_word_index, load_grids, load_word_index, load_words, solve)
+
+################################# USEFUL TYPES ################################
+
+# results of the run the later runs are compared with, written by `python benchmark.py --save-baseline`
+BASELINE_PATH: str = "benchmark_baseline.json"
+
+# one run of the benchmark, {"grid", "configuration", "seed", "result", "time", statistics of the run...}
+BenchmarkRow = dict[str, Any]
+
+# columns of the table of results, statistics are the ones of `SolverStatistics`
+COLUMNS: list[str] = ["grid", "configuration", "seed", "result", "time"] + list(SolverStatistics().as_dict().keys())
+
+# configurations of the benchmark by their names, keyword arguments of `solve`
+BENCHMARK_CONFIGURATIONS: dict[str, dict[str, Any]] = {
+    "AC-degree": {"maintain_arc_consistency": True, "unassigned_variable_heuristic": "degree"},
+    "AC-MRV": {"maintain_arc_consistency": True, "unassigned_variable_heuristic": "MRV"},
+    "noAC-degree": {"maintain_arc_consistency": False, "unassigned_variable_heuristic": "degree"},
+    "noAC-MRV": {"maintain_arc_consistency": False, "unassigned_variable_heuristic": "MRV"},
+    "AC-degree-LCV": {"maintain_arc_consistency": True, "unassigned_variable_heuristic": "degree", "use_LCV": "fast"},
+    "AC-MRV-LCV": {"maintain_arc_consistency": True, "unassigned_variable_heuristic": "MRV", "use_LCV": "fast"},
+}
+
+############################## RUNNING BENCHMARK ##############################
+
+def run_configuration(words: list[str], grid: Grid, configuration: dict[str, Any], seed: int, timeout: float,
+                      compiled_index: CompiledWordIndex, connection: Connection) -> None:
+    """Solves the grid with one configuration and seed, runs in a separate process.
+    Sends the result ("solved", "unsolvable", "not found" for incomplete search or "timeout")
+    and the statistics of the run through `connection`.
+
+    Args:
+        words (list[str]): words that can be used in solution
+        grid (Grid): grid to be filled
+        configuration (dict[str, Any]): keyword arguments of `solve`
+        seed (int): seed for shuffling the order of words
+        timeout (float): the search is stopped at the first state after `timeout` seconds
+        compiled_index (CompiledWordIndex): index of `words` compiled beforehand
+        connection (Connection): end of the pipe to the benchmark process
+    """
+    statistics: SolverStatistics = SolverStatistics()
+    deadline: float = time.perf_counter() + timeout
+    try:
+        res: bool = solve(CrossWord(grid), words, seed=seed, should_stop=lambda: time.perf_counter() > deadline,
+                          compiled_index=compiled_index, statistics=statistics, **configuration)
+
+        # False from a run sampling the domains for LCV doesn't prove that the crossword can't be solved
+        complete_search: bool = not (configuration.get("use_LCV", False) and configuration.get("LCV_size") is not None)
+        result: str = "solved" if res else ("unsolvable" if complete_search else "not found")
+    except SolvingInterrupted:
+        result = "timeout"
+    connection.send((result, statistics.as_dict()))
+    connection.close()
+
+
+def run_benchmark(words: list[str], grids: list[Grid],
+                  configurations: dict[str, dict[str, Any]] | None = None,
+                  seeds: list[int] | None = None, grid_indexes: list[int] | None = None,
+                  timeout: float = 60.0, grid_timeouts: dict[int, float] | None = None,
+                  compiled_index: CompiledWordIndex | None = None) -> list[BenchmarkRow]:
+    """Solves each grid with each configuration and seed, each run in its own process with a time limit.
+    Search is stopped at the first state after the time limit, if the run is stuck in propagation,
+    its process is killed shortly after, statistics of such run are not known.
+
+    Args:
+        words (list[str]): words that can be used in solution
+        grids (list[Grid]): all grids
+        configurations (dict[str, dict[str, Any]] | None, optional): configurations by their names, keyword arguments of `solve`.
+            Defaults to None -> `BENCHMARK_CONFIGURATIONS`.
+        seeds (list[int] | None, optional): seeds for shuffling the order of words, each configuration is run with each.
+            Defaults to None -> [0, 1, 2].
+        grid_indexes (list[int] | None, optional): indexes of grids to be solved.
+            Defaults to None -> all grids.
+        timeout (float, optional): time limit for one run in seconds.
+            Defaults to 60.0.
+        grid_timeouts (dict[int, float] | None, optional): time limits for runs of some grids by their indexes,
+            overriding `timeout`.
+            Defaults to None.
+        compiled_index (CompiledWordIndex | None, optional): index of `words` compiled beforehand.
+            Defaults to None -> index is compiled once for all runs.
+
+    Returns:
+        list[BenchmarkRow]: one row for each run
+    """
+    if configurations is None:
+        configurations = BENCHMARK_CONFIGURATIONS
+    if seeds is None:
+        seeds = [0, 1, 2]
+    if grid_indexes is None:
+        grid_indexes = list(range(len(grids)))
+    if grid_timeouts is None:
+        grid_timeouts = {}
+    if compiled_index is None:
+        compiled_index = compile_word_index(words)
+
+    rows: list[BenchmarkRow] = []
+    for i in grid_indexes:
+        grid_timeout: float = grid_timeouts.get(i, timeout)
+        for name, configuration in configurations.items():
+            for seed in seeds:
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=run_configuration,
+                                                  args=(words, grids[i], configuration, seed, grid_timeout,
+                                                        compiled_index, sender))
+                start: float = time.perf_counter()
+                process.start()
+                sender.close()
+
+                # give the run some time to notice the time limit, then kill it
+                statistics: dict[str, int | float] = {}
+                if receiver.poll(grid_timeout + max(5.0, grid_timeout / 10)):
+                    result, statistics = receiver.recv()
+                else:
+                    result = "timeout"
+                    process.terminate()
+                process.join()
+                receiver.close()
+
+                row: BenchmarkRow = {"grid": i, "configuration": name, "seed": seed, "result": result,
+                                     "time": statistics.get("total_time", time.perf_counter() - start)}
+                row.update(statistics)
+                rows.append(row)
+                print(f"crossword no. {i + 1}, {name}, seed {seed}: {result} in {row['time']:.2f} s, "
+                      f"{row.get('nodes', '?')} nodes")
+
+    return rows
+
+############################### STORING RESULTS ###############################
+
+def save_benchmark(rows: list[BenchmarkRow], path: str) -> None:
+    """Stores results of the benchmark as CSV table if `path` ends with ".csv", as JSON otherwise.
+    Statistics of killed runs are left empty.
+
+    Args:
+        rows (list[BenchmarkRow]): results of `run_benchmark`
+        path (str): path to the file
+    """
+    if path.endswith(".csv"):
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as file:
+            json.dump(rows, file, indent=1)
+
+
+def load_benchmark(path: str) -> list[BenchmarkRow]:
+    """Loads results of the benchmark stored by `save_benchmark`.
+
+    Args:
+        path (str): path to the CSV or JSON file
+
+    Returns:
+        list[BenchmarkRow]: one row for each run
+    """
+    if not path.endswith(".csv"):
+        with open(path, 'r') as file:
+            return json.load(file)
+
+    # values in CSV are strings, convert numbers back, empty values are statistics of killed runs
+    rows: list[BenchmarkRow] = []
+    with open(path, 'r', newline='') as file:
+        for csv_row in csv.DictReader(file):
+            row: BenchmarkRow = {}
+            for column, value in csv_row.items():
+                if column in ("configuration", "result") or value == "":
+                    row[column] = value if value != "" else None
+                else:
+                    row[column] = float(value) if '.' in value or 'e' in value else int(value)
+            rows.append({column: value for column, value in row.items() if value is not None})
+    return rows
+
+############################## COMPARING RESULTS ##############################
+
+def compare_benchmarks(baseline: list[BenchmarkRow], current: list[BenchmarkRow],
+                       time_tolerance: float = 0.2, node_tolerance: float = 0.1,
+                       min_time_difference: float = 0.1) -> list[str]:
+    """Compares two runs of the benchmark, finds regressions of the current run against the baseline.
+    Only runs with the same grid, configuration and seed are compared. Run regressed if:
+    - it was decided in the baseline, but it timed out now,
+    - it takes more than `time_tolerance` times longer (and at least `min_time_difference` seconds longer),
+    - it expands more than `node_tolerance` times more nodes.
+
+    Args:
+        baseline (list[BenchmarkRow]): results of the reference run
+        current (list[BenchmarkRow]): results of the new run
+        time_tolerance (float, optional): allowed relative increase of time.
+            Defaults to 0.2.
+        node_tolerance (float, optional): allowed relative increase of the number of nodes.
+            Defaults to 0.1.
+        min_time_difference (float, optional): smaller increases of time (in seconds) are ignored as noise.
+            Defaults to 0.1.
+
+    Returns:
+        list[str]: description of each regression, empty if there are none
+    """
+    baseline_runs: dict[tuple[int, str, int], BenchmarkRow] = {
+        (row["grid"], row["configuration"], row["seed"]): row for row in baseline
+    }
+
+    regressions: list[str] = []
+    for row in current:
+        key: tuple[int, str, int] = (row["grid"], row["configuration"], row["seed"])
+        if key not in baseline_runs:
+            continue
+        before: BenchmarkRow = baseline_runs[key]
+        run: str = f"crossword no. {key[0] + 1}, {key[1]}, seed {key[2]}"
+
+        if row["result"] == "timeout":
+            if before["result"] != "timeout":
+                regressions.append(f"{run}: {before['result']} in {before['time']:.2f} s before, timeout now")
+            continue
+        if before["result"] == "timeout":
+            continue
+
+        if row["time"] > before["time"] * (1 + time_tolerance) and row["time"] - before["time"] > min_time_difference:
+            regressions.append(f"{run}: time {before['time']:.2f} s -> {row['time']:.2f} s")
+        if "nodes" in row and "nodes" in before and row["nodes"] > before["nodes"] * (1 + node_tolerance):
+            regressions.append(f"{run}: nodes {before['nodes']} -> {row['nodes']}")
+
+    return regressions
+
+
+################################ MAIN PROGRAM #################################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the crossword solver")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store the results as the baseline for the next runs instead of comparing with it")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help=f"path to the baseline (default {BASELINE_PATH})")
+    args = parser.parse_args()
+    
+    # load data
+    words: list[str] = load_words("words.txt")
+    grids: list[Grid] = load_grids("krizovky.txt")
+    compiled_index: CompiledWordIndex = load_word_index(words, "words.idx")
+
+    # last crossword (empty 6x6) can't be solved and takes hours, it is left out
+    rows: list[BenchmarkRow] = run_benchmark(words, grids, seeds=[0, 1, 2], grid_indexes=list(range(9)),
+                                             timeout=60.0, compiled_index=compiled_index)
+    save_benchmark(rows, "benchmark.json")
+    save_benchmark(rows, "benchmark.csv")
+
+    # store the results as baseline, or compare with the stored one, if there is any
+    if args.save_baseline:
+        save_benchmark(rows, args.baseline)
+        print(f"results stored as baseline in {args.baseline}")
+    elif os.path.exists(args.baseline):
+        regressions: list[str] = compare_benchmarks(load_benchmark(args.baseline), rows)
+        print('=' * 40 + f"\n{len(regressions)} regressions against the baseline")
+        for regression in regressions:
+            print(regression)
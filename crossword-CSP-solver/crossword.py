@@ -1,42 +1,634 @@
 import copy
+import hashlib
+import heapq
+import json
+import multiprocessing
+import os
 import random
+import struct
 import sys
 import time
-from typing import Literal
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Generator, Iterable, Iterator, Literal, TextIO
 
 ################################# USEFUL TYPES ################################
 
 Position = tuple[int, int, int, str]        # (start_row, start_col, length, direction)
+PositionId = int                            # id of a position, its index in `CrossWord.positions`
 Grid = list[list[str]]
 
-# WordsDatabase[length][position][letter] -> indexes of all words of length `length` that have `letter` at `position`
+# WordPostings[length][position][letter] -> sorted ids of all words of length `length` that have `letter` at `position`,
+# id of a word is its index among words with the same length, letters without any word are not stored
+WordPostings = dict[int, dict[int, dict[str, array]]]
+
+# WordsDatabase[length][position][letter] -> ids of all words of length `length` that have `letter` at `position`
 WordsDatabase = dict[int, dict[int, dict[str, set[int]]]]   
 
+# BitsetWordsDatabase[length][position][letter] -> bitset of words of length `length` that have `letter` at `position`,
+# bit `i` stands for the word with id `i`
+BitsetWordsDatabase = dict[int, dict[int, dict[str, int]]]
+
+# domain of a position, set of ids, bitset or sorted array of ids of words with the length of the position
+Domain = set[int] | int | array
+
+# letters that can appear in words
+ALPHABET: list[str] = [chr(i) for i in range(ord('a'), ord('z') + 1)] + ['\'']
+
+# kinds of changes recorded in the undo log (trail) of the crossword
+CELL_CHANGE: int = 0        # (CELL_CHANGE, position id, previous text of the position as bytes)
+DOMAIN_CHANGE: int = 1      # (DOMAIN_CHANGE, position id, previous domain)
+SUPPORT_CHANGE: int = 2     # (SUPPORT_CHANGE, (position id, other position id), previous support counts)
+EXPLANATION_CHANGE: int = 3 # (EXPLANATION_CHANGE, position id, previous explanation)
+TrailEntry = tuple[int, object, object]
+
+# Supports[(p1, p2)][letter] -> number of words in domain of `p2` that have `letter` in the square shared with `p1`,
+# letters without any support are not stored
+Supports = dict[tuple[PositionId, PositionId], dict[str, int]]
+
+# Explanations[position] -> assigned positions whose words removed some words from the domain of `position`, by ids
+Explanations = list[frozenset[PositionId]]
+
+# saved state of the crossword, mark in the trail or snapshot of domains, squares, supports and explanations
+SavedState = int | tuple[list[Domain], bytearray, Supports | None, Explanations | None]
+
+# character of an empty square in `CrossWord.cells`
+EMPTY_SQUARE: int = ord(' ')
+
+################################# WORD INDEXES ################################
+
+# sorted array of ids without any id, returned for letters that don't appear at the position
+EMPTY_IDS: array = array('I')
+
+
+def intersect_sorted(ids: array, other: array) -> array:
+    """Returns ids contained in both sorted arrays, sorted.
+    Ids of the shorter array are searched in the longer one by binary search starting after the last found id,
+    so the cost is O(m log n) for arrays of lengths m <= n, not O(m + n).
+
+    Args:
+        ids (array): sorted ids
+        other (array): sorted ids
+
+    Returns:
+        array: sorted ids contained in both arrays
+    """
+    if len(ids) > len(other):
+        ids, other = other, ids
+    res: array = array('I')
+    lo, n = 0, len(other)
+    for word_id in ids:
+        lo = bisect_left(other, word_id, lo)
+        if lo == n:
+            break
+        if other[lo] == word_id:
+            res.append(word_id)
+    return res
+
+
+def have_common_id(ids: array, other: array) -> bool:
+    # Returns whether two sorted arrays have an id in common, searching like `intersect_sorted`.
+    if len(ids) > len(other):
+        ids, other = other, ids
+    lo, n = 0, len(other)
+    for word_id in ids:
+        lo = bisect_left(other, word_id, lo)
+        if lo == n:
+            return False
+        if other[lo] == word_id:
+            return True
+    return False
+
+
+def subtract_sorted(ids: array, other: array) -> array:
+    # Returns ids from the sorted array `ids` that are not in the sorted array `other`, sorted.
+    res: array = array('I')
+    lo, n = 0, len(other)
+    for word_id in ids:
+        lo = bisect_left(other, word_id, lo)
+        if lo == n or other[lo] != word_id:
+            res.append(word_id)
+    return res
+
+
+class CompiledWordIndex():
+    """Words split by length together with postings of letters at each position.
+    Built once by `compile_word_index` and stored by `save_word_index`, 
+    word indexes used for solving are created from it without going through the words again.
+    """
+    
+    # words of given length, index in the list is the id of the word
+    words_of_length: dict[int, list[str]]
+    
+    # postings of letters at positions in words of each length
+    postings: WordPostings
+    
+    # hash of the list of words the index was built from
+    digest: bytes
+    
+    def __init__(self, words_of_length: dict[int, list[str]], postings: WordPostings, digest: bytes) -> None:
+        self.words_of_length = words_of_length
+        self.postings = postings
+        self.digest = digest
+        
+    
+    def letters(self) -> set[str]:
+        """Returns all letters occurring in the words, collected from the postings"""
+        return {ch for postings_of_length in self.postings.values() 
+                for postings in postings_of_length.values() for ch in postings}
+        
+    
+    def query(self, pattern: str) -> array:
+        """Finds words matching the pattern, e.g. "c?t??" -> ids of words of length 5 with "c" and "t" 
+        at first and third letter. Postings of the letters are intersected from the shortest one.
+
+        Args:
+            pattern (str): letters of the word, unknown letters are '?' or ' ' (empty square)
+
+        Returns:
+            array: sorted ids of matching words among words with the length of the pattern
+        """
+        if len(pattern) not in self.postings:
+            return array('I')
+        postings: list[array] = sorted(
+            [self.postings[len(pattern)][idx].get(ch, EMPTY_IDS) for idx, ch in enumerate(pattern) if ch not in "? "],
+            key=len
+        )
+        if not postings:
+            return array('I', range(len(self.words_of_length[len(pattern)])))
+        
+        res: array = postings[0]
+        for posting in postings[1:]:
+            if not res:
+                break
+            res = intersect_sorted(res, posting)
+        return array('I', res)
+        
+
+class SetWordIndex():
+    """Domains of positions are sets of ids of words with the length of the position, 
+    words are filtered by intersections with sets of words that have certain letter at certain position.
+    """
+    
+    # words of given length, index in the list is the id of the word
+    words_of_length: dict[int, list[str]]
+    
+    # database of words for easy searching through viable words
+    database: WordsDatabase
+    
+    def __init__(self, compiled_index: CompiledWordIndex) -> None:
+        self.words_of_length = compiled_index.words_of_length
+        
+        # letters that don't appear at the position share one empty set, sets are never modified
+        empty: set[int] = set()
+        self.database = {length: {idx: {
+            ch: set(postings[ch]) if ch in postings else empty for ch in ALPHABET
+        } for idx, postings in compiled_index.postings[length].items()} for length in self.words_of_length}
+        
+        
+    def full_domain(self, length: int) -> set[int]:
+        # Returns domain containing all words of given length.
+        return set(range(len(self.words_of_length.get(length, []))))
+    
+    
+    def word(self, length: int, word_id: int) -> str:
+        # Returns word stored in domain of position with given length under `word_id`.
+        return self.words_of_length[length][word_id]
+    
+    
+    def ids(self, domain: set[int]) -> list[int]:
+        # Returns list of word ids contained in the domain.
+        return list(domain)
+    
+    
+    def size(self, domain: set[int]) -> int:
+        # Returns number of words in the domain.
+        return len(domain)
+    
+    
+    def restrict(self, domain: set[int], length: int, idx: int, ch: str) -> set[int]:
+        # Returns new domain with only those words from `domain`, that have `ch` at index `idx`.
+        return self.database[length][idx][ch] & domain
+    
+    
+    def supported(self, domain: set[int], length: int, idx: int, ch: str) -> bool:
+        # Returns whether there is a word in `domain` with `ch` at index `idx`.
+        return not self.database[length][idx][ch].isdisjoint(domain)
+    
+    
+    def without(self, domain: set[int], word_ids: list[int]) -> set[int]:
+        # Returns new domain without the words with given ids.
+        return domain.difference(word_ids)
+    
+    
+    def exclude(self, domain: set[int], length: int, idx: int, ch: str) -> set[int]:
+        # Returns new domain without words that have `ch` at index `idx`.
+        return domain - self.database[length][idx][ch]
+    
+    
+    def difference(self, domain: set[int], other: set[int]) -> set[int]:
+        # Returns words from `domain` that are not in `other`.
+        return domain - other
+    
+    
+class BitsetWordIndex():
+    """Domains of positions are bitsets stored in Python integers, bit `i` of the domain
+    of a position with length `length` stands for the word `words_of_length[length][i]`.
+    Intersection, emptiness test and size of a domain are bit operations over whole machine words,
+    no new set has to be allocated element by element.
+    """
+    
+    # words of given length, index in the list is the id (bit) of the word
+    words_of_length: dict[int, list[str]]
+    
+    # database of words for easy searching through viable words
+    database: BitsetWordsDatabase
+    
+    def __init__(self, compiled_index: CompiledWordIndex) -> None:
+        self.words_of_length = compiled_index.words_of_length
+        self.database = {length: {idx: {
+            ch: self.to_bitset(compiled_index.postings[length][idx].get(ch, ()), len(words_of_length)) for ch in ALPHABET
+        } for idx in range(length)} for length, words_of_length in self.words_of_length.items()}
+    
+    
+    @staticmethod
+    def to_bitset(word_ids: Iterable[int], size: int) -> int:
+        # Returns bitset with bits at `word_ids` set, `size` is the number of all possible bits.
+        mask: bytearray = bytearray((size + 7) // 8)
+        for word_id in word_ids:
+            mask[word_id >> 3] |= 1 << (word_id & 7)
+        return int.from_bytes(mask, "little")
+    
+    
+    def full_domain(self, length: int) -> int:
+        # Returns domain containing all words of given length.
+        return (1 << len(self.words_of_length.get(length, []))) - 1
+    
+    
+    def word(self, length: int, word_id: int) -> str:
+        # Returns word stored in domain of position with given length under `word_id`.
+        return self.words_of_length[length][word_id]
+    
+    
+    def ids(self, domain: int) -> list[int]:
+        # Returns list of word ids contained in the domain, i.e. indexes of set bits.
+        # Binary string is searched for ones, which is faster than shifting the big integer bit by bit.
+        bits: str = bin(domain)[:1:-1]
+        res: list[int] = []
+        i: int = bits.find('1')
+        while i != -1:
+            res.append(i)
+            i = bits.find('1', i + 1)
+        return res
+    
+    
+    def size(self, domain: int) -> int:
+        # Returns number of words in the domain.
+        return domain.bit_count()
+    
+    
+    def restrict(self, domain: int, length: int, idx: int, ch: str) -> int:
+        # Returns new domain with only those words from `domain`, that have `ch` at index `idx`.
+        return self.database[length][idx][ch] & domain
+    
+    
+    def supported(self, domain: int, length: int, idx: int, ch: str) -> bool:
+        # Returns whether there is a word in `domain` with `ch` at index `idx`.
+        return self.database[length][idx][ch] & domain != 0
+    
+    
+    def without(self, domain: int, word_ids: list[int]) -> int:
+        # Returns new domain without the words with given ids.
+        return domain & ~self.to_bitset(word_ids, domain.bit_length())
+    
+    
+    def exclude(self, domain: int, length: int, idx: int, ch: str) -> int:
+        # Returns new domain without words that have `ch` at index `idx`.
+        return domain & ~self.database[length][idx][ch]
+    
+    
+    def difference(self, domain: int, other: int) -> int:
+        # Returns words from `domain` that are not in `other`.
+        return domain & ~other
+
+
+class ArrayWordIndex():
+    """Domains of positions are sorted arrays of ids of words (4 bytes per id), words are filtered 
+    by intersections with the sorted postings of the compiled index, which are shared, not copied.
+    Memory doesn't grow beyond the compiled index and the domains themselves, so it suits dictionaries
+    with hundreds of thousands of words, where a set for each posting would take gigabytes.
+    Intersections are binary searches, slower than intersections of sets when the arrays are similarly long.
+    """
+    
+    # words of given length, index in the list is the id of the word
+    words_of_length: dict[int, list[str]]
+    
+    # postings of letters at positions in words of each length, shared with the compiled index
+    postings: WordPostings
+    
+    def __init__(self, compiled_index: CompiledWordIndex) -> None:
+        self.words_of_length = compiled_index.words_of_length
+        self.postings = compiled_index.postings
+        
+        
+    def full_domain(self, length: int) -> array:
+        # Returns domain containing all words of given length.
+        return array('I', range(len(self.words_of_length.get(length, []))))
+    
+    
+    def word(self, length: int, word_id: int) -> str:
+        # Returns word stored in domain of position with given length under `word_id`.
+        return self.words_of_length[length][word_id]
+    
+    
+    def ids(self, domain: array) -> list[int]:
+        # Returns list of word ids contained in the domain.
+        return domain.tolist()
+    
+    
+    def size(self, domain: array) -> int:
+        # Returns number of words in the domain.
+        return len(domain)
+    
+    
+    def restrict(self, domain: array, length: int, idx: int, ch: str) -> array:
+        # Returns new domain with only those words from `domain`, that have `ch` at index `idx`.
+        return intersect_sorted(domain, self.postings[length][idx].get(ch, EMPTY_IDS))
+    
+    
+    def supported(self, domain: array, length: int, idx: int, ch: str) -> bool:
+        # Returns whether there is a word in `domain` with `ch` at index `idx`.
+        return have_common_id(domain, self.postings[length][idx].get(ch, EMPTY_IDS))
+    
+    
+    def without(self, domain: array, word_ids: list[int]) -> array:
+        # Returns new domain without the words with given ids.
+        removed: set[int] = set(word_ids)
+        return array('I', [word_id for word_id in domain if word_id not in removed])
+    
+    
+    def exclude(self, domain: array, length: int, idx: int, ch: str) -> array:
+        # Returns new domain without words that have `ch` at index `idx`.
+        return subtract_sorted(domain, self.postings[length][idx].get(ch, EMPTY_IDS))
+    
+    
+    def difference(self, domain: array, other: array) -> array:
+        # Returns words from `domain` that are not in `other`.
+        return subtract_sorted(domain, other)
+
+
+WordIndex = SetWordIndex | BitsetWordIndex | ArrayWordIndex
+
+################################## STATISTICS #################################
+
+class SolverStatistics():
+    """Statistics of one run of `solve`, collected if passed to it. 
+    If `stream` is given, the statistics are written to it as JSON lines, 
+    at most once per `interval` seconds during the search and once at the end of the run,
+    so the progress can be followed without printing in the search itself.
+    """
+    
+    # states of the search that were expanded
+    nodes: int
+    
+    # words removed from the crossword after they failed
+    backtracks: int
+    
+    # assigned positions jumped over by conflict-directed backjumping
+    backjumps: int
+    
+    # arcs (AC-3) or unsupported letters (AC-4) taken from the queue of arc consistency
+    arc_pops: int
+    
+    # words removed from domains by updating domains and arc consistency
+    values_pruned: int
+    
+    # max number of words assigned by the search at once
+    max_depth: int
+    
+    # seconds spent updating domains and maintaining arc consistency
+    propagation_time: float
+    
+    # seconds spent choosing unassigned positions and ordering their words
+    selection_time: float
+    
+    # seconds from the start of the run
+    total_time: float
+    
+    # statistics of each restart of the search with its seed and cutoff on nodes, empty without restarts
+    restarts: list[dict[str, int | float]]
+    
+    # where to write the statistics, None if they aren't streamed
+    stream: TextIO | None
+    
+    # min number of seconds between two lines written to `stream`
+    interval: float
+    
+    # time of the start of the run and of the last line written to `stream`
+    start_time: float
+    last_sample_time: float
+    
+    def __init__(self, stream: TextIO | None = None, interval: float = 1.0) -> None:
+        self.stream = stream
+        self.interval = interval
+        self.start()
+        
+        
+    def start(self) -> None:
+        # Resets all statistics at the start of a run.
+        self.nodes = self.backtracks = self.backjumps = 0
+        self.arc_pops = self.values_pruned = self.max_depth = 0
+        self.propagation_time = self.selection_time = self.total_time = 0.0
+        self.restarts = []
+        self.start_time = self.last_sample_time = time.perf_counter()
+        
+    
+    def node(self, depth: int) -> None:
+        """Counts expanded state of the search, writes the statistics to the stream if `interval` passed.
+
+        Args:
+            depth (int): number of words assigned by the search in the state
+        """
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self.stream is not None and time.perf_counter() - self.last_sample_time >= self.interval:
+            self.sample()
+    
+    
+    def sample(self) -> None:
+        # Writes the current statistics to the stream as one JSON line.
+        self.last_sample_time = time.perf_counter()
+        self.total_time = self.last_sample_time - self.start_time
+        if self.stream is not None:
+            self.stream.write(json.dumps(self.as_dict()) + "\n")
+            self.stream.flush()
+            
+    
+    def finish(self) -> None:
+        # Records the total time of the run, writes the final statistics to the stream.
+        self.sample()
+        
+        
+    def add_restart(self, restart: "SolverStatistics", seed: int, cutoff: int) -> None:
+        """Adds statistics of one restart of the search to the statistics of the whole run,
+        writes them to the stream.
+
+        Args:
+            restart (SolverStatistics): finished statistics of the restart
+            seed (int): seed of the restart
+            cutoff (int): max number of nodes of the restart
+        """
+        self.nodes += restart.nodes
+        self.backtracks += restart.backtracks
+        self.backjumps += restart.backjumps
+        self.arc_pops += restart.arc_pops
+        self.values_pruned += restart.values_pruned
+        self.max_depth = max(self.max_depth, restart.max_depth)
+        self.propagation_time += restart.propagation_time
+        self.selection_time += restart.selection_time
+        self.restarts.append(dict(restart.as_dict(), seed=seed, cutoff=cutoff))
+        self.sample()
+    
+    
+    def as_dict(self) -> dict[str, int | float]:
+        """Returns the statistics as dictionary, e.g. for comparing configurations or writing as JSON.
+
+        Returns:
+            dict[str, int | float]: statistics by their names
+        """
+        return {
+            "nodes": self.nodes,
+            "backtracks": self.backtracks,
+            "backjumps": self.backjumps,
+            "arc_pops": self.arc_pops,
+            "values_pruned": self.values_pruned,
+            "max_depth": self.max_depth,
+            "propagation_time": self.propagation_time,
+            "selection_time": self.selection_time,
+            "total_time": self.total_time,
+            "restarts": len(self.restarts),
+        }
+
 ############################### CLASS DEFINITION ##############################
 
 class CrossWord():
     
-    # grid of the crossword
-    grid: Grid
+    # squares of the grid row by row, one byte (code of the character) per square,
+    # square (row, col) is stored at index row * width + col
+    cells: bytearray
+    
+    # number of columns of the grid
+    width: int
     
-    # (start_row, start_col, length, direction)
+    # (start_row, start_col, length, direction), the id of a position is its index in this list,
+    # the structures below refer to positions by their ids
     positions: list[Position]   
     
-    # domain for each position, indexes to `words` list
-    position_domain: dict[Position, set[int]]   
+    # length of each position by its id
+    position_lengths: list[int]
+    
+    # domain for each position by its id, ids of words in the word index used for solving
+    position_domain: list[Domain]   
+    
+    # ids of positions whose domains are affected by change in each position by its id
+    positions_affected: list[set[PositionId]]
+    
+    # undo log of changes made to `grid`, `position_domain` and `supports`,
+    # None if the state is backed up by copying the whole grid and all domains
+    trail: list[TrailEntry] | None
+    
+    # support counts of letters for each arc, None if arc consistency is not maintained by counting supports
+    supports: Supports | None
+    
+    # letters that lost their last support, (position id, index in the position, letter),
+    # words with the letter at the index have to be removed from the domain of the position
+    unsupported_letters: list[tuple[PositionId, int, str]]
+    
+    # assigned positions responsible for the words removed from each domain, 
+    # None if they are not recorded (used by conflict-directed backjumping)
+    explanations: Explanations | None
+    
+    # assigned positions responsible for the last domain wipe-out, if explanations are recorded
+    conflict: frozenset[PositionId]
+    
+    # statistics of the run of `solve`, None if they are not collected
+    statistics: SolverStatistics | None
+    
+    # id of each position, its index in `positions`
+    position_index: dict[Position, PositionId]
+    
+    # rank of each position by its id used to break ties when choosing unassigned position, 
+    # the order of positions or a random order (see `set_tie_breaking`)
+    position_rank: list[int]
+    
+    # indexes of squares (in `cells`) of each position by its id, in the order of letters of the word
+    position_cells: list[list[int]]
+    
+    # slice of `cells` with the squares of each position by its id, the text is read and written at once
+    position_slices: list[slice]
     
-    # domains of which positions are affected by change in certain position
-    positions_affected: dict[Position, set[Position]] = {}  
+    # crossings of each position by its id, {crossing position: (index of the shared square in the position,
+    # index of the shared square in the crossing position)}
+    crossing_offsets: list[dict[PositionId, tuple[int, int]]]
     
-    # overlap squares of two positions
-    overlap: dict[Position, dict[Position, tuple[int, int]]] = {}   
+    # ids of positions that contain each square by its index in `cells`
+    positions_at_cell: list[list[PositionId]]
+    
+    # whether the fields below are kept up to date on each change of the grid and domains (see `init_tracking`)
+    tracking: bool
+    
+    # number of changes at the bottom of the trail already counted in the fields below,
+    # later changes are counted by `sync_tracking` only when needed, so words tried and undone in between cost nothing
+    tracked_changes: int
+    
+    # number of empty squares in all positions
+    empty_squares: int
+    
+    # number of empty squares in each position by its id
+    empty_in_position: list[int]
+    
+    # ids of positions with at least one empty square
+    unassigned: set[PositionId]
+    
+    # number of unassigned positions affected by each position by its id
+    live_degree: list[int]
+    
+    # heuristic by which `selection_heap` is ordered, "degree", "MRV" or "" (order of positions)
+    selection_heuristic: str
+    
+    # heap of (key by heuristic, rank of position, position id) of unassigned positions,
+    # entries of assigned positions or with outdated keys are skipped when choosing a position
+    selection_heap: list[tuple[int, int, PositionId]]
+    
+    # ids of positions whose key may have changed since the last choice, they are pushed to the heap before the next one,
+    # so words tried and undone in between don't cost any heap operations
+    selection_changed: set[PositionId]
+    
+    # function returning size of a domain, taken from the word index used for solving
+    domain_size: Callable[[Domain], int]
         
     # dict of possible directions {name: (delta_row, delta_col)}
     directions: dict[str, tuple[int, int]] = {"down": (1, 0), "right": (0, 1)}
 
     def __init__(self, grid: Grid) -> None:
-        self.grid: list[list[str]] = grid
+        self.width = len(grid[0])
+        text: str = ''.join([''.join(row) for row in grid])
+        # each square is stored in one byte, so only ASCII characters fit
+        if not text.isascii():
+            raise ValueError("squares of the grid must contain only ASCII characters")
+        self.cells = bytearray(text, 'ascii')
         self.positions: list[tuple[int, int, int, str]] = self.get_positions(grid)
+        self.trail = None
+        self.supports = None
+        self.unsupported_letters = []
+        self.explanations = None
+        self.conflict = frozenset()
+        self.statistics = None
+        self.tracking = False
+        self.tracked_changes = 0
         self.set_positions_affected()
 
 
@@ -62,42 +654,54 @@ class CrossWord():
         poss = []
         for r in range(len(grid)):
             row = grid[r]
-            poss = poss + [(r, p[0], p[1], "right") for p in check_line(row)]
+            poss += [(r, p[0], p[1], "right") for p in check_line(row)]
         for c in range(len(grid[0])):
             column = [row[c] for row in grid]
-            poss = poss + [(p[0], c, p[1], "down") for p in check_line(column)]
+            poss += [(p[0], c, p[1], "down") for p in check_line(column)]
         
         return poss
 
 
     def set_positions_affected(self) -> None:
-        """Computes values for `self.positions_affected` and `self.overlap`
+        """Computes values for `self.positions_affected`, `self.position_index`, `self.position_rank`,
+        `self.position_lengths`, `self.position_cells`, `self.position_slices`, `self.crossing_offsets` 
+        and `self.positions_at_cell`
         """
-        # dictionary of squares corresponding to each position
-        relevant_squares: dict[Position, set[tuple[int, int]]] = {}
-        for pos in self.positions:
-            relevant_squares[pos] = set()
-            r, c, length, direction_str = pos
+        # indexes of squares in `cells` corresponding to each position,
+        # squares of a position are evenly spaced, so they form a slice of `cells`
+        self.position_index = {pos: i for i, pos in enumerate(self.positions)}
+        self.position_rank = list(range(len(self.positions)))
+        self.position_lengths = [length for _, _, length, _ in self.positions]
+        self.position_cells = []
+        self.position_slices = []
+        for r, c, length, direction_str in self.positions:
             dr, dc = self.directions[direction_str]
-            for _ in range(length):
-                relevant_squares[pos].add((r, c))
-                r += dr
-                c += dc
-                
-        # compute which positions' domains are affected by the change in `pos`
-        # also, compute overlap square of `pos` and `other_pos`
-        for pos in self.positions:
-            self.positions_affected[pos] = set()
-            self.overlap[pos] = {}
-            for other_pos in self.positions:
-                # same positions
-                if pos == other_pos: 
-                    continue
+            start, step = r * self.width + c, dr * self.width + dc
+            self.position_cells.append(list(range(start, start + length * step, step)))
+            self.position_slices.append(slice(start, start + length * step, step))
+        
+        # positions containing each square, with the index of the square within each of them
+        self.positions_at_cell = [[] for _ in range(len(self.cells))]
+        indexes_at_cell: list[list[int]] = [[] for _ in range(len(self.cells))]
+        for position, cells in enumerate(self.position_cells):
+            for idx, cell in enumerate(cells):
+                self.positions_at_cell[cell].append(position)
+                indexes_at_cell[cell].append(idx)
                 
-                # if there is a shared square corresponding to both position, update fields
-                if relevant_squares[pos] & relevant_squares[other_pos]:
-                    self.positions_affected[pos].add(other_pos)
-                    self.overlap[pos][other_pos] = (relevant_squares[pos] & relevant_squares[other_pos]).pop()
+        # compute which positions' domains are affected by the change in `pos`,
+        # two positions are affected by each other if they share a square, so one pass through squares is enough
+        # also, compute indexes of the shared square within both positions
+        self.positions_affected = [set() for _ in self.positions]
+        self.crossing_offsets = [{} for _ in self.positions]
+        for cell, positions in enumerate(self.positions_at_cell):
+            for position, idx in zip(positions, indexes_at_cell[cell]):
+                for other_position, other_idx in zip(positions, indexes_at_cell[cell]):
+                    # same positions
+                    if position == other_position:
+                        continue
+                    
+                    self.positions_affected[position].add(other_position)
+                    self.crossing_offsets[position][other_position] = (idx, other_idx)
 
 
     def __str__(self) -> str:
@@ -106,64 +710,307 @@ class CrossWord():
         Returns:
             str: formatted string
         """
-        return '\n'.join([''.join(row) for row in self.grid])
+        text: str = self.cells.decode()
+        return '\n'.join([text[start:start + self.width] for start in range(0, len(text), self.width)])
+    
+    
+    @property
+    def grid(self) -> Grid:
+        """Current grid of the crossword as rows of characters, a copy of `cells`
+
+        Returns:
+            Grid: rows of the grid
+        """
+        return [list(row) for row in str(self).split('\n')]
 
     
-    def text_at_pos(self, position: Position) -> str:
-        # Returns text currently written in specified position.
-        dr, dc = self.directions[position[3]]
-        r, c = position[0], position[1]
-        return ''.join([self.grid[r + i * dr][c + i * dc] for i in range(position[2])])
+    def text_at_pos(self, position: PositionId) -> str:
+        # Returns text currently written in position with specified id.
+        return self.cells[self.position_slices[position]].decode()
 
 
-    def write_word(self, position: Position, word: str) -> None:
-        # Writes word to specified position and direction.
+    def write_word(self, position: PositionId, word: str) -> None:
+        # Writes word to position with specified id.
         # Note: this method does not check whether the word can be placed into
         # specified position.
-        dr, dc = self.directions[position[3]]
-        r, c = position[0], position[1]
-        for i in range(position[2]):
-            self.grid[r + i * dr][c + i * dc] = word[i]     
+        previous: bytearray = self.cells[self.position_slices[position]]
+        new: bytes = word.encode()
+        if previous == new:
+            return
+        self.cells[self.position_slices[position]] = new
+        if self.trail is not None:
+            # the filled squares are counted later by `sync_tracking`
+            self.trail.append((CELL_CHANGE, position, previous))
+            return
+        
+        if self.tracking:
+            filled: list[int] = [cell for cell, ch in zip(self.position_cells[position], previous) 
+                                 if ch == EMPTY_SQUARE]
+            if filled:
+                self.update_tracking(filled, -1)
+    
+    
+    def update_tracking(self, squares: list[int], change: Literal[1, -1]) -> None:
+        """Updates the number of empty squares, unassigned positions and their live degrees 
+        after the squares were filled or emptied.
+
+        Args:
+            squares (list[int]): indexes of squares in `cells` that were filled or emptied
+            change (int): 1 if the squares were emptied, -1 if they were filled
+        """
+        self.empty_squares += change * len(squares)
+        empty_in_position = self.empty_in_position
+        
+        # position became unassigned by emptying its first square, or assigned by filling its last square
+        switched_at: int = 1 if change == 1 else 0
+        for square in squares:
+            for position in self.positions_at_cell[square]:
+                empty_in_position[position] += change
+                if empty_in_position[position] != switched_at:
+                    continue
+                
+                if change == 1:
+                    self.unassigned.add(position)
+                    self.selection_changed.add(position)
+                else:
+                    self.unassigned.discard(position)
+                for other_position in self.positions_affected[position]:
+                    self.live_degree[other_position] += change
+                if self.selection_heuristic == "degree":
+                    self.selection_changed |= self.positions_affected[position]
+    
+    
+    def sync_tracking(self) -> None:
+        # Counts squares filled by the changes in the trail that are not counted yet.
+        if self.trail is None or self.tracked_changes >= len(self.trail):
+            return
+        filled: list[int] = []
+        for kind, key, previous in self.trail[self.tracked_changes:]:
+            if kind == CELL_CHANGE:
+                filled.extend([cell for cell, ch in zip(self.position_cells[key], previous) 
+                               if ch == EMPTY_SQUARE])
+        self.tracked_changes = len(self.trail)
+        if filled:
+            self.update_tracking(filled, -1)
+    
+    
+    def is_filled(self) -> bool:
+        """Checks whether all squares of the crossword are filled, using the tracked number of empty squares.
+
+        Returns:
+            bool: True if no square is empty
+        """
+        self.sync_tracking()
+        return self.empty_squares == 0
+    
+    
+    def init_tracking(self, domain_size: Callable[[Domain], int], 
+                      heuristic: Literal["degree", "MRV", ""]) -> None:
+        """Computes number of empty squares, unassigned positions, their live degrees and heap for choosing 
+        unassigned position from the current grid and domains. From then on, these are updated
+        incrementally by `write_word`, `set_domain` and `restore_state`, changes recorded in the trail
+        are counted just before the tracked values are used.
+
+        Args:
+            domain_size (Callable[[Domain], int]): function returning size of a domain
+            heuristic (str): heuristic to choose unassigned position by, see `select_unassigned_position`
+        """
+        self.domain_size = domain_size
+        self.selection_heuristic = heuristic
+        self.empty_in_position = [self.text_at_pos(position).count(' ') for position in range(len(self.positions))]
+        self.empty_squares = sum([1 for cell, positions in enumerate(self.positions_at_cell) 
+                                  if positions and self.cells[cell] == EMPTY_SQUARE])
+        self.unassigned = {position for position, empty in enumerate(self.empty_in_position) if empty}
+        self.live_degree = [len(affected & self.unassigned) for affected in self.positions_affected]
+        self.tracked_changes = len(self.trail) if self.trail is not None else 0
+        self.tracking = True
+        self.rebuild_selection_heap()
+        
+        
+    def set_tie_breaking(self, rng: random.Random | None) -> None:
+        """Sets the order in which ties are broken when choosing unassigned position, 
+        must be called before `init_tracking`.
+
+        Args:
+            rng (random.Random | None): generator of a random order, None for the order of positions
+        """
+        self.position_rank = list(range(len(self.positions)))
+        if rng is not None:
+            rng.shuffle(self.position_rank)
+        
+        
+    def selection_key(self, position: PositionId) -> int:
+        # Returns the key of position in the heap for choosing unassigned position, the smallest key is chosen.
+        if self.selection_heuristic == "degree":
+            return -self.live_degree[position]
+        if self.selection_heuristic == "MRV":
+            return self.domain_size(self.position_domain[position])
+        return 0
+    
+    
+    def rebuild_selection_heap(self) -> None:
+        # Creates the heap for choosing unassigned position anew, without outdated entries.
+        self.selection_heap = [(self.selection_key(position), self.position_rank[position], position) 
+                               for position in self.unassigned]
+        heapq.heapify(self.selection_heap)
+        self.selection_changed = set()
+            
+    
+    def select_unassigned_position(self) -> PositionId:
+        """Chooses unassigned position by the heuristic set in `init_tracking`:
+        "degree" - position affecting the most unassigned positions,
+        "MRV" - position with the smallest domain,
+        "" - first unassigned position.
+        Ties are broken by the order of positions, or randomly (see `set_tie_breaking`). 
+        Only positions whose key changed are pushed to the heap and outdated entries are popped from it, 
+        so the choice costs O(log n) per change instead of going through all positions.
+
+        Returns:
+            PositionId: id of chosen unassigned position
+        """
+        self.sync_tracking()
+        
+        # outdated entries are removed lazily, rebuild the heap if there are too many of them
+        if len(self.selection_heap) + len(self.selection_changed) > 4 * len(self.positions) + 64:
+            self.rebuild_selection_heap()
+            
+        for position in self.selection_changed:
+            if position in self.unassigned:
+                heapq.heappush(self.selection_heap, (self.selection_key(position), self.position_rank[position], position))
+        self.selection_changed.clear()
+        
+        while True:
+            key, _, position = self.selection_heap[0]
+            if position in self.unassigned and key == self.selection_key(position):
+                return position
+            heapq.heappop(self.selection_heap)
            
             
-    def can_write_word(self, position: Position, word: str) -> bool:
+    def can_write_word(self, position: PositionId, word: str) -> bool:
         """Check whether the word can be placed into specified position,
         i.e. position is empty, or all letters within the position are same
         as those in the word.
 
         Args:
-            position (Position): position to write into
+            position (PositionId): id of the position to write into
             word (str): word to check if it can be written into provided `position`
 
         Returns:
             bool: whether the `word` can be written into provided `position`
         """
         # check if passed position is valid
-        if position not in self.positions:
+        if not 0 <= position < len(self.positions):
             return False
         
-        dr, dc = self.directions[position[3]]
-        r, c = position[0], position[1]
-        length: int = position[2]
-        
         # check if length of the word is the same as the length of the position
-        if len(word) != length:
+        if len(word) != self.position_lengths[position]:
             return False
         
         # check whether squares corresponding to given position are all empty
         # or contain the same letter as `word` at that index
-        for i in range(length):
-            ch: str = self.grid[r][c]
-            if not(ch == ' ' or ch == word[i]):
+        for ch, word_ch in zip(self.cells[self.position_slices[position]], word.encode()):
+            if not(ch == EMPTY_SQUARE or ch == word_ch):
                 return False
-            r += dr
-            c += dc
             
         return True
     
     
-    def update_domains(self, assigned_position: Position,
-                       words_db: WordsDatabase, words: list[str],
+    def set_domain(self, position: PositionId, domain: Domain) -> None:
+        """Replaces the domain of `position`, recording the previous one in the trail if it is used.
+        Domains are never modified in place, so the previous domain can be stored without copying.
+
+        Args:
+            position (PositionId): id of the position whose domain is replaced
+            domain (Domain): new domain of the position
+        """
+        if self.trail is not None:
+            self.trail.append((DOMAIN_CHANGE, position, self.position_domain[position]))
+        if self.statistics is not None:
+            self.statistics.values_pruned += self.domain_size(self.position_domain[position]) - self.domain_size(domain)
+        self.position_domain[position] = domain
+        if self.tracking and self.selection_heuristic == "MRV":
+            self.selection_changed.add(position)
+    
+    
+    def explain(self, position: PositionId, culprits: frozenset[PositionId]) -> None:
+        """Records that words were removed from the domain of `position` because of words in `culprits`,
+        if explanations are recorded. The previous explanation is stored in the trail.
+
+        Args:
+            position (PositionId): id of the position whose domain shrank
+            culprits (frozenset[PositionId]): ids of assigned positions responsible for the removal
+        """
+        if self.explanations is None or culprits <= self.explanations[position]:
+            return
+        if self.trail is not None:
+            self.trail.append((EXPLANATION_CHANGE, position, self.explanations[position]))
+        self.explanations[position] = self.explanations[position] | culprits
+    
+    
+    def wipe_out(self, position: PositionId, culprits: frozenset[PositionId]) -> bool:
+        # Records the conflict of domain of `position` becoming empty because of `culprits`, returns False.
+        if self.explanations is not None:
+            self.conflict = self.explanations[position] | culprits
+        return False
+    
+    
+    def save_state(self) -> SavedState:
+        """Saves the current state of the grid and domains, so it can be restored by `restore_state`.
+        With trail, only the current length of the undo log is remembered,
+        otherwise the grid, all domains, support counts and explanations are copied.
+
+        Returns:
+            SavedState: mark in the trail or copies of domains, grid and supports
+        """
+        if self.trail is not None:
+            return len(self.trail)
+        return (copy.deepcopy(self.position_domain), self.cells.copy(), 
+                copy.deepcopy(self.supports), copy.copy(self.explanations))
+    
+    
+    def restore_state(self, state: SavedState) -> None:
+        """Restores the state of the grid and domains saved by `save_state`.
+        With trail, changes recorded after the mark are undone in reverse order,
+        so the cost is proportional to the number of changes, not to the size of the crossword.
+
+        Args:
+            state (SavedState): state returned by `save_state`
+        """
+        if self.trail is None:
+            domains_before, cells_before, supports_before, explanations_before = state
+            self.position_domain = copy.deepcopy(domains_before)
+            self.cells = cells_before.copy()
+            self.supports = copy.deepcopy(supports_before)
+            self.explanations = copy.copy(explanations_before)
+            if self.tracking:
+                self.init_tracking(self.domain_size, self.selection_heuristic)
+            return
+        
+        trail = self.trail
+        emptied: list[int] = []
+        while len(trail) > state:
+            kind, key, previous = trail.pop()
+            if kind == CELL_CHANGE:
+                self.cells[self.position_slices[key]] = previous
+                # squares are emptied if they were empty before the change, 
+                # only changes already counted by tracking have to be uncounted
+                if len(trail) < self.tracked_changes:
+                    emptied.extend([cell for cell, ch in zip(self.position_cells[key], previous) 
+                                    if ch == EMPTY_SQUARE])
+            elif kind == DOMAIN_CHANGE:
+                self.position_domain[key] = previous
+                if self.tracking and self.selection_heuristic == "MRV":
+                    self.selection_changed.add(key)
+            elif kind == SUPPORT_CHANGE:
+                self.supports[key] = previous
+            else:
+                self.explanations[key] = previous
+        self.tracked_changes = min(self.tracked_changes, state)
+        if self.tracking and emptied:
+            self.update_tracking(emptied, 1)
+    
+    
+    def update_domains(self, assigned_position: PositionId, word_index: WordIndex,
                        maintain_arc_consistency: bool = True,
                        show_AC_remaining_queue: bool = False) -> bool:   
         """Updates domains based on the new word written in `assigned_position`.
@@ -171,11 +1018,11 @@ class CrossWord():
         Firstly, removes all words from domains of position that overlap with assigned position
         and now can't be written there.
         Secondly, if desired, maintain arc consistency.
+        If support counts were initialized by `init_supports`, arc consistency is maintained by them.
 
         Args:
-            assigned_position (Position): position recently filled with word
-            words_db (WordsDatabase): database of words for easy searching through viable words
-            words (list[str]): list of all words
+            assigned_position (PositionId): id of the position recently filled with word
+            word_index (WordIndex): index of words for easy searching through viable words
             maintain_arc_consistency (bool, optional): whether to call arc consistency algorithm at the end. 
                 Defaults to True.
             show_remaining_queue (bool, optional): whether to print progress of AC algorithm. 
@@ -185,47 +1032,54 @@ class CrossWord():
             bool: whether the updated crossword is solvable (all domains must have size >= 1)
         """
         # update domains of each position affected by adding a new word
-        for affected_position in self.positions_affected[assigned_position]:      
-            # get overlapping square of two positions in the grid
-            overlap: tuple[int, int] = self.overlap[assigned_position][affected_position]
-            
-            # get the character written into the overlapping square
-            changed_char: str = self.grid[overlap[0]][overlap[1]]
-            
-            # calculate the position of the overlapping square in the affected position
-            idx_of_changed_char: int = overlap[0] - affected_position[0] if affected_position[3] == "down" else overlap[1] - affected_position[1]
+        word: str = self.text_at_pos(assigned_position)
+        for affected_position, (idx, idx_of_changed_char) in self.crossing_offsets[assigned_position].items():
+            # get the character written into the overlapping square,
+            # its position in the affected position is `idx_of_changed_char`
+            changed_char: str = word[idx]
             
             # get the new domain of the position
             # remove all words from it that do not have fetched letter at corresponding index
-            new_domain: set[int] = words_db[affected_position[2]][idx_of_changed_char][changed_char] & self.position_domain[affected_position]
+            new_domain: Domain = word_index.restrict(self.position_domain[affected_position], 
+                                                     self.position_lengths[affected_position], 
+                                                     idx_of_changed_char, changed_char)
             
             # if new domain is empty, crossword is not solvable
             if not new_domain:
-                return False
+                return self.wipe_out(affected_position, frozenset([assigned_position]))
             
             # update the new domain
-            self.position_domain[affected_position] = new_domain.copy()
+            domain_before: Domain = self.position_domain[affected_position]
+            if self.explanations is not None and word_index.size(new_domain) < word_index.size(domain_before):
+                self.explain(affected_position, frozenset([assigned_position]))
+            self.set_domain(affected_position, new_domain)
+            if self.supports is not None:
+                self.update_supports(affected_position, domain_before, word_index)
+            
+        # remove words that lost their support because of the removed words
+        if self.supports is not None:
+            return self.propagate_supports(word_index, show_AC_remaining_queue)
             
         # call arc consistency algorithm with all arcs with nodes that may have changed their domain
         if maintain_arc_consistency:
-            arcs: set[tuple[Position, Position]] = {(affected, assigned_position) for affected in self.positions_affected[assigned_position]}
+            arcs: set[tuple[PositionId, PositionId]] = {(affected, other) 
+                                                        for affected in self.positions_affected[assigned_position] 
+                                                        for other in self.positions_affected[affected]}
             
             # return whether after maintaining AC is the crossword solvable
-            return self.arc_consistency(arcs, words_db, words, show_AC_remaining_queue)
+            return self.arc_consistency(arcs, word_index, show_AC_remaining_queue)
         
         # crossword is solvable
         return True           
     
     
-    def arc_consistency(self, arcs: set[tuple[Position, Position]], 
-                        words_db: WordsDatabase, words: list[str],
+    def arc_consistency(self, arcs: set[tuple[PositionId, PositionId]], word_index: WordIndex,
                         show_remaining_queue: bool = False) -> bool:
         """Algorithm that maintains arc consistency in the domains.
 
         Args:
-            arcs (set[tuple[Position, Position]]): initial queue of the algorithm
-            words_db (WordsDatabase): database of words for easy searching through viable words
-            words (list[str]): list of all words
+            arcs (set[tuple[PositionId, PositionId]]): initial queue of the algorithm, pairs of position ids
+            word_index (WordIndex): index of words for easy searching through viable words
             show_remaining_queue (bool, optional): whether to print progress of AC algorithm. 
                 Defaults to False.
 
@@ -235,82 +1089,243 @@ class CrossWord():
         while arcs:
             # print if told to do so
             if show_remaining_queue:  
-                print(f"Length of AC queue: {len(arcs)}, sum of domains' sizes: {sum([len(domain) for domain in self.position_domain.values()])}")
+                print(f"Length of AC queue: {len(arcs)}, sum of domains' sizes: {sum([word_index.size(domain) for domain in self.position_domain])}")
                 
             p2, p1 = arcs.pop()
-            new_p1_domain: set[str] = self.position_domain[p1].copy()
+            if self.statistics is not None:
+                self.statistics.arc_pops += 1
+            char1_idx, char2_idx = self.crossing_indexes(p1, p2)
             
             # remove each word in domain of p1 for which there is no word in domain of p2
             # with the same letter at the overlapping square of the two positions
-            for w1 in self.position_domain[p1]:
-                overlap: tuple[int, int] = self.overlap[p1][p2]
-                char1_idx: int = overlap[0] - p1[0] if p1[3] == "down" else overlap[1] - p1[1]
-                char2_idx: int = overlap[0] - p2[0] if p2[3] == "down" else overlap[1] - p2[1]
-                
-                if not words_db[p2[2]][char2_idx][words[w1][char1_idx]] & self.position_domain[p2]:
-                    new_p1_domain -= {w1}    
-            
-            length_new_p1_domain: int = len(new_p1_domain)
+            length1, length2 = self.position_lengths[p1], self.position_lengths[p2]
+            removed_words: list[int] = [
+                w1 for w1 in word_index.ids(self.position_domain[p1])
+                if not word_index.supported(self.position_domain[p2], length2, char2_idx, word_index.word(length1, w1)[char1_idx])
+            ]
             
             # if no values were updated, don't add arcs from p1
-            if length_new_p1_domain == len(self.position_domain[p1]):
+            if not removed_words:
                 continue
             
             # if the new domain is empty, crossword is not solvable
-            if length_new_p1_domain == 0:
-                return False
+            # (words of p1 were removed because of the words removed from p2)
+            if len(removed_words) == word_index.size(self.position_domain[p1]):
+                return self.wipe_out(p1, self.explanations[p2] if self.explanations is not None else frozenset())
+            
+            # if domain of p1 was updated, its neighbours have to be revised against it
+            if self.explanations is not None:
+                self.explain(p1, self.explanations[p2])
+            self.set_domain(p1, word_index.without(self.position_domain[p1], removed_words))
+            arcs |= {(p1, p3) for p3 in self.positions_affected[p1] if p3 != p2}
             
-            # if domain of p1 was updated, add its arcs to the queue
-            self.position_domain[p1] = new_p1_domain.copy()
-            arcs |= {(p3, p1) for p1 in self.positions for p3 in self.positions_affected[p1] if p3 != p2}
+        # crossword is arc consistent and solvable
+        return True
+    
+    
+    def crossing_indexes(self, p1: PositionId, p2: PositionId) -> tuple[int, int]:
+        # Returns indexes of the square shared by two positions (by ids) within `p1` and within `p2`.
+        return self.crossing_offsets[p1][p2]
+    
+    
+    def init_supports(self, word_index: WordIndex, show_remaining_queue: bool = False) -> bool:
+        """Initializes support counts for every arc and makes the domains arc consistent.
+        From then on, arc consistency is maintained incrementally by `update_supports` and `propagate_supports`
+        (in the style of AC-4), instead of revising whole domains in `arc_consistency`.
+
+        Args:
+            word_index (WordIndex): index of words for easy searching through viable words
+            show_remaining_queue (bool, optional): whether to print progress of the propagation. 
+                Defaults to False.
+
+        Returns:
+            bool: whether the crossword is solvable (all domains must have size >= 1)
+        """
+        self.supports = {}
+        self.unsupported_letters = []
+        for p1, crossings in enumerate(self.crossing_offsets):
+            for p2, (idx1, idx2) in crossings.items():
+                
+                # count words in domain of p2 with each letter in the shared square
+                counts: dict[str, int] = {}
+                for ch in ALPHABET:
+                    count: int = word_index.size(word_index.restrict(self.position_domain[p2], self.position_lengths[p2], idx2, ch))
+                    if count:
+                        counts[ch] = count
+                    elif word_index.supported(self.position_domain[p1], self.position_lengths[p1], idx1, ch):
+                        # words of p1 with the letter in the shared square have no support
+                        self.unsupported_letters.append((p1, idx1, ch))
+                self.supports[(p1, p2)] = counts
+                
+        return self.propagate_supports(word_index, show_remaining_queue)
+    
+    
+    def update_supports(self, position: PositionId, domain_before: Domain, word_index: WordIndex) -> None:
+        """Updates support counts of arcs from neighbours of `position` after its domain shrank from `domain_before`.
+        Letters that lost their last support are added to `unsupported_letters`.
+        
+        Counts are decreased by letters of removed words, or recounted from the remaining words
+        if fewer words remained than were removed, so the cost depends on the change, not on the domain size.
+
+        Args:
+            position (PositionId): id of the position whose domain shrank
+            domain_before (Domain): domain of the position before the change
+            word_index (WordIndex): index of words for easy searching through viable words
+        """
+        removed: list[int] = word_index.ids(word_index.difference(domain_before, self.position_domain[position]))
+        recount: bool = len(removed) > word_index.size(self.position_domain[position])
+        length: int = self.position_lengths[position]
+        changed_words: list[str] = [
+            word_index.word(length, word_id) 
+            for word_id in (word_index.ids(self.position_domain[position]) if recount else removed)
+        ]
+        
+        for other_position, (idx, idx_other) in self.crossing_offsets[position].items():
+            counts_before: dict[str, int] = self.supports[(other_position, position)]
+            
+            # counts are replaced, not modified, so the previous ones can be stored in the trail
+            if recount:
+                counts: dict[str, int] = {}
+                for word in changed_words:
+                    counts[word[idx]] = counts.get(word[idx], 0) + 1
+            else:
+                counts = counts_before.copy()
+                for word in changed_words:
+                    counts[word[idx]] -= 1
+                    if not counts[word[idx]]:
+                        del counts[word[idx]]
+            
+            if self.trail is not None:
+                self.trail.append((SUPPORT_CHANGE, (other_position, position), counts_before))
+            self.supports[(other_position, position)] = counts
+            
+            # letters without support can't be used by the other position in the shared square
+            for ch in counts_before.keys() - counts.keys():
+                self.unsupported_letters.append((other_position, idx_other, ch))
+    
+    
+    def propagate_supports(self, word_index: WordIndex, show_remaining_queue: bool = False) -> bool:
+        """Removes words with unsupported letters from domains until no letter loses its last support.
+        Only neighbours of positions whose domains shrank are revisited.
+
+        Args:
+            word_index (WordIndex): index of words for easy searching through viable words
+            show_remaining_queue (bool, optional): whether to print progress of the propagation. 
+                Defaults to False.
+
+        Returns:
+            bool: whether the updated crossword is solvable (all domains must have size >= 1)
+        """
+        while self.unsupported_letters:
+            # print if told to do so
+            if show_remaining_queue:  
+                print(f"Unsupported letters in queue: {len(self.unsupported_letters)}, sum of domains' sizes: {sum([word_index.size(domain) for domain in self.position_domain])}")
+            
+            position, idx, ch = self.unsupported_letters.pop()
+            if self.statistics is not None:
+                self.statistics.arc_pops += 1
+            domain_before: Domain = self.position_domain[position]
+            
+            # words with the letter may have been removed already
+            length: int = self.position_lengths[position]
+            if not word_index.supported(domain_before, length, idx, ch):
+                continue
+            
+            new_domain: Domain = word_index.exclude(domain_before, length, idx, ch)
+            
+            # the letter lost its support because of words removed from the position crossing at the index
+            culprits: frozenset[PositionId] = frozenset()
+            if self.explanations is not None:
+                for other_position in self.positions_at_cell[self.position_cells[position][idx]]:
+                    if other_position != position:
+                        culprits = self.explanations[other_position]
+            
+            # if the new domain is empty, crossword is not solvable
+            if not new_domain:
+                self.unsupported_letters.clear()
+                return self.wipe_out(position, culprits)
             
+            self.explain(position, culprits)
+            self.set_domain(position, new_domain)
+            self.update_supports(position, domain_before, word_index)
+        
         # crossword is arc consistent and solvable
         return True
     
     
-    def number_of_eliminated_words(self, assigned_position: Position, word: str,
-                                   words_db: WordsDatabase, words: list[str],
-                                   maintain_arc_consistency: bool) -> int:
+    def number_of_eliminated_words(self, assigned_position: PositionId, word: str,
+                                   word_index: WordIndex, maintain_arc_consistency: bool) -> int:
         """Method used for least-constraining-value heuristic. Calculates how many
         words from all domains are eliminated after assigning word into `assigned_position`
 
         Args:
-            assigned_position (Position): position recently filled with word
+            assigned_position (PositionId): id of the position recently filled with word
             word (str): word to be written in `assigned_position`
-            words_db (WordsDatabase): database of words for easy searching through viable words
-            words (list[str]): list of all words
+            word_index (WordIndex): index of words for easy searching through viable words
             maintain_arc_consistency (bool): whether to consider values removed by AC algorithm
 
         Returns:
             int: how many words from all domains are eliminated after assigning word into `assigned_position`
 
         """
-        # backup the current crossword state
-        grid_before: Grid = copy.deepcopy(self.grid)
-        domains_before: dict[Position, set[int]] = copy.deepcopy(self.position_domain)
+        # backup the current crossword state, trial propagation is not counted in statistics
+        state_before: SavedState = self.save_state()
+        statistics: SolverStatistics | None = self.statistics
+        self.statistics = None
         
         # reference values
-        domain_size_before: int = sum([len(domain) for domain in self.position_domain.values()])
+        domain_size_before: int = sum([word_index.size(domain) for domain in self.position_domain])
         
         # update domains
         self.write_word(assigned_position, word)
-        res: bool = self.update_domains(assigned_position, words_db, words, maintain_arc_consistency)
+        res: bool = self.update_domains(assigned_position, word_index, maintain_arc_consistency)
         
+        # calculate the reduction in sum of sizes of domains
         # if crossword is not solvable after assigning word into `assigned_position`, 
         # all values from domains were eliminated
-        if not res:
-            return domain_size_before
-        
-        # calculate the reduction in sum of sizes of domains
-        result: int = domain_size_before - sum([len(domain) for domain in self.position_domain.values()])
+        result: int = domain_size_before - sum([word_index.size(domain) for domain in self.position_domain]) if res else domain_size_before
         
         # restore the previous crossword state
-        self.grid = copy.deepcopy(grid_before)
-        self.position_domain = copy.deepcopy(domains_before)
+        self.restore_state(state_before)
+        self.statistics = statistics
         
         # return the number of eliminated words
         return result            
     
+    
+    def estimated_eliminated_words(self, assigned_position: PositionId, word: str, word_index: WordIndex,
+                                   letter_counts: dict[tuple[PositionId, str], int]) -> int:
+        """Cheap version of `number_of_eliminated_words` for least-constraining-value heuristic. 
+        Only words removed from domains of positions crossing `assigned_position` in empty squares are counted,
+        as the words without the letter of `word` at the crossing square. The crossword is not changed.
+
+        Args:
+            assigned_position (PositionId): id of the position to be filled with word
+            word (str): word to be written in `assigned_position`
+            word_index (WordIndex): index of words for easy searching through viable words
+            letter_counts (dict[tuple[PositionId, str], int]): cache of numbers of words in domains of crossing positions
+                with given letter at the crossing square, shared by all words tried for `assigned_position`
+
+        Returns:
+            int: estimated number of eliminated words, `sys.maxsize` if some domain would become empty
+        """
+        eliminated: int = 0
+        for other_position, (idx, other_idx) in self.crossing_offsets[assigned_position].items():
+            # filled square already matches the word, nothing is eliminated there
+            if self.cells[self.position_cells[assigned_position][idx]] != EMPTY_SQUARE:
+                continue
+            
+            domain: Domain = self.position_domain[other_position]
+            if (other_position, word[idx]) not in letter_counts:
+                letter_counts[(other_position, word[idx])] = word_index.size(
+                    word_index.restrict(domain, self.position_lengths[other_position], other_idx, word[idx]))
+            
+            remaining: int = letter_counts[(other_position, word[idx])]
+            if remaining == 0:
+                return sys.maxsize
+            eliminated += word_index.size(domain) - remaining
+        return eliminated
+    
         
 ############################### SERVICE METHODS ###############################
 
@@ -327,62 +1342,227 @@ def load_grids(path: str) -> list[Grid]:
     return per_char
 
 
-def split_words_by_length(words: list[int]) -> dict[int, set[int]]:
-    """Splits words into sets containing words with same length
+def split_words_by_length(words: list[str]) -> dict[int, list[str]]:
+    """Splits words into lists containing words with same length, order of words is kept,
+    repeated words are stored only once (otherwise the search would try them, and find the same solutions, twice)
 
     Args:
-        words (list[int]): words to split
+        words (list[str]): words to split
 
     Returns:
-        dict[int, set[int]]: map from length to sets of words with given length
+        dict[int, list[str]]: map from length to list of words with given length
     """
-    words_by_length: dict[int, set[str]] = {}
-    for i, word in enumerate(words):
+    words_of_length: dict[int, list[str]] = {}
+    for word in dict.fromkeys(words):
         length: int = len(word)
-        if length not in words_by_length:
-            words_by_length[length] = set()
-        words_by_length[length].add(i)
-    return words_by_length
+        if length not in words_of_length:
+            words_of_length[length] = []
+        words_of_length[length].append(word)
+    return words_of_length
+
 
+def words_digest(words: list[str]) -> bytes:
+    # Returns hash of the list of words, changes with any change of words or their order.
+    return hashlib.sha256('\n'.join(words).encode()).digest()
 
-def create_word_database(words: list[str]) -> WordsDatabase:
-    """Creates "database" of words that allows easy and fast search for words that have
+
+def compile_word_index(words: list[str]) -> CompiledWordIndex:
+    """Creates index of words that allows easy and fast search for words that have
     certain letter at certain position.
 
     Args:
-        words (list[str]): words to store in the "database"
+        words (list[str]): words to store in the index
 
     Returns:
-        WordsDatabase: database of the words
-            WordsDatabase[length][position][letter] -> indexes to `words` of all words of length `length` 
-            that have `letter` at `position`
+        CompiledWordIndex: index of the words
+            postings[length][position][letter] -> ids of all words of length `length` that have `letter` at `position`
     """
-    database: WordsDatabase = {}
-    alphabet: list[str] = [chr(i) for i in range(ord('a'), ord('z') + 1)] + ['\'']
-    for i, word in enumerate(words):
-        length: int = len(word)
+    words_of_length: dict[int, list[str]] = split_words_by_length(words)
+    postings: WordPostings = {}
+    for length, words_with_length in words_of_length.items():
+        # create dictionary for each position in the word with given length,
+        # postings of letters are created when first needed
+        postings[length] = {idx: {} for idx in range(length)}
         
-        # create dictionary for each position in the word with given length inside of which 
-        # create dictionary with keys as characters from the alphabet
-        if length not in database:
-            database[length] = {i: {
-                ch: set() for ch in alphabet
-            } for i in range(length)}
+        # ids are added in increasing order, so the postings are sorted
+        for word_id, word in enumerate(words_with_length):
+            for idx, ch in enumerate(word):
+                if ch not in postings[length][idx]:
+                    postings[length][idx][ch] = array('I')
+                postings[length][idx][ch].append(word_id)
+        
+    return CompiledWordIndex(words_of_length, postings, words_digest(words))
+
+
+# identification of the binary format of the compiled index 
+# (version 2 stores each word once, version 3 stores code points of letters instead of single bytes)
+WORD_INDEX_MAGIC: bytes = b"CWIX0003"
+# record of one posting in the index file: length, position, code point of the letter, number of ids
+WORD_INDEX_RECORD: str = "<HHII"
+
+
+def save_word_index(compiled_index: CompiledWordIndex, path: str) -> None:
+    """Stores compiled index of words in a compact binary file:
+    magic, hash of words, number of postings, table of (length, position, code point of letter, number of ids) 
+    for each posting and at last ids of all postings as unsigned 32-bit integers.
+    Words themselves are not stored, they are split by length again when loading.
+
+    Args:
+        compiled_index (CompiledWordIndex): index to store
+        path (str): path to the file
+    """
+    table: list[bytes] = []
+    ids: array = array('I')
+    for length, postings_of_length in compiled_index.postings.items():
+        for idx, postings in postings_of_length.items():
+            for ch, word_ids in postings.items():
+                table.append(struct.pack(WORD_INDEX_RECORD, length, idx, ord(ch), len(word_ids)))
+                ids.extend(word_ids)
+    
+    if sys.byteorder == "big":
+        ids.byteswap()
+    with open(path, 'wb') as file:
+        file.write(WORD_INDEX_MAGIC + compiled_index.digest + struct.pack("<I", len(table)))
+        file.write(b''.join(table))
+        file.write(ids.tobytes())
         
-        for j, ch in enumerate(word):
-            database[length][j][ch].add(i)
+
+def load_word_index(words: list[str], path: str) -> CompiledWordIndex:
+    """Loads compiled index of words from the file created by `save_word_index`.
+    If the file doesn't exist or was built from different words (their hash changed),
+    the index is compiled again and stored in the file.
+
+    Args:
+        words (list[str]): words the index should contain
+        path (str): path to the file
+
+    Returns:
+        CompiledWordIndex: index of the words
+    """
+    digest: bytes = words_digest(words)
+    header_size: int = len(WORD_INDEX_MAGIC) + len(digest) + 4
+    
+    data: bytes = b''
+    if os.path.exists(path):
+        with open(path, 'rb') as file:
+            data = file.read()
+    
+    # compile the index again if the file is missing, has different format or words changed
+    if data[:len(WORD_INDEX_MAGIC)] != WORD_INDEX_MAGIC or data[len(WORD_INDEX_MAGIC):header_size - 4] != digest:
+        compiled_index: CompiledWordIndex = compile_word_index(words)
+        save_word_index(compiled_index, path)
+        return compiled_index
+    
+    number_of_postings: int = struct.unpack_from("<I", data, header_size - 4)[0]
+    record_size: int = struct.calcsize(WORD_INDEX_RECORD)
+    ids: array = array('I', data[header_size + number_of_postings * record_size:])
+    if sys.byteorder == "big":
+        ids.byteswap()
+    
+    words_of_length: dict[int, list[str]] = split_words_by_length(words)
+    postings: WordPostings = {length: {idx: {} for idx in range(length)} for length in words_of_length}
+    start: int = 0
+    for length, idx, code_point, count in struct.iter_unpack(WORD_INDEX_RECORD, data[header_size:header_size + number_of_postings * record_size]):
+        postings[length][idx][chr(code_point)] = ids[start:start + count]
+        start += count
         
-    return database       
+    return CompiledWordIndex(words_of_length, postings, digest)
 
 
 ################################### SOLVING ###################################
 
-def solve(cw: CrossWord, words: list[str], 
-          show_progress: bool = False, show_remaining_AC_queue: bool = False, 
-          maintain_arc_consistency: bool = True,
-          unassigned_variable_heuristic: Literal["degree", "MRV", ""] = "degree",
-          use_LCV: bool = False, LCV_size: int | None = None) -> bool:
-    """Solves provided crossword with backtracking.
+class SolvingInterrupted(Exception):
+    """Raised by `solve` when its `should_stop` callback asks to stop the search."""
+
+
+class RestartCutoffReached(SolvingInterrupted):
+    """Raised inside the search when one restart of `solve` expanded its cutoff of nodes, 
+    the search then starts again with another seed."""
+
+
+class TimeLimitReached(SolvingInterrupted):
+    """Raised inside the search when the time limit of `iterate_solutions` is reached, 
+    the enumeration of solutions then ends without an error."""
+
+
+# words of assigned positions that can't be in the crossword all at once, {(position id, word)}
+Nogood = frozenset[tuple[PositionId, str]]
+
+
+class NogoodCache():
+    """Bounded cache of nogoods learned by conflict-directed backjumping.
+    Nogood is stored under the position whose subtree failed and the pattern of the position at that time 
+    (e.g. "c t  " for "c?t??"), so it is checked only when the position is chosen with the same pattern again.
+    When the cache is full, the least recently used pattern is evicted.
+    """
+    
+    # max number of nogoods stored under one pattern, older ones are replaced
+    NOGOODS_PER_PATTERN: int = 4
+    
+    # nogoods stored under (position, pattern), from the least recently used
+    nogoods: OrderedDict[tuple[PositionId, str], list[Nogood]]
+    
+    # max number of stored patterns
+    size: int
+    
+    def __init__(self, size: int) -> None:
+        self.nogoods = OrderedDict()
+        self.size = size
+        
+        
+    def add(self, position: PositionId, pattern: str, nogood: Nogood) -> None:
+        # Stores nogood learned when the subtree of `position` (by id) with `pattern` failed.
+        if self.size <= 0:
+            return
+        key: tuple[PositionId, str] = (position, pattern)
+        if key in self.nogoods:
+            self.nogoods.move_to_end(key)
+            if nogood not in self.nogoods[key]:
+                self.nogoods[key] = (self.nogoods[key] + [nogood])[-self.NOGOODS_PER_PATTERN:]
+            return
+        
+        self.nogoods[key] = [nogood]
+        if len(self.nogoods) > self.size:
+            self.nogoods.popitem(last=False)
+    
+    
+    def find(self, position: PositionId, pattern: str, text_at_pos: Callable[[PositionId], str]) -> Nogood | None:
+        """Finds nogood stored under `position` and `pattern`, whose words are all written in the crossword.
+
+        Args:
+            position (PositionId): id of chosen position
+            pattern (str): text currently written in the position
+            text_at_pos (Callable[[PositionId], str]): function returning text currently written in a position
+
+        Returns:
+            Nogood | None: matching nogood, None if there is none
+        """
+        nogoods: list[Nogood] | None = self.nogoods.get((position, pattern))
+        if nogoods is None:
+            return None
+        self.nogoods.move_to_end((position, pattern))
+        for nogood in nogoods:
+            if all(text_at_pos(other_position) == word for other_position, word in nogood):
+                return nogood
+        return None
+
+
+def iterate_solutions(cw: CrossWord, words: list[str], 
+                      show_progress: bool = False, show_remaining_AC_queue: bool = False, 
+                      maintain_arc_consistency: bool = True,
+                      unassigned_variable_heuristic: Literal["degree", "MRV", ""] = "degree",
+                      use_LCV: bool | Literal["fast"] = False, LCV_size: int | None = None,
+                      use_trail: bool = True, domain_representation: Literal["set", "bitset", "array"] = "set",
+                      arc_consistency_algorithm: Literal["AC-3", "AC-4"] = "AC-3",
+                      seed: int | None = None, should_stop: Callable[[], bool] | None = None,
+                      compiled_index: CompiledWordIndex | None = None,
+                      backjumping: bool = False, nogood_cache_size: int = 10000,
+                      statistics: SolverStatistics | None = None,
+                      max_solutions: int | None = None, time_limit: float | None = None,
+                      randomize_ties: bool = False) -> Iterator[str]:
+    """Enumerates distinct solutions of provided crossword with backtracking, lazily.
+    After a solution is yielded, the search resumes from the state the solution was found in,
+    so each next solution costs only the search between the two.
 
     Args:
         cw (CrossWord): crossword to be solved
@@ -396,117 +1576,501 @@ def solve(cw: CrossWord, words: list[str],
         unassigned_variable_heuristic (str, optional): heuristic to choose unassigned variable. 
             None used if "" is passed.
             Defaults to "degree".
-        use_LCV (bool, optional): whether to use least-constraining-value heuristic to choose value to assign. 
+        use_LCV (bool | str, optional): whether to use least-constraining-value heuristic to choose value to assign,
+            "fast" estimates eliminated words from crossing squares only, without writing the word and propagating. 
             Defaults to False.
         LCV_size (int | None, optional): sample of how many values from domain to check during LCV run (performance purposes). 
             Defaults to None -> all values.
+        use_trail (bool, optional): whether to backtrack by undoing changes recorded in the trail of the crossword,
+            instead of restoring copies of the whole grid and all domains. 
+            Defaults to True.
+        domain_representation (str, optional): how domains of positions are stored, 
+            "set" for sets of word indexes, "bitset" for bitsets stored in integers,
+            "array" for sorted arrays of word indexes (the least memory, for very large dictionaries).
+            Defaults to "set".
+        arc_consistency_algorithm (str, optional): how arc consistency is maintained, 
+            "AC-3" revises whole domains for each arc in the queue, 
+            "AC-4" keeps support counts of letters for each arc and removes only words that lost their support.
+            Defaults to "AC-3".
+        seed (int | None, optional): seed for shuffling the order in which words from domains are tried,
+            so runs with different seeds explore the search space differently. 
+            Defaults to None -> words are tried in the order of the domain.
+        should_stop (Callable[[], bool] | None, optional): called before expanding each state of the search,
+            if it returns True, the search is stopped by raising `SolvingInterrupted`. 
+            Defaults to None.
+        compiled_index (CompiledWordIndex | None, optional): index of `words` compiled beforehand 
+            (e.g. loaded by `load_word_index`), so it doesn't have to be built for each crossword. 
+            Defaults to None -> index is compiled from `words`.
+        backjumping (bool, optional): whether to use conflict-directed backjumping, i.e. jump back straight 
+            to the last assigned position responsible for the failure, and to learn nogoods. 
+            Defaults to False.
+        nogood_cache_size (int, optional): max number of patterns of positions with learned nogoods kept for backjumping. 
+            Defaults to 10000.
+        statistics (SolverStatistics | None, optional): object collecting statistics of the run (nodes, backtracks, 
+            time spent in propagation, ...), it is reset at the start and filled during the run, 
+            even if the run is interrupted. 
+            Defaults to None -> statistics are not collected.
+        max_solutions (int | None, optional): the enumeration ends after this many solutions.
+            Defaults to None -> all solutions.
+        time_limit (float | None, optional): the enumeration ends at the first state after this many seconds,
+            without raising `SolvingInterrupted`.
+            Defaults to None -> no limit.
+        randomize_ties (bool, optional): whether ties of `unassigned_variable_heuristic` are broken randomly
+            (by `seed`) instead of by the order of positions.
+            Defaults to False.
             
-    Returns:
-        bool: True if the crossword was solved, False if it can't be solved with provided words
+    Yields:
+        str: filled grid of each solution, `cw` stays filled with it until the next solution is requested
+        
+    Raises:
+        SolvingInterrupted: if `should_stop` returned True
+        ValueError: if the words contain non-ASCII characters
     """      
-    def solve_backtrack(cw: CrossWord) -> bool:
+    def solve_backtrack(cw: CrossWord, depth: int = 0) -> Iterator[None]:
         """Backtracking function used to solve the crossword. 
 
         Args:
             cw (CrossWord): crossword to be solved
+            depth (int, optional): number of words assigned by the search. 
+                Defaults to 0.
 
-        Returns:
-            bool: True if the crossword was solved, False if it can't be solved after previous word assignments
+        Yields:
+            None: each time the crossword is filled, the search continues when resumed
         """        
+        # stop the search if asked to do so
+        check_stop()
+        if statistics is not None:
+            statistics.node(depth)
+        
         # print progress if asked to do so
         if show_progress:
             print(cw)
-            print("Sum of sizes of all domains:", sum([len(domain) for domain in cw.position_domain.values()]))
+            print("Sum of sizes of all domains:", sum([word_index.size(domain) for domain in cw.position_domain]))
 
-        # if the whole crossword is filled, return True
-        if ' ' not in [ch for row in cw.grid for ch in row]:
-            return True
+        # if the whole crossword is filled, report the solution
+        if cw.is_filled():
+            yield
+            return
+        
+        # choose unassigned variable by passed heuristic
+        unassigned_position: PositionId = select_position(cw)
+            
+        # backup state of the grid before the word assignment
+        state_before: SavedState = cw.save_state()
+        
+        # loop through the domain
+        for word_idx in ordered_domain(cw, unassigned_position):     
+            # if the word can be written (probably redundant check)
+            word = word_index.word(cw.position_lengths[unassigned_position], word_idx)
+            if cw.can_write_word(unassigned_position, word):
+                # write the word
+                cw.write_word(unassigned_position, word)
+                
+                # update domains
+                # if crossword is not solvable, revert it to the previous state
+                if not propagate(cw, unassigned_position):
+                    undo_word(cw, state_before)
+                    continue
+                
+                # backtrack deeper
+                yield from solve_backtrack(cw, depth + 1)
+                
+                # all solutions with currently filled word were found, remove it
+                undo_word(cw, state_before)
+    
+    def solve_backjump(cw: CrossWord) -> Generator[None, None, frozenset[PositionId]]:
+        """Backtracking function with conflict-directed backjumping. 
+        Exhausted subtree returns assigned positions responsible for its failure (its conflict set), 
+        positions not in it are jumped over without trying their other words.
+        A solution is treated as a failure caused by all assigned positions, so no solution is jumped over.
+
+        Args:
+            cw (CrossWord): crossword to be solved
+
+        Yields:
+            None: each time the crossword is filled, the search continues when resumed
+            
+        Returns:
+            frozenset[PositionId]: ids of assigned positions whose words caused the failure
+        """
+        # stop the search if asked to do so
+        check_stop()
+        if statistics is not None:
+            statistics.node(len(assigned_positions))
         
-        # get all unassigned positions
-        unassigned_positions = [pos for pos in cw.positions if " " in cw.text_at_pos(pos)]
+        # print progress if asked to do so
+        if show_progress:
+            print(cw)
+            print("Sum of sizes of all domains:", sum([word_index.size(domain) for domain in cw.position_domain]))
+
+        # if the whole crossword is filled, report the solution
+        if cw.is_filled():
+            yield
+            return frozenset(assigned_positions)
         
         # choose unassigned variable by passed heuristic
-        MRV_heuristic = lambda p: len(cw.position_domain[p])
-        degree_heuristic = lambda p: len(cw.positions_affected[p] - (set(cw.positions) - set(unassigned_positions)))
+        unassigned_position: PositionId = select_position(cw)
         
-        if unassigned_variable_heuristic == "degree":
-            unassigned_position = max(unassigned_positions, key=degree_heuristic)
-        elif unassigned_variable_heuristic == "MRV":
-            unassigned_position = min(unassigned_positions, key=MRV_heuristic)       
-        else:
-            unassigned_position = unassigned_positions[0]
+        # if the position with the same pattern failed before with words still in the crossword, fail right away
+        pattern: str = cw.text_at_pos(unassigned_position)
+        nogood: Nogood | None = nogoods.find(unassigned_position, pattern, cw.text_at_pos)
+        if nogood is not None:
+            return responsible_positions(cw, nogood)
+        solutions_before: int = solutions_found
             
         # backup state of the grid before the word assignment
-        domains_before: dict[Position, set[int]] = copy.deepcopy(cw.position_domain)
-        grid_before: Grid = copy.deepcopy(cw.grid)
+        state_before: SavedState = cw.save_state()
+        
+        # words removed from the domain before were removed because of these positions
+        conflict: set[PositionId] = set(cw.explanations[unassigned_position])
+        
+        # loop through the domain
+        for word_idx in ordered_domain(cw, unassigned_position):
+            # if the word can't be written (probably redundant check), blame all assigned positions
+            word = word_index.word(cw.position_lengths[unassigned_position], word_idx)
+            if not cw.can_write_word(unassigned_position, word):
+                conflict.update(assigned_positions)
+                continue
+            
+            # write the word, if the domains are wiped out, remember positions responsible for it
+            cw.write_word(unassigned_position, word)
+            if not propagate(cw, unassigned_position):
+                conflict |= cw.conflict - {unassigned_position}
+                undo_word(cw, state_before)
+                continue
+            
+            # backtrack deeper
+            assigned_positions.append(unassigned_position)
+            child_conflict: frozenset[PositionId] = yield from solve_backjump(cw)
+            assigned_positions.pop()
+            undo_word(cw, state_before)
+            
+            # failure deeper doesn't depend on this position, other words wouldn't help, jump back
+            if unassigned_position not in child_conflict:
+                if statistics is not None:
+                    statistics.backjumps += 1
+                conflict = set(child_conflict)
+                break
+            conflict |= child_conflict - {unassigned_position}
+        
+        # the pattern of the position with words of conflicting positions can't be completed,
+        # unless solutions were found under it
+        if solutions_found == solutions_before:
+            nogoods.add(unassigned_position, pattern, frozenset([(position, cw.text_at_pos(position)) for position in conflict]))
+        return frozenset(conflict)
+    
+    def check_stop() -> None:
+        # Stops the search if `should_stop` asks to do so or if the time limit is reached.
+        if should_stop is not None and should_stop():
+            raise SolvingInterrupted()
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeLimitReached()
+    
+    def select_position(cw: CrossWord) -> PositionId:
+        # Chooses unassigned position, measures the time if statistics are collected.
+        if statistics is None:
+            return cw.select_unassigned_position()
+        start: float = time.perf_counter()
+        position: PositionId = cw.select_unassigned_position()
+        statistics.selection_time += time.perf_counter() - start
+        return position
+    
+    def propagate(cw: CrossWord, assigned_position: PositionId) -> bool:
+        # Updates domains after assigning the position, measures the time if statistics are collected.
+        if statistics is None:
+            return cw.update_domains(assigned_position, word_index, maintain_arc_consistency, show_remaining_AC_queue)
+        start: float = time.perf_counter()
+        res: bool = cw.update_domains(assigned_position, word_index, maintain_arc_consistency, show_remaining_AC_queue)
+        statistics.propagation_time += time.perf_counter() - start
+        return res
+    
+    def undo_word(cw: CrossWord, state_before: SavedState) -> None:
+        # Removes failed word from the crossword by restoring the state before it, counts the backtrack.
+        if statistics is not None:
+            statistics.backtracks += 1
+        cw.restore_state(state_before)
+    
+    def responsible_positions(cw: CrossWord, nogood: Nogood) -> frozenset[PositionId]:
+        # Returns ids of assigned positions that wrote the words of the nogood, 
+        # words of positions that are not assigned were written by the assigned positions crossing them.
+        responsible: set[PositionId] = set()
+        for position, _ in nogood:
+            if position in assigned_positions:
+                responsible.add(position)
+            else:
+                responsible |= cw.positions_affected[position] & set(assigned_positions)
+        return frozenset(responsible)
+    
+    def ordered_domain(cw: CrossWord, unassigned_position: PositionId) -> list[int]:
+        """Returns ids of words from the domain of `unassigned_position` in the order they should be tried,
+        shuffled if asked to and ordered by least-constraining-value heuristic if asked to.
+
+        Args:
+            cw (CrossWord): crossword being solved
+            unassigned_position (PositionId): id of chosen position
+
+        Returns:
+            list[int]: ids of words to be tried
+        """
+        start: float = time.perf_counter()
         
         # get the domain of the chosen unassigned position to loop through
-        domain: list[int] = list(cw.position_domain[unassigned_position])
+        domain: list[int] = word_index.ids(cw.position_domain[unassigned_position])
+        if rng is not None:
+            rng.shuffle(domain)
         
         # if LCV heuristic should be used, calculate which word "eliminates" the smallest number of words in other domains
         if use_LCV:
-            lcv: list[tuple[str, int]] = []
+            lcv: list[tuple[int, int]] = []
+            
+            # counts of letters at crossing squares, shared by all words when estimating
+            letter_counts: dict[tuple[PositionId, str], int] = {}
             
             # if LCV size is not set or is larger than available domain, set it do domain length
             # loop through words in domain
-            for word_idx in random.sample(domain, k=min(LCV_size, len(domain) if LCV_size is not None else len(domain))):
-                word = words[word_idx]
+            sample_size: int = len(domain) if LCV_size is None else min(LCV_size, len(domain))
+            for word_idx in (rng or random).sample(domain, k=sample_size):
+                word = word_index.word(cw.position_lengths[unassigned_position], word_idx)
                 
                 # if the word can be written (probably redundant check), calculate how many words it eliminates
-                if cw.can_write_word(unassigned_position, word):                   
-                    lcv.append((
-                        word_idx, 
-                        cw.number_of_eliminated_words(unassigned_position, word, words_db, words, maintain_arc_consistency)
-                        ))
+                if cw.can_write_word(unassigned_position, word):
+                    if use_LCV == "fast":
+                        eliminated: int = cw.estimated_eliminated_words(unassigned_position, word, word_index, letter_counts)
+                    else:
+                        eliminated = cw.number_of_eliminated_words(unassigned_position, word, word_index, maintain_arc_consistency)
+                    lcv.append((word_idx, eliminated))
             
             # order the domain from least to most-constraining-variables
             domain = [word_idx for word_idx, eliminated_words in sorted(lcv, key=lambda x: x[1])]
         
-        # loop through the domain
-        for word_idx in domain:     
-            # if the word can be written (probably redundant check)
-            if cw.can_write_word(unassigned_position, words[word_idx]):
-                # write the word
-                cw.write_word(unassigned_position, words[word_idx])
-                
-                # update domains
-                # if crossword is not solvable, revert it to the previous state
-                if not cw.update_domains(unassigned_position, words_db, words, maintain_arc_consistency, show_remaining_AC_queue):
-                    cw.position_domain = copy.deepcopy(domains_before)
-                    cw.grid = copy.deepcopy(grid_before)
-                    continue
-                
-                # backtrack deeper
-                if solve_backtrack(cw):
-                    return True
-                
-                # if backtrack returned that the crossword is not solvable with currently filled word, remove it
-                cw.position_domain = copy.deepcopy(domains_before)
-                cw.grid = copy.deepcopy(grid_before)       
-        
-        # if no word returned solved crossword, crossword is not solvable in current state
-        return False
+        if statistics is not None:
+            statistics.selection_time += time.perf_counter() - start
+        return domain
 
-    # separate words by length, assign these sets as domains of positions in crossword
-    words_by_length: dict[int, set[int]] = split_words_by_length(words)
-    cw.position_domain = {
-        pos: words_by_length[pos[2]].copy() for pos in cw.positions
-    }
+    # random generator for the order of words, if asked to shuffle them
+    rng: random.Random | None = random.Random(seed) if seed is not None else None
     
-    # create the database of words for easy searching through viable words meeting certain conditions
-    words_db: WordsDatabase = create_word_database(words)  
+    # create the index of words for easy searching through viable words meeting certain conditions,
+    # words are separated by length inside of it
+    if compiled_index is None:
+        compiled_index = compile_word_index(words)
+    # letters are written into squares of the grid, each stored in one byte
+    if not all(ch.isascii() for ch in compiled_index.letters()):
+        raise ValueError("words used for solving must contain only ASCII characters")
+    word_index: WordIndex
+    if domain_representation == "array":
+        word_index = ArrayWordIndex(compiled_index)
+    elif domain_representation == "bitset":
+        word_index = BitsetWordIndex(compiled_index)
+    else:
+        word_index = SetWordIndex(compiled_index)
+    
+    # assign all words with the right length as domains of positions in crossword
+    cw.position_domain = [word_index.full_domain(length) for length in cw.position_lengths]
+    cw.trail = [] if use_trail else None
+    
+    # record positions responsible for removed words, if backjumping
+    cw.explanations = [frozenset() for _ in cw.positions] if backjumping else None
+    assigned_positions: list[PositionId] = []
+    nogoods: NogoodCache = NogoodCache(nogood_cache_size)
+    
+    # end of the time limit, number of solutions yielded so far
+    deadline: float | None = time.perf_counter() + time_limit if time_limit is not None else None
+    solutions_found: int = 0
+    
+    # keep track of empty squares and unassigned positions while solving
+    cw.set_tie_breaking((rng or random.Random()) if randomize_ties else None)
+    cw.init_tracking(word_index.size, unassigned_variable_heuristic if unassigned_variable_heuristic in ("degree", "MRV") else "")
+    
+    # collect statistics of the run if asked to do so
+    cw.statistics = statistics
+    if statistics is not None:
+        statistics.start()
     
     # print sum of sizes of all domains
     if show_progress:
-        print("Sum of sizes of all domains:", sum([len(domain) for domain in cw.position_domain.values()]))
+        print("Sum of sizes of all domains:", sum([word_index.size(domain) for domain in cw.position_domain]))
+    
+    try:
+        # call arc consistency algorithm if asked to do so
+        propagation_start: float = time.perf_counter()
+        cw.supports = None
+        consistent: bool = True
+        if maintain_arc_consistency and arc_consistency_algorithm == "AC-4":
+            consistent = cw.init_supports(word_index, show_remaining_AC_queue)
+        elif maintain_arc_consistency:        
+            consistent = cw.arc_consistency({(position, affected) for position, affected_positions in enumerate(cw.positions_affected) 
+                                             for affected in affected_positions},
+                                            word_index, show_remaining_AC_queue)
+        if statistics is not None:
+            statistics.propagation_time += time.perf_counter() - propagation_start
+        
+        # a domain was wiped out before any word was assigned, there is no solution
+        if not consistent:
+            return
+     
+        # report solutions found by backtrack
+        for _ in (solve_backjump(cw) if backjumping else solve_backtrack(cw)):
+            solutions_found += 1
+            yield str(cw)
+            if max_solutions is not None and solutions_found >= max_solutions:
+                return
+    except TimeLimitReached:
+        return
+    finally:
+        if statistics is not None:
+            statistics.finish()
+        cw.statistics = None
+
+
+def solve(cw: CrossWord, words: list[str], 
+          show_progress: bool = False, show_remaining_AC_queue: bool = False, 
+          maintain_arc_consistency: bool = True,
+          unassigned_variable_heuristic: Literal["degree", "MRV", ""] = "degree",
+          use_LCV: bool | Literal["fast"] = False, LCV_size: int | None = None,
+          use_trail: bool = True, domain_representation: Literal["set", "bitset", "array"] = "set",
+          arc_consistency_algorithm: Literal["AC-3", "AC-4"] = "AC-3",
+          seed: int | None = None, should_stop: Callable[[], bool] | None = None,
+          compiled_index: CompiledWordIndex | None = None,
+          backjumping: bool = False, nogood_cache_size: int = 10000,
+          statistics: SolverStatistics | None = None,
+          restart_policy: Literal["luby", "geometric"] | None = None,
+          restart_base: int = 100, restart_factor: float = 1.5) -> bool:
+    """Solves provided crossword with backtracking, the first solution found by `iterate_solutions` 
+    is left in `cw`. Arguments not listed below are the ones of `iterate_solutions`.
+    
+    With a restart policy, the search is stopped after a cutoff on the number of nodes and started again
+    with another seed, i.e. with other order of words and random ties of the heuristic choosing positions,
+    so the run doesn't stay stuck in one hopeless part of the search space. 
+    Cutoffs grow, so the search stays complete.
+
+    Args:
+        seed (int | None, optional): seed for shuffling the order of words, with restarts the seeds 
+            of the restarts are drawn from it.
+            Defaults to None -> words are tried in the order of the domain, random seeds for restarts.
+        statistics (SolverStatistics | None, optional): object collecting statistics of the run, 
+            with restarts sums of all restarts and statistics of each of them in `restarts`.
+            Defaults to None -> statistics are not collected.
+        restart_policy (str | None, optional): how cutoffs of the restarts grow, 
+            "luby" - `restart_base` times the Luby sequence (1, 1, 2, 1, 1, 2, 4, ...),
+            "geometric" - `restart_base` times powers of `restart_factor`.
+            Defaults to None -> no restarts.
+        restart_base (int, optional): number of nodes of the first restart. 
+            Defaults to 100.
+        restart_factor (float, optional): growth of cutoffs of geometric restarts. 
+            Defaults to 1.5.
+            
+    Returns:
+        bool: True if the crossword was solved, False if it can't be solved with provided words
+        
+    Raises:
+        SolvingInterrupted: if `should_stop` returned True
+        ValueError: if the words contain non-ASCII characters
+    """
+    def first_solution(run_seed: int | None, run_should_stop: Callable[[], bool] | None,
+                       run_statistics: SolverStatistics | None, randomize_ties: bool) -> bool:
+        # Runs the search until the first solution, returns whether it was found.
+        solutions: Iterator[str] = iterate_solutions(
+            cw, words, show_progress, show_remaining_AC_queue, maintain_arc_consistency, unassigned_variable_heuristic,
+            use_LCV, LCV_size, use_trail, domain_representation, arc_consistency_algorithm, run_seed, run_should_stop,
+            compiled_index, backjumping, nogood_cache_size, run_statistics, max_solutions=1, randomize_ties=randomize_ties
+        )
+        try:
+            return next(solutions, None) is not None
+        finally:
+            solutions.close()
+    
+    def stop_restart() -> bool:
+        # Stops the restart after its cutoff on nodes, or the whole search if `should_stop` asks to do so.
+        if should_stop is not None and should_stop():
+            return True
+        if restart_statistics.nodes >= cutoff:
+            raise RestartCutoffReached()
+        return False
+    
+    if restart_policy is None:
+        return first_solution(seed, should_stop, statistics, False)
+    
+    # compile the index only once for all restarts, each restart starts from the grid as it is now
+    if compiled_index is None:
+        compiled_index = compile_word_index(words)
+    initial_cells: bytearray = cw.cells.copy()
+    seeds: random.Random = random.Random(seed)
     
-    # call arc consistency algorithm if asked to do so
-    if maintain_arc_consistency:        
-        cw.arc_consistency({(pos, affected) for pos in cw.positions for affected in cw.positions_affected[pos]},
-                        words_db, words, show_remaining_AC_queue)
- 
-    # return the result of backtrack
-    return solve_backtrack(cw)  
+    if statistics is not None:
+        statistics.start()
+    try:
+        restart: int = 0
+        while True:
+            restart += 1
+            cutoff: int = round(restart_base * (luby(restart) if restart_policy == "luby" else restart_factor ** (restart - 1)))
+            restart_seed: int = seeds.randrange(2**32)
+            restart_statistics: SolverStatistics = SolverStatistics()
+            cw.cells = initial_cells.copy()
+            try:
+                return first_solution(restart_seed, stop_restart, restart_statistics, True)
+            except RestartCutoffReached:
+                continue
+            finally:
+                if statistics is not None:
+                    statistics.add_restart(restart_statistics, restart_seed, cutoff)
+    finally:
+        if statistics is not None:
+            statistics.finish()
+
+
+def luby(i: int) -> int:
+    """Returns `i`-th element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...,
+    cutoffs by it are within a logarithmic factor of the best fixed cutoff for any distribution of runtimes.
+
+    Args:
+        i (int): index of the element, starting from 1
+
+    Returns:
+        int: element of the sequence
+    """
+    # the sequence is made of blocks ending with 2^(k-1) at index 2^k - 1, each block repeats the previous one twice
+    k: int = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+def best_solutions(cw: CrossWord, words: list[str], score: Callable[[CrossWord], float], k: int = 10,
+                   max_solutions: int | None = None, time_limit: float | None = None,
+                   **solve_options: Any) -> list[tuple[float, str]]:
+    """Enumerates solutions of provided crossword by `iterate_solutions` and keeps the `k` best ones by `score`.
+    The best solutions are kept in a heap of size `k`, so memory doesn't grow with the number of solutions.
+
+    Args:
+        cw (CrossWord): crossword to be solved
+        words (list[str]): words that can be used
+        score (Callable[[CrossWord], float]): returns score of the filled crossword (the higher the better),
+            it must not change the crossword
+        k (int, optional): number of the best solutions to keep. 
+            Defaults to 10.
+        max_solutions (int | None, optional): the enumeration ends after this many solutions.
+            Defaults to None -> all solutions.
+        time_limit (float | None, optional): the enumeration ends at the first state after this many seconds.
+            Defaults to None -> no limit.
+        **solve_options: other keyword arguments of `iterate_solutions` (heuristics, seed, ...)
+
+    Returns:
+        list[tuple[float, str]]: (score, filled grid) of the best solutions, from the best one, 
+            solutions with the same score in the order they were found
+    """
+    # heap of (score, -order of the solution, solution), the worst kept solution is on the top
+    best: list[tuple[float, int, str]] = []
+    for i, solution in enumerate(iterate_solutions(cw, words, max_solutions=max_solutions, 
+                                                   time_limit=time_limit, **solve_options)):
+        entry: tuple[float, int, str] = (score(cw), -i, solution)
+        if len(best) < k:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            heapq.heapreplace(best, entry)
+    return [(solution_score, solution) for solution_score, _, solution in sorted(best, reverse=True)]
 
     
     
@@ -514,7 +2078,8 @@ def solve(cw: CrossWord, words: list[str],
 def solve_one_crossword(words: list[str], grid: Grid, show_progress: bool = True,
                         maintain_arc_consistency: bool = True,
                         unassigned_variable_heuristic: Literal["degree", "MRV", ""] = "degree",
-                        use_LCV: bool = False, LCV_size: int | None = None) -> None:
+                        use_LCV: bool | Literal["fast"] = False, LCV_size: int | None = None,
+                        seed: int | None = None, compiled_index: CompiledWordIndex | None = None) -> None:
     """Solves one crossword with given grid, print the solution.
 
     Args:
@@ -527,15 +2092,20 @@ def solve_one_crossword(words: list[str], grid: Grid, show_progress: bool = True
         unassigned_variable_heuristic (str, optional): heuristic to choose unassigned variable. 
             None used if "" is passed.
             Defaults to "degree".
-        use_LCV (bool, optional): whether to use least-constraining-value heuristic to choose value to assign. 
+        use_LCV (bool | str, optional): whether to use least-constraining-value heuristic to choose value to assign,
+            "fast" estimates eliminated words from crossing squares only, without writing the word and propagating. 
             Defaults to False.
         LCV_size (int | None, optional): sample of how many values from domain to check during LCV run (performance purposes). 
             Defaults to None -> all values.
+        seed (int | None, optional): seed for shuffling the order in which words from domains are tried. 
+            Defaults to None -> words are tried in the order of the domain.
+        compiled_index (CompiledWordIndex | None, optional): index of `words` compiled beforehand. 
+            Defaults to None -> index is compiled from `words`.
     """
     cw: CrossWord = CrossWord(grid)
     res: bool = solve(cw, words, show_progress, False, 
                       maintain_arc_consistency, unassigned_variable_heuristic, 
-                      use_LCV, LCV_size)
+                      use_LCV, LCV_size, seed=seed, compiled_index=compiled_index)
     if res:
         print('=' * 40 + "\nCrossword was solved successfully")
         print(cw)
@@ -550,7 +2120,8 @@ def solve_all_crosswords(words: list[str], grids: list[Grid], solutions_file: st
                          show_progress: bool = True,
                          maintain_arc_consistency: bool = True,
                          unassigned_variable_heuristic: Literal["degree", "MRV", ""] = "degree",
-                         use_LCV: bool = False, LCV_size: int | None = None) -> None:
+                         use_LCV: bool | Literal["fast"] = False, LCV_size: int | None = None,
+                         seed: int | None = None, compiled_index: CompiledWordIndex | None = None) -> None:
     """Times the solution of all 10 crosswords, stores results (solution and times) into a file.
     If no file is provided, prints to terminal.
     
@@ -570,13 +2141,20 @@ def solve_all_crosswords(words: list[str], grids: list[Grid], solutions_file: st
         unassigned_variable_heuristic (str, optional): heuristic to choose unassigned variable. 
             None used if "" is passed.
             Defaults to "degree".
-        use_LCV (bool, optional): whether to use least-constraining-value heuristic to choose value to assign. 
+        use_LCV (bool | str, optional): whether to use least-constraining-value heuristic to choose value to assign,
+            "fast" estimates eliminated words from crossing squares only, without writing the word and propagating. 
             Defaults to False.
         LCV_size (int | None, optional): sample of how many values from domain to check during LCV run (performance purposes). 
             Defaults to None -> all values.
+        seed (int | None, optional): seed for shuffling the order in which words from domains are tried. 
+            Defaults to None -> words are tried in the order of the domain.
+        compiled_index (CompiledWordIndex | None, optional): index of `words` compiled beforehand. 
+            Defaults to None -> index is compiled from `words` once for all crosswords.
     """
     if len(grids) != 10:
         print("Please, provide all 10 grids")
+    if compiled_index is None:
+        compiled_index = compile_word_index(words)
     
     # order in which to evaluate crosswords
     order: list[int] = [0, 1, 2, 3, 4, 5, 7, 8, 6, 9] 
@@ -600,44 +2178,280 @@ def solve_all_crosswords(words: list[str], grids: list[Grid], solutions_file: st
         cw = CrossWord(grids[i])
         solve(cw, words, show_progress, False, 
               maintain_arc_consistency, unassigned_variable_heuristic, 
-              use_LCV, LCV_size)
+              use_LCV, LCV_size, seed=seed, compiled_index=compiled_index)
         
         # print/store results
         points_so_far += points[i]
-        output_str: str = (
-            "==== Crossword No." + str(i + 1) + " ====\n"
-            + str(cw)
-            + f"\nelapsed time crossword: {(time.time() - start)/60 :.5f}\n"
-            + f"elapsed time total: {(time.time() - start_of_run)/60 :.5f}\n"
-            + f"\nGiven all the solved crosswords are correct, you have so far {points_so_far}"
-                " points!\n"
-            + "=" * 24
-        )
-        
-        if solutions_file is not None:
-            with open(solutions_file, 'a') as file:
-                sys.stdout = file
-                print(output_str)
-                sys.stdout = sys.__stdout__
-        else:
+        output_solution(i, str(cw), time.time() - start, time.time() - start_of_run, points_so_far, solutions_file)
+
+
+def output_solution(i: int, solution: str, elapsed_crossword: float, elapsed_total: float,
+                    points_so_far: float, solutions_file: str | None) -> None:
+    """Appends the solution of the i-th crossword with its times to the file, if no file is provided, prints to terminal.
+
+    Args:
+        i (int): index of the crossword
+        solution (str): formatted grid of the crossword
+        elapsed_crossword (float): time of solving the crossword in seconds
+        elapsed_total (float): time since the start of the whole run in seconds
+        points_so_far (float): points for all crosswords solved so far
+        solutions_file (str | None): file to store the solution in, if None, print to terminal
+    """
+    output_str: str = (
+        "==== Crossword No." + str(i + 1) + " ====\n"
+        + solution
+        + f"\nelapsed time crossword: {elapsed_crossword/60 :.5f}\n"
+        + f"elapsed time total: {elapsed_total/60 :.5f}\n"
+        + f"\nGiven all the solved crosswords are correct, you have so far {points_so_far}"
+            " points!\n"
+        + "=" * 24
+    )
+    
+    if solutions_file is not None:
+        with open(solutions_file, 'a') as file:
+            sys.stdout = file
             print(output_str)
+            sys.stdout = sys.__stdout__
+    else:
+        print(output_str)
+
+
+# configurations raced against each other by `solve_all_crosswords_portfolio`, keyword arguments of `solve`
+PORTFOLIO: list[dict[str, Any]] = [
+    {"unassigned_variable_heuristic": "degree", "seed": 0},
+    {"unassigned_variable_heuristic": "MRV", "seed": 1},
+    {"unassigned_variable_heuristic": "degree", "seed": 2},
+    {"unassigned_variable_heuristic": "MRV", "seed": 3},
+    {"unassigned_variable_heuristic": "degree", "use_LCV": True, "LCV_size": 20, "seed": 4},
+    {"unassigned_variable_heuristic": "MRV", "use_LCV": True, "LCV_size": 20, "seed": 5},
+    {"unassigned_variable_heuristic": "MRV", "backjumping": True, "seed": 6},
+]
+
+
+def solve_portfolio_task(words: list[str], grid: Grid, configuration: dict[str, Any], 
+                         stop_event: Any, compiled_index: CompiledWordIndex) -> tuple[bool, str, float] | None:
+    """Solves one crossword with one configuration of the portfolio, runs in a worker process.
+
+    Args:
+        words (list[str]): words that can be used in solution
+        grid (Grid): grid to be filled
+        configuration (dict[str, Any]): keyword arguments of `solve`
+        stop_event (Any): shared event, set when the crossword was already decided by other configuration
+        compiled_index (CompiledWordIndex): index of `words` compiled beforehand
+
+    Returns:
+        tuple[bool, str, float] | None: result of `solve`, formatted grid and time of solving in seconds,
+            None if the run was cancelled
+    """
+    # checking the shared event needs communication with the manager process, so check only every 64th state
+    states: int = 0
+    def should_stop() -> bool:
+        nonlocal states
+        states += 1
+        return states % 64 == 0 and stop_event.is_set()
+    
+    start: float = time.time()
+    cw: CrossWord = CrossWord(copy.deepcopy(grid))
+    try:
+        res: bool = solve(cw, words, should_stop=should_stop, compiled_index=compiled_index, **configuration)
+    except SolvingInterrupted:
+        return None
+    return res, str(cw), time.time() - start
+
+
+def solve_all_crosswords_portfolio(words: list[str], grids: list[Grid], solutions_file: str | None = "solutions.txt",
+                                   configurations: list[dict[str, Any]] | None = None,
+                                   max_workers: int | None = None,
+                                   compiled_index: CompiledWordIndex | None = None) -> None:
+    """Solves all 10 crosswords in parallel, stores results (solution and times) into a file in the same format 
+    as `solve_all_crosswords`. If no file is provided, prints to terminal.
+    
+    Each crossword is solved by several configurations at once (different shuffles of words, heuristics, LCV),
+    the first configuration that solves the crossword (or proves it can't be solved) cancels the others.
+    Runs for all crosswords share one pool of processes, so independent crosswords are solved concurrently.
+
+    Args:
+        words (list[str]): words that can be used in solution
+        grids (list[Grid]): grids to be filled
+        solutions_file (str | None, optional): file to store solutions in, if None, print to terminal. 
+            Defaults to "solutions.txt".
+        configurations (list[dict[str, Any]] | None, optional): keyword arguments of `solve` for each configuration. 
+            Defaults to None -> `PORTFOLIO`.
+        max_workers (int | None, optional): number of worker processes. 
+            Defaults to None -> number of processors.
+        compiled_index (CompiledWordIndex | None, optional): index of `words` compiled beforehand. 
+            Defaults to None -> index is compiled from `words` once for all runs.
+    """
+    if len(grids) != 10:
+        print("Please, provide all 10 grids")
+    if configurations is None:
+        configurations = PORTFOLIO
+    if compiled_index is None:
+        compiled_index = compile_word_index(words)
+        
+    # order in which to output crosswords
+    order: list[int] = [0, 1, 2, 3, 4, 5, 7, 8, 6, 9] 
+    # points for each crossword
+    points: list[float] = [0.5, 1, 1.5, 1.5, 1.5, 2, 2, 2, 2, 2]
+    
+    # solution, time of solving and time since the start of the run for each decided crossword
+    results: dict[int, tuple[str, float, float]] = {}
+    
+    start_of_run: float = time.time()
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers) as executor:
+        stop_events: list[Any] = [manager.Event() for _ in grids]
+        futures: dict[Future, tuple[int, dict[str, Any]]] = {
+            executor.submit(solve_portfolio_task, words, grids[i], configuration, stop_events[i], compiled_index): (i, configuration)
+            for i in order for configuration in configurations
+        }
+        unfinished_runs: list[int] = [len(configurations) for _ in grids]
+        # result of a run sampling the domains for LCV that failed, used if no other run decides the crossword
+        sampled_failures: dict[int, tuple[str, float, float]] = {}
+        
+        for future in as_completed(futures):
+            i, configuration = futures[future]
+            unfinished_runs[i] -= 1
+            if i in results or future.cancelled():
+                continue
+            
+            # a failing run mustn't abort the whole pool, other runs can still decide the crossword
+            run: tuple[bool, str, float] | None
+            try:
+                run = future.result()
+            except Exception as error:
+                print(f"crossword no. {str(i + 1)}: run {configuration} failed: {error!r}")
+                run = None
+            
+            if run is not None:
+                res, solution, elapsed = run
+                # False from a run sampling the domains for LCV doesn't prove that the crossword can't be solved
+                complete_search: bool = not (configuration.get("use_LCV", False) and configuration.get("LCV_size") is not None)
+                if res or complete_search:
+                    results[i] = (solution, elapsed, time.time() - start_of_run)
+                else:
+                    sampled_failures[i] = (solution, elapsed, time.time() - start_of_run)
+            
+            if i not in results and unfinished_runs[i] == 0 and i in sampled_failures:
+                results[i] = sampled_failures[i]
+            
+            if i in results:
+                print(f"crossword no. {str(i + 1)} decided ====")
+                
+                # cancel other runs of the decided crossword
+                stop_events[i].set()
+                for other_future, (j, _) in futures.items():
+                    if j == i:
+                        other_future.cancel()
+
+    # create file for solutions
+    if solutions_file is not None:    
+        with open(solutions_file, 'w') as file:
+            pass
+    
+    points_so_far: float = 0
+    for i in order:
+        if i not in results:
+            # every run of the crossword failed or was interrupted
+            output_solution(i, "crossword was not decided", 0, time.time() - start_of_run, points_so_far, solutions_file)
+            continue
+        solution, elapsed_crossword, elapsed_total = results[i]
+        points_so_far += points[i]
+        output_solution(i, solution, elapsed_crossword, elapsed_total, points_so_far, solutions_file)
+
+
+def benchmark_LCV(words: list[str], grids: list[Grid], time_limit: float = 10.0,
+                  LCV_size: int | None = None, seed: int = 0,
+                  compiled_index: CompiledWordIndex | None = None) -> dict[str, float]:
+    """Compares speed of the exact least-constraining-value heuristic, which writes every word and propagates,
+    and the "fast" one, which estimates eliminated words from crossing squares. 
+    Each grid is solved with both until it is decided or until the first state of the search after `time_limit` seconds,
+    states of the search (nodes) are counted by the `should_stop` callback of `solve`.
+
+    Args:
+        words (list[str]): words that can be used in solution
+        grids (list[Grid]): grids to be solved
+        time_limit (float, optional): time limit for solving one grid in seconds. 
+            Defaults to 10.0.
+        LCV_size (int | None, optional): sample of how many values from domain to check during LCV run. 
+            Defaults to None -> all values.
+        seed (int, optional): seed for shuffling the order of words, same for both heuristics. 
+            Defaults to 0.
+        compiled_index (CompiledWordIndex | None, optional): index of `words` compiled beforehand. 
+            Defaults to None -> index is compiled once for all runs.
+
+    Returns:
+        dict[str, float]: nodes per second over all grids for "exact" and "fast" heuristic
+    """
+    if compiled_index is None:
+        compiled_index = compile_word_index(words)
+    
+    nodes_per_second: dict[str, float] = {}
+    for mode, use_LCV in (("exact", True), ("fast", "fast")):
+        total_nodes: int = 0
+        total_time: float = 0
+        for i, grid in enumerate(grids):
+            nodes: int = 0
+            start: float = time.time()
+            
+            def count_node() -> bool:
+                # counts the node, stops the search after the time limit
+                nonlocal nodes
+                nodes += 1
+                return time.time() - start > time_limit
+            
+            try:
+                res: bool | None = solve(CrossWord(copy.deepcopy(grid)), words, use_LCV=use_LCV, LCV_size=LCV_size, 
+                                         seed=seed, should_stop=count_node, compiled_index=compiled_index)
+            except SolvingInterrupted:
+                res = None
+            elapsed: float = time.time() - start
+            
+            total_nodes += nodes
+            total_time += elapsed
+            result: str = "timeout" if res is None else ("solved" if res else "unsolvable")
+            print(f"{mode} LCV, crossword no. {i + 1}: {result}, {nodes} nodes in {elapsed:.2f} s "
+                  f"({nodes / elapsed:.1f} nodes/s)")
+            
+        nodes_per_second[mode] = total_nodes / total_time
+        print(f"{mode} LCV: {nodes_per_second[mode]:.1f} nodes/s")
+    
+    return nodes_per_second
 
 
 if __name__ == "__main__":
     # load data
     words: list[str] = load_words("words.txt")    
     grids: list[Grid] = load_grids("krizovky.txt")
-    # shuffle the words -> without this, even with sets as domain structures, 
+    # compiled index of the words is reused until words.txt changes
+    compiled_index: CompiledWordIndex = load_word_index(words, "words.idx")
+    # shuffle the order of words -> without this, even with sets as domain structures, 
     # some crosswords were consistently getting stuck, shuffling tries to reduce this problem
-    random.shuffle(words)
+    # (the words are shuffled by seed in the search, so the compiled index stays valid)
+    seed: int = random.randrange(2**32)
     
     solve_one_crossword(words, grids[6], show_progress=True,
                         maintain_arc_consistency=True,
                         unassigned_variable_heuristic="degree",
-                        use_LCV=False)
+                        use_LCV=False, seed=seed, compiled_index=compiled_index)
     
     """solve_all_crosswords(words, grids, solutions_file="solutions_new.txt", 
                         show_progress=True, 
                         maintain_arc_consistency=True,
                         unassigned_variable_heuristic="degree",
-                        use_LCV=False)"""
+                        use_LCV=False, seed=seed, compiled_index=compiled_index)"""
+    
+    """solve_all_crosswords_portfolio(words, grids, solutions_file="solutions_new.txt", compiled_index=compiled_index)"""
+    
+    """benchmark_LCV(words, grids, time_limit=10.0, seed=seed, compiled_index=compiled_index)"""
+    
+    """statistics: SolverStatistics = SolverStatistics(sys.stdout, interval=1.0)
+    solve(CrossWord(grids[6]), words, seed=seed, compiled_index=compiled_index, statistics=statistics)"""
+    
+    """# restarts with growing cutoffs and random ties, instead of hoping that one seed doesn't get stuck
+    solve(CrossWord(grids[6]), words, seed=seed, compiled_index=compiled_index, restart_policy="luby", restart_base=100)"""
+    
+    """# 5 fills of the crossword using the most distinct letters, out of the fills found in 10 seconds
+    for score, solution in best_solutions(CrossWord(grids[6]), words, 
+                                          lambda cw: sum([len(set(cw.text_at_pos(position))) for position in range(len(cw.positions))]),
+                                          k=5, time_limit=10.0, seed=seed, compiled_index=compiled_index):
+        print(score, solution, sep='\n')"""